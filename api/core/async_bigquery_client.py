@@ -0,0 +1,76 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+
+from core.bigquery_client import BigQueryClient, bq_client
+
+# V120: Fachada asyncio do BigQueryClient para os handlers `async def` do FastAPI.
+# Cache hits (catálogo, índice de busca, unidades) são respondidos direto no event loop;
+# só o que faz I/O de rede vai para um pool dedicado e limitado, então uma query lenta
+# nunca trava as outras requisições nem esgota o threadpool padrão do Starlette.
+BQ_ASYNC_WORKERS = int(os.getenv("BQ_ASYNC_WORKERS", "8"))
+
+
+class AsyncBigQueryClient:
+    """Mesma API de leitura do BigQueryClient, com métodos awaitable."""
+
+    def __init__(self, client: BigQueryClient = None, max_workers: int = BQ_ASYNC_WORKERS):
+        self.client = client or bq_client
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bq-async")
+        self._lock = threading.Lock()
+        self.stats = {"inline": 0, "offloaded": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def _offload(self, fn, *args):
+        with self._lock:
+            self.stats["offloaded"] += 1
+            self.stats["in_flight"] += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self.stats["in_flight"])
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self.stats["in_flight"] -= 1
+
+    def _inline(self, fn, *args):
+        with self._lock:
+            self.stats["inline"] += 1
+        return fn(*args)
+
+    async def get_all_exams(self, unit: str) -> List[Dict[str, Any]]:
+        if self.client.has_cached_catalog(unit):
+            return self._inline(self.client.get_all_exams, unit)
+        return await self._offload(self.client.get_all_exams, unit)
+
+    async def search_exams(self, term: str, unit: str, limit: int = 10) -> List[Dict[str, Any]]:
+        if self.client.has_cached_search_index(unit):
+            return self._inline(self.client.search_exams, term, unit, limit)
+        return await self._offload(self.client.search_exams, term, unit, limit)
+
+    async def get_units_snapshot(self) -> Dict[str, Any]:
+        if self.client.has_cached_units():
+            return self._inline(self.client.get_units_snapshot)
+        return await self._offload(self.client.get_units_snapshot)
+
+    async def get_units(self) -> List[str]:
+        return list((await self.get_units_snapshot())["units"])
+
+    async def get_table_stats(self, refresh: bool = False) -> Dict[str, Any]:
+        return await self._offload(self.client.get_table_stats, refresh)
+
+    async def get_raw_table_stats(self) -> Dict[str, Any]:
+        return await self._offload(self.client.get_raw_table_stats)
+
+    def get_catalog_keys(self, unit: str) -> Optional[List[str]]:
+        return self.client.get_catalog_keys(unit)
+
+    def get_catalog_version(self, unit: str) -> int:
+        return self.client.get_catalog_version(unit)
+
+    def get_catalog_cache_stats(self) -> Dict[str, Any]:
+        return self.client.get_catalog_cache_stats()
+
+
+async_bq_client = AsyncBigQueryClient()
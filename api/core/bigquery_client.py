@@ -1,7 +1,227 @@
 from google.auth.transport.requests import AuthorizedSession
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from core.auth_utils import get_gcp_credentials
+from core.catalog_snapshot import CatalogSnapshotStore, catalog_snapshot_store, catalog_key
+from core.bq_row_decoder import get_row_decoder
+from core.http_transport import http_transport
+from core.sqlite_backend import SQLiteBackend, BQ_SQLITE_PATH
+from services.search_index import ExamSearchIndex
+import hashlib
 import logging
+import os
+import threading
+import time
+import uuid
+
+# V113: Catálogo muda poucas vezes ao dia -> cache por unidade com revalidação em background
+CATALOG_TTL_SECONDS = int(os.getenv("BQ_CATALOG_TTL_SECONDS", "900"))
+# Estatísticas da tabela são só diagnóstico: recalculadas no máximo 1x por TTL
+TABLE_STATS_TTL_SECONDS = int(os.getenv("BQ_TABLE_STATS_TTL_SECONDS", "3600"))
+# Paginação de jobs.query / jobs.getQueryResults
+BQ_PAGE_SIZE = int(os.getenv("BQ_PAGE_SIZE", "10000"))
+BQ_POLL_TIMEOUT_MS = int(os.getenv("BQ_POLL_TIMEOUT_MS", "10000"))
+BQ_MAX_WAIT_SECONDS = int(os.getenv("BQ_MAX_WAIT_SECONDS", "60"))
+
+# V121: Backend de dados: "bigquery" (produção) ou "sqlite" (stand-in local, ver core/sqlite_backend.py)
+BQ_BACKEND = os.getenv("BQ_BACKEND", "bigquery").strip().lower()
+
+# V116: Bulk mode -> lista_precos carregada uma única vez e particionada por unidade em memória
+BQ_BULK_CATALOG = os.getenv("BQ_BULK_CATALOG", "").lower() in ("1", "true", "yes")
+
+# Prefetch da próxima página enquanto a atual é decodificada
+_PAGE_FETCHER = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bq-page")
+
+
+class BigQueryQueryError(Exception):
+    """Falha (ou resultado incompleto) em uma query do BigQuery."""
+
+
+# loader(unit) -> (items, cacheable, keys normalizadas ou None)
+CatalogLoader = Callable[[str], Tuple[List[Dict[str, Any]], bool, Optional[List[str]]]]
+# on_refresh(unit, status): status "OK" ou "STALE (refresh failed: ...)" ao fim de cada refresh em background
+RefreshListener = Callable[[str, str], None]
+
+
+class CatalogCache:
+    """
+    Cache process-wide de catálogos por unidade (stale-while-revalidate).
+    Entradas frescas são servidas direto; entradas vencidas continuam sendo servidas
+    enquanto uma thread recarrega o catálogo, então requests quentes nunca esperam o BigQuery.
+    """
+
+    def __init__(self, ttl_seconds: int = CATALOG_TTL_SECONDS, on_refresh: RefreshListener = None):
+        self.ttl_seconds = ttl_seconds
+        self.on_refresh = on_refresh
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._refreshing = set()
+        self._unit_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._version = 0
+
+        # Contadores
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.seeded = 0
+
+    @staticmethod
+    def _key(unit: str) -> str:
+        # Mesmo critério do filtro SQL: LOWER(TRIM(price_table_name))
+        return (unit or "").strip().lower()
+
+    def get(
+        self,
+        unit: str,
+        loader: CatalogLoader,
+        seed: Callable[[str], Optional[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Retorna o catálogo da unidade, carregando via `loader` em caso de miss.
+        `seed` (opcional) fornece um catálogo local (snapshot) servido imediatamente
+        enquanto o `loader` reconcilia com a fonte em background.
+        """
+        key = self._key(unit)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.time() - entry["loaded_at"] < self.ttl_seconds:
+                    self.hits += 1
+                    return entry["items"]
+                self.stale_hits += 1
+            unit_lock = self._unit_locks.setdefault(key, threading.Lock())
+
+        if entry is not None:
+            self._start_refresh(key, unit, loader)
+            return entry["items"]
+
+        # Miss: apenas um carregamento por unidade (requests concorrentes aguardam o mesmo load)
+        with unit_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    self.hits += 1
+                    return entry["items"]
+                self.misses += 1
+
+            seeded = seed(unit) if seed else None
+            if seeded and seeded.get("items"):
+                self.put(unit, seeded["items"], keys=seeded.get("keys"), source="snapshot")
+                with self._lock:
+                    self.seeded += 1
+                self._start_refresh(key, unit, loader)
+                return seeded["items"]
+
+            items, cacheable, keys = loader(unit)
+            if cacheable:
+                self.put(unit, items, keys=keys)
+            return items
+
+    def _start_refresh(self, key: str, unit: str, loader: CatalogLoader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        threading.Thread(target=self._refresh, args=(key, unit, loader), daemon=True).start()
+
+    def _refresh(self, key: str, unit: str, loader: CatalogLoader):
+        error = None
+        try:
+            items, cacheable, keys = loader(unit)
+            if cacheable:
+                self.put(unit, items, keys=keys)
+                with self._lock:
+                    self.refreshes += 1
+            else:
+                # Blind fetch / catálogo vazio não substitui a entrada: ela continua sendo servida, vencida
+                error = "catálogo vazio ou parcial"
+        except Exception as e:
+            print(f"⚠️ Catalog refresh failed for '{unit}': {e}")
+            error = str(e)[:80]
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+                if error is not None:
+                    self.refresh_errors += 1
+                    entry = self._entries.get(key)
+                    if entry is not None:
+                        entry["status"] = f"STALE (refresh failed: {error})"
+                        entry["refresh_failed_at"] = time.time()
+        if self.on_refresh is not None:
+            self.on_refresh(unit, "OK" if error is None else f"STALE (refresh failed: {error})")
+
+    def put(self, unit: str, items: List[Dict[str, Any]], keys: List[str] = None, source: str = "bigquery"):
+        with self._lock:
+            entry = self._entries.get(self._key(unit))
+            if entry is not None and entry["items"] is items:
+                # Mesmo catálogo revalidado (ex: tabela não mudou): só renova a idade, mantém a versão
+                entry["loaded_at"] = time.time()
+                entry["status"] = "OK"
+                entry.pop("refresh_failed_at", None)
+                return
+            self._version += 1
+            self._entries[self._key(unit)] = {
+                "unit": unit,
+                "items": items,
+                "keys": keys,
+                "source": source,
+                "status": "OK",
+                "loaded_at": time.time(),
+                "version": self._version,
+                # ExamSearchIndex montado sob demanda por BigQueryClient._get_search_index
+                "search_index": None
+            }
+
+    def get_entry(self, unit: str) -> Optional[Dict[str, Any]]:
+        """Entrada bruta do cache (items, keys, version...) sem contar hit/miss."""
+        return self._entries.get(self._key(unit))
+
+    def get_version(self, unit: str) -> int:
+        """Versão do catálogo em cache (0 se a unidade ainda não foi carregada)."""
+        entry = self._entries.get(self._key(unit))
+        return entry["version"] if entry else 0
+
+    def invalidate(self, unit: str = None):
+        with self._lock:
+            if unit is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self._key(unit), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.time()
+        with self._lock:
+            units = {
+                entry["unit"]: {
+                    "items": len(entry["items"]),
+                    "age_seconds": round(now - entry["loaded_at"], 1),
+                    "version": entry["version"],
+                    "source": entry["source"],
+                    "stale": now - entry["loaded_at"] >= self.ttl_seconds,
+                    "status": entry["status"],
+                    "refresh_failed_seconds_ago": (
+                        round(now - entry["refresh_failed_at"], 1) if "refresh_failed_at" in entry else None
+                    )
+                }
+                for entry in self._entries.values()
+            }
+            return {
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+                "refresh_errors": self.refresh_errors,
+                "seeded_from_snapshot": self.seeded,
+                "refreshing": len(self._refreshing),
+                # Idade do catálogo mais antigo em memória (cresce sem parar se os refreshes falham)
+                "max_age_seconds": max((unit["age_seconds"] for unit in units.values()), default=0.0),
+                "units": units
+            }
+
 
 class BigQueryClient:
     def __init__(self):
@@ -9,7 +229,57 @@ class BigQueryClient:
         self.project_id = "high-nature-319701"
         self.dataset_id = "vtntprod_vitta_core"
         self.table_id = "lista_precos"
-        
+        self.catalog_cache = CatalogCache(on_refresh=self._on_catalog_refresh)
+        self._table_stats = None
+        self._table_stats_at = 0.0
+        self._table_stats_lock = threading.Lock()
+        self._table_stats_refreshing = False
+        self.snapshot_store = catalog_snapshot_store
+        self.base_url = f"https://bigquery.googleapis.com/bigquery/v2/projects/{self.project_id}/queries"
+
+        # V113: Auth é lazy -> cold start servido por snapshot não paga a autenticação
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._auth_attempted = False
+        self.auth_info = "INIT"
+
+        self.bulk_mode = BQ_BULK_CATALOG
+        self._bulk = None
+        # Serializa as cargas (tables.get + scan); só quem precisa esperar a carga o adquire
+        self._bulk_load_lock = threading.Lock()
+        # Protege apenas o flag de refresh em background: leitores nunca esperam uma carga
+        self._bulk_state_lock = threading.Lock()
+        self._bulk_refreshing = False
+        self._warming_units = set()
+        self._warming_lock = threading.Lock()
+        self._units_cache = None
+        self._units_lock = threading.Lock()
+        self._units_refreshing = False
+
+        # V121: Stand-in local -> mesmas queries, sem auth/rede; snapshots num diretório separado
+        self.local_backend = SQLiteBackend(BQ_SQLITE_PATH) if BQ_BACKEND == "sqlite" else None
+        if self.local_backend is not None:
+            self.auth_info = f"OK (SQLITE {BQ_SQLITE_PATH})"
+            if self.snapshot_store.enabled:
+                self.snapshot_store = CatalogSnapshotStore(os.path.join(self.snapshot_store.directory, "sqlite"))
+
+    def _on_catalog_refresh(self, unit: str, status: str):
+        # Refresh em background que falhou não pode aparecer como saudável (ex: "OK (BLIND MODE)")
+        if status != "OK":
+            self.auth_info = f"{status} ['{unit}']"
+        elif self.auth_info.startswith("STALE") or self.auth_info == "OK (BLIND MODE)":
+            self.auth_info = f"OK (SQLITE {BQ_SQLITE_PATH})" if self.local_backend is not None else "OK"
+
+    @property
+    def session(self):
+        if not self._auth_attempted:
+            with self._session_lock:
+                if not self._auth_attempted:
+                    self._session = self._authenticate()
+                    self._auth_attempted = True
+        return self._session
+
+    def _authenticate(self):
         try:
             creds = get_gcp_credentials()
             
@@ -17,73 +287,157 @@ class BigQueryClient:
             if creds.requires_scopes:
                 creds = creds.with_scopes(['https://www.googleapis.com/auth/cloud-platform'])
             
-            self.session = AuthorizedSession(creds)
-            self.base_url = f"https://bigquery.googleapis.com/bigquery/v2/projects/{self.project_id}/queries"
+            # V119: pool keep-alive dimensionado pelo transporte compartilhado
+            session = http_transport.mount(AuthorizedSession(creds), "bigquery")
             self.auth_info = "OK"
             print("🛡️ BQ REST Client Authenticated!")
+            return session
         except Exception as e:
             self.auth_info = f"ERR: {str(e)[:50]}"
             print(f"❌ Error BQ Auth: {e}")
-            self.session = None
+            return None
 
     def _run_query(self, query: str, parameters: List[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
-        """Executa query via REST API e retorna Rows processadas"""
-        if not self.session:
+        """Executa query via REST API e retorna Rows processadas (todas as páginas)"""
+        try:
+            return list(self._iter_query(query, parameters))
+        except BigQueryQueryError as e:
+            print(f"BQ Query Failed: {e}")
             return []
+        except Exception as e:
+            print(f"BQ Exception: {e}")
+            return []
+
+    def _iter_query(self, query: str, parameters: List[Dict[str, Any]] = None, as_dict: bool = True) -> Iterator[Any]:
+        """
+        V114: Executa a query e gera as rows página a página.
+        V115: Rows decodificadas por um decoder compilado para o schema; `as_dict=False`
+        devolve tuplas compactas (ordem do SELECT) em vez de dicts.
+        Segue jobComplete=false (polling) e pageToken via jobs.getQueryResults, com a próxima
+        página já em voo enquanto o consumidor processa a atual.
+        Levanta BigQueryQueryError em qualquer falha, inclusive resultado truncado.
+        """
+        if self.local_backend is not None:
+            try:
+                yield from self.local_backend.iter_query(query, parameters, as_dict)
+            except Exception as e:
+                raise BigQueryQueryError(f"sqlite: {e}") from e
+            return
+
+        if not self.session:
+            raise BigQueryQueryError(f"no session ({self.auth_info})")
             
         # V107: Strictly sanitized payload with explicit location
         payload = {
             "query": query,
             "useLegacySql": False,
-            "location": "US"
+            "location": "US",
+            "maxResults": BQ_PAGE_SIZE,
+            "timeoutMs": BQ_POLL_TIMEOUT_MS,
+            # Idempotência: um retry do transporte reaproveita o mesmo job
+            "requestId": str(uuid.uuid4())
         }
         
         if parameters:
             payload["queryParameters"] = parameters
             payload["parameterMode"] = "NAMED"
         
-        try:
-            resp = self.session.post(self.base_url, json=payload)
-            if resp.status_code != 200:
-                # Capture accurate error info for V106 probe
-                try:
-                    full_err = resp.json().get("error", {}).get("message", resp.text[:100])
-                except:
-                    full_err = resp.text[:100]
-                
-                self.auth_info = f"BQ_ERR_{resp.status_code}: {full_err[:80]}"
-                print(f"BQ Error {resp.status_code}: {resp.text}")
-                return []
-                
-            data = resp.json()
-            rows = data.get("rows", [])
-            schema = data.get("schema", {}).get("fields", [])
-            
-            # Map results to Dict based on Schema
-            results = []
-            for row in rows:
-                item = {}
-                values = row.get("f", [])
-                for i, field in enumerate(schema):
-                    field_name = field.get("name")
-                    val = values[i].get("v")
-                    
-                    # Type Casting (REST API returns strings)
-                    if field_name == "price" and val is not None:
-                        try:
-                            val = float(val)
-                        except:
-                            val = 0.0
-                    
-                    item[field_name] = val
-                results.append(item)
-            return results
+        data = self._check_response(
+            http_transport.post("bigquery", self.base_url, session=self.session, json=payload)
+        )
+        job_ref = data.get("jobReference", {})
+        job_id = job_ref.get("jobId")
+        location = job_ref.get("location", "US")
+
+        deadline = time.time() + BQ_MAX_WAIT_SECONDS
+        while not data.get("jobComplete", True):
+            if not job_id or time.time() > deadline:
+                raise BigQueryQueryError(f"job {job_id} not complete after {BQ_MAX_WAIT_SECONDS}s")
+            data = self._get_query_results(job_id, location)
+
+        decoder = get_row_decoder(data.get("schema", {}).get("fields", []))
+        decode_page = decoder.decode_page_dicts if as_dict else decoder.decode_page
+        total_rows = int(data.get("totalRows") or 0)
+        emitted = 0
+
+        while True:
+            page_token = data.get("pageToken")
+            # Próxima página em voo enquanto as rows desta são consumidas
+            pending = _PAGE_FETCHER.submit(self._get_query_results, job_id, location, page_token) if page_token else None
+            try:
+                rows = decode_page(data.get("rows", []))
+                emitted += len(rows)
+                yield from rows
+            except BaseException:
+                # Consumidor abandonou o stream (ou falhou): não busca mais páginas
+                if pending is not None:
+                    pending.cancel()
+                raise
+            if pending is None:
+                break
+            data = pending.result()
+
+        if emitted < total_rows:
+            raise BigQueryQueryError(f"truncated result: {emitted}/{total_rows} rows")
+
+    def _get_query_results(self, job_id: str, location: str, page_token: str = None) -> Dict[str, Any]:
+        """jobs.getQueryResults: polling de job pendente ou leitura da página `page_token`."""
+        params = {"location": location, "maxResults": BQ_PAGE_SIZE, "timeoutMs": BQ_POLL_TIMEOUT_MS}
+        if page_token:
+            params["pageToken"] = page_token
+        return self._check_response(
+            http_transport.get("bigquery", f"{self.base_url}/{job_id}", session=self.session, params=params)
+        )
+
+    def _check_response(self, resp) -> Dict[str, Any]:
+        if resp.status_code != 200:
+            # Capture accurate error info for V106 probe
+            try:
+                full_err = resp.json().get("error", {}).get("message", resp.text[:100])
+            except:
+                full_err = resp.text[:100]
             
-        except Exception as e:
-            print(f"BQ Exception: {e}")
-            return []
+            self.auth_info = f"BQ_ERR_{resp.status_code}: {full_err[:80]}"
+            print(f"BQ Error {resp.status_code}: {resp.text}")
+            raise BigQueryQueryError(self.auth_info)
+        return resp.json()
 
     def get_all_exams(self, unit: str) -> List[Dict[str, Any]]:
+        """Catálogo processado da unidade, servido pelo cache process-wide."""
+        return self.catalog_cache.get(unit, self._load_and_snapshot, seed=self.snapshot_store.load)
+
+    def get_catalog_keys(self, unit: str) -> Optional[List[str]]:
+        """Chaves normalizadas pré-computadas (alinhadas com get_all_exams), se disponíveis."""
+        entry = self.catalog_cache.get_entry(unit)
+        return entry.get("keys") if entry else None
+
+    def _load_and_snapshot(self, unit: str) -> Tuple[List[Dict[str, Any]], bool, Optional[List[str]]]:
+        if self.bulk_mode:
+            bulk = self._get_bulk(wait_for_fresh=True)
+            partition = bulk["partitions"].get(CatalogCache._key(unit)) if bulk else None
+            if partition is not None:
+                keys = partition["keys"]
+                if partition.get("snapshot_pending"):
+                    self.snapshot_store.save(unit, partition["items"], keys)
+                    partition["snapshot_pending"] = False
+                return partition["items"], True, keys
+            # Unidade fora do bulk -> caminho por unidade (inclui blind fetch)
+
+        items, cacheable = self._fetch_all_exams(unit)
+        keys = None
+        if cacheable:
+            keys = [catalog_key(item["search_name"]) for item in items]
+            self.snapshot_store.save(unit, items, keys)
+        return items, cacheable, keys
+
+    def get_catalog_version(self, unit: str) -> int:
+        return self.catalog_cache.get_version(unit)
+
+    def get_catalog_cache_stats(self) -> Dict[str, Any]:
+        return self.catalog_cache.get_stats()
+
+    def _fetch_all_exams(self, unit: str) -> Tuple[List[Dict[str, Any]], bool]:
+        """Busca o catálogo no BigQuery. Retorna (itens, cacheable)."""
         query = f"""
         SELECT item_id, item_name, group_name, price 
         FROM `{self.project_id}.{self.dataset_id}.{self.table_id}`
@@ -93,38 +447,214 @@ class BigQueryClient:
             {"name": "unit", "parameterType": {"type": "STRING"}, "parameterValue": {"value": unit}}
         ]
         
-        raw_results = self._run_query(query, params)
+        # V114: Processa as rows conforme as páginas chegam (sem lista bruta intermediária)
+        processed = []
+        try:
+            for record in self._iter_query(query, params, as_dict=False):
+                processed.append(self._process_exam_row(record))
+            cacheable = bool(processed)
+        except Exception as e:
+            # Catálogo parcial nunca é servido/cacheado
+            print(f"BQ Catalog Stream Failed for '{unit}': {e}")
+            processed = []
+            cacheable = False
 
-        if not raw_results:
+        if not processed:
             print(f"⚠️ 0 results for '{unit}'. Attempting BLIND FETCH (Catalog Discovery)...")
             query_blind = f"""
             SELECT item_id, item_name, group_name, price 
             FROM `{self.project_id}.{self.dataset_id}.{self.table_id}`
             LIMIT 500
             """
-            raw_results = self._run_query(query_blind)
-            if raw_results:
+            try:
+                processed = [self._process_exam_row(r) for r in self._iter_query(query_blind, as_dict=False)]
+            except Exception as e:
+                print(f"BQ Blind Fetch Failed: {e}")
+                processed = []
+            if processed:
                 self.auth_info = f"OK (BLIND MODE)"
+            # Blind fetch / falha não entram no cache: próxima request tenta de novo
+            cacheable = False
         
-        # Post-processing (Normalization compatible with old client)
-        processed = []
-        for row in raw_results:
-            clean_name = row.get("item_name", "").lower()
-            for suffix in [" exames laboratoriais", " - exames laboratoriais", " (laboratorio)", " - laboratorio"]:
-                if clean_name.endswith(suffix):
-                    clean_name = clean_name.replace(suffix, "")
-            
-            processed.append({
-                "item_id": row.get("item_id"),
-                "item_name": row.get("item_name"),
-                "search_name": clean_name.strip(" -"),
-                "group_name": row.get("group_name"),
-                "price": row.get("price")
-            })
         print(f"Cache BigQuery Carregado: {len(processed)} itens para '{unit}'")
-        return processed
+        return processed, cacheable
+
+    @staticmethod
+    def _process_exam_row(record: tuple) -> Dict[str, Any]:
+        """Post-processing (Normalization compatible with old client)"""
+        # Tupla na ordem do SELECT: item_id, item_name, group_name, price
+        item_id, item_name, group_name, price = record
+        clean_name = (item_name or "").lower()
+        for suffix in [" exames laboratoriais", " - exames laboratoriais", " (laboratorio)", " - laboratorio"]:
+            if clean_name.endswith(suffix):
+                clean_name = clean_name.replace(suffix, "")
+        
+        return {
+            "item_id": item_id,
+            "item_name": item_name,
+            "search_name": clean_name.strip(" -"),
+            "group_name": group_name,
+            "price": price
+        }
+
+    def _get_bulk(self, wait_for_fresh: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Catálogo completo particionado por unidade.
+        Sem carga prévia -> carrega (bloqueante). Carga vencida -> revalida (bloqueante se
+        `wait_for_fresh`, senão em background servindo a carga atual).
+        """
+        bulk = self._bulk
+        if bulk is not None and time.time() - bulk["checked_at"] < self.catalog_cache.ttl_seconds:
+            return bulk
+        if bulk is None or wait_for_fresh:
+            return self._refresh_bulk()
+        with self._bulk_state_lock:
+            start = not self._bulk_refreshing
+            self._bulk_refreshing = True
+        if start:
+            threading.Thread(target=self._background_refresh_bulk, daemon=True).start()
+        return bulk
+
+    def _background_refresh_bulk(self):
+        try:
+            self._refresh_bulk()
+        finally:
+            with self._bulk_state_lock:
+                self._bulk_refreshing = False
+
+    def _refresh_bulk(self) -> Optional[Dict[str, Any]]:
+        """Recarrega a tabela inteira apenas se o lastModifiedTime mudou."""
+        # Leitores sem `wait_for_fresh` não tocam neste lock: continuam servindo self._bulk atual
+        with self._bulk_load_lock:
+            bulk = self._bulk
+            if bulk is not None and time.time() - bulk["checked_at"] < self.catalog_cache.ttl_seconds:
+                return bulk
+
+            last_modified = self._get_table_last_modified()
+            if bulk is not None and last_modified is not None and last_modified == bulk["last_modified"]:
+                bulk["checked_at"] = time.time()
+                return bulk
+
+            loaded = self._load_bulk(last_modified)
+            if loaded is not None:
+                self._bulk = loaded
+            return self._bulk
+
+    def _load_bulk(self, last_modified: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Um único scan de lista_precos, particionado por LOWER(TRIM(price_table_name))."""
+        query = f"""
+        SELECT price_table_name, item_id, item_name, group_name, price
+        FROM `{self.project_id}.{self.dataset_id}.{self.table_id}`
+        """
+        partitions: Dict[str, Dict[str, Any]] = {}
+        unit_names = set()
+        process = self._process_exam_row
+        try:
+            for record in self._iter_query(query, as_dict=False):
+                unit_name = record[0]
+                if not unit_name:
+                    continue
+                partition = partitions.get(unit_name.strip().lower())
+                if partition is None:
+                    partition = partitions[unit_name.strip().lower()] = {"items": [], "keys": None, "snapshot_pending": True}
+                partition["items"].append(process(record[1:]))
+                unit_names.add(unit_name)
+        except Exception as e:
+            print(f"BQ Bulk Load Failed: {e}")
+            return None
+
+        for partition in partitions.values():
+            partition["keys"] = [catalog_key(item["search_name"]) for item in partition["items"]]
+
+        print(f"Cache BigQuery Bulk Carregado: {sum(len(p['items']) for p in partitions.values())} itens, {len(partitions)} unidades")
+        return {
+            "partitions": partitions,
+            "units": sorted(unit_names),
+            "last_modified": last_modified,
+            "loaded_at": time.time(),
+            "checked_at": time.time()
+        }
+
+    def _get_table_last_modified(self) -> Optional[int]:
+        """tables.get (metadado, sem scan): lastModifiedTime em ms."""
+        if self.local_backend is not None:
+            return self.local_backend.table_last_modified()
+        if not self.session:
+            return None
+        url = (
+            f"https://bigquery.googleapis.com/bigquery/v2/projects/{self.project_id}"
+            f"/datasets/{self.dataset_id}/tables/{self.table_id}"
+        )
+        try:
+            resp = http_transport.get("bigquery", url, session=self.session, params={"fields": "lastModifiedTime"})
+            if resp.status_code != 200:
+                print(f"BQ Table Metadata Error {resp.status_code}: {resp.text[:100]}")
+                return None
+            return int(resp.json().get("lastModifiedTime"))
+        except Exception as e:
+            print(f"BQ Table Metadata Exception: {e}")
+            return None
+
+    def _get_search_index(self, unit: str) -> Optional[ExamSearchIndex]:
+        """
+        Índice local de busca da unidade, guardado na própria entrada do CatalogCache: catálogo novo
+        (put) ou invalidado leva o índice junto, então não há um dict paralelo crescendo por unidade.
+        Sem catálogo em memória: aquece o catálogo em background e devolve None (fallback BigQuery).
+        """
+        if self.bulk_mode:
+            # Pode bloquear (miss -> snapshot/carga do bulk). A fachada async só chama isto inline
+            # quando has_cached_search_index() já é True, e aí o catálogo está no cache.
+            self.get_all_exams(unit)
+        entry = self.catalog_cache.get_entry(unit)
+        if entry is None:
+            key = CatalogCache._key(unit)
+            with self._warming_lock:
+                start = key not in self._warming_units
+                self._warming_units.add(key)
+            if start:
+                threading.Thread(target=self._warm_catalog, args=(unit,), daemon=True).start()
+            return None
+
+        index = entry.get("search_index")
+        if index is None:
+            # Corrida entre requests só monta o índice 2x (mesmo conteúdo); o último a gravar fica
+            index = entry["search_index"] = ExamSearchIndex(entry["items"], entry.get("keys"))
+        return index
+
+    def has_cached_catalog(self, unit: str) -> bool:
+        """True quando get_all_exams(unit) responde da memória (sem I/O)."""
+        return self.catalog_cache.get_entry(unit) is not None
+
+    def has_cached_search_index(self, unit: str) -> bool:
+        """True quando search_exams(unit) responde do índice local já montado."""
+        entry = self.catalog_cache.get_entry(unit)
+        return entry is not None and entry.get("search_index") is not None
+
+    def has_cached_units(self) -> bool:
+        """
+        True quando get_units_snapshot() responde da memória (sem I/O nem espera).
+        Bulk mode: com carga em memória, _get_bulk() não espera _bulk_load_lock; se a carga
+        venceu, só marca o flag (lock curto) e revalida em background servindo a atual.
+        """
+        if self.bulk_mode:
+            return self._bulk is not None
+        return self._units_cache is not None
+
+    def _warm_catalog(self, unit: str):
+        try:
+            self.get_all_exams(unit)
+        except Exception as e:
+            print(f"⚠️ Catalog warm-up failed for '{unit}': {e}")
+        finally:
+            with self._warming_lock:
+                self._warming_units.discard(CatalogCache._key(unit))
 
     def search_exams(self, term: str, unit: str, limit: int = 10) -> List[Dict[str, Any]]:
+        # V117: Autocomplete servido pelo índice local; BigQuery só sem catálogo carregado
+        index = self._get_search_index(unit)
+        if index is not None:
+            return index.search(term, limit)
+
         query = f"""
         SELECT item_id, item_name, group_name, price 
         FROM `{self.project_id}.{self.dataset_id}.{self.table_id}`
@@ -140,6 +670,36 @@ class BigQueryClient:
         
         return self._run_query(query, params)
 
+    def get_table_stats(self, refresh: bool = False) -> Dict[str, Any]:
+        """Diagnostic (bloqueante): snapshot em cache, recalculado se ausente, vencido ou `refresh`."""
+        if refresh or self._table_stats is None or time.time() - self._table_stats_at >= TABLE_STATS_TTL_SECONDS:
+            return self.get_raw_table_stats()
+        return self._table_stats
+
+    def get_cached_table_stats(self) -> Dict[str, Any]:
+        """
+        Snapshot não bloqueante para o hot path de validação.
+        Nunca consulta o BigQuery na thread da request: se o snapshot não existe ou venceu,
+        dispara o cálculo em background e devolve o que houver.
+        """
+        stale = self._table_stats is None or time.time() - self._table_stats_at >= TABLE_STATS_TTL_SECONDS
+        if stale:
+            with self._table_stats_lock:
+                start = not self._table_stats_refreshing
+                self._table_stats_refreshing = True
+            if start:
+                threading.Thread(target=self._refresh_table_stats, daemon=True).start()
+        return self._table_stats or {"total": "PENDING", "sample_units": "PENDING"}
+
+    def _refresh_table_stats(self):
+        try:
+            self.get_raw_table_stats()
+        except Exception as e:
+            print(f"⚠️ Table stats refresh failed: {e}")
+        finally:
+            with self._table_stats_lock:
+                self._table_stats_refreshing = False
+
     def get_raw_table_stats(self) -> Dict[str, Any]:
         """Diagnostic: Counts rows and gets top units."""
         query = f"SELECT count(*) as total FROM `{self.project_id}.{self.dataset_id}.{self.table_id}`"
@@ -150,9 +710,70 @@ class BigQueryClient:
         units_res = self._run_query(query_units)
         units_str = "|".join([str(u.get("price_table_name")) for u in units_res])
         
-        return {"total": total, "sample_units": units_str}
+        stats = {"total": total, "sample_units": units_str}
+        if res:
+            self._table_stats = stats
+            self._table_stats_at = time.time()
+        return stats
 
     def get_units(self) -> List[str]:
+        return list(self.get_units_snapshot()["units"])
+
+    def get_units_snapshot(self) -> Dict[str, Any]:
+        """
+        V118: Lista de unidades em cache com validadores HTTP.
+        Retorna {"units", "etag", "last_modified"}; `etag` é hash do conteúdo (estável entre
+        instâncias serverless) e `last_modified` é quando a lista mudou pela última vez.
+        Revalidada junto com o ciclo do catálogo (TTL / recarga do bulk), sem bloquear quando há cache.
+        """
+        if self.bulk_mode:
+            bulk = self._get_bulk()
+            if bulk is not None:
+                modified = bulk["last_modified"] / 1000.0 if bulk["last_modified"] else bulk["loaded_at"]
+                return self._store_units(bulk["units"], modified)
+
+        cached = self._units_cache
+        if cached is None:
+            with self._units_lock:
+                if self._units_cache is None:
+                    units = self._fetch_units()
+                    if not units:
+                        return {"units": [], "etag": None, "last_modified": None}
+                    self._store_units(units)
+                return self._units_cache
+
+        if time.time() - cached["checked_at"] >= self.catalog_cache.ttl_seconds and not self._units_refreshing:
+            self._units_refreshing = True
+            threading.Thread(target=self._refresh_units, daemon=True).start()
+        return cached
+
+    def _refresh_units(self):
+        try:
+            units = self._fetch_units()
+            if units:
+                self._store_units(units)
+        except Exception as e:
+            print(f"⚠️ Units refresh failed: {e}")
+        finally:
+            self._units_refreshing = False
+
+    def _store_units(self, units: List[str], modified_at: float = None) -> Dict[str, Any]:
+        etag = hashlib.sha1("\n".join(units).encode("utf-8")).hexdigest()[:20]
+        cached = self._units_cache
+        if cached is not None and cached["etag"] == etag:
+            # Conteúdo igual: mantém o Last-Modified original
+            cached["checked_at"] = time.time()
+            return cached
+        now = time.time()
+        self._units_cache = {
+            "units": list(units),
+            "etag": etag,
+            "last_modified": modified_at or now,
+            "checked_at": now
+        }
+        return self._units_cache
+
+    def _fetch_units(self) -> List[str]:
         query = f"""
         SELECT DISTINCT price_table_name
         FROM `{self.project_id}.{self.dataset_id}.{self.table_id}`
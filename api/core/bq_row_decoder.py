@@ -0,0 +1,121 @@
+from datetime import datetime, timezone
+from typing import List, Dict, Any, Callable, Tuple
+import threading
+
+# V115: Decoder de rows do BigQuery REST compilado uma vez por schema.
+# A API devolve cada row como {"f": [{"v": "..."}, ...]} com todos os valores em string;
+# o trabalho que só depende do schema (índice da coluna, cast por tipo) sai do loop por row.
+
+
+def _to_int(v):
+    return None if v is None else int(v)
+
+
+def _to_float(v):
+    return None if v is None else float(v)
+
+
+def _to_bool(v):
+    return None if v is None else v == "true"
+
+
+def _to_timestamp(v):
+    # REST devolve TIMESTAMP como segundos desde epoch (string com notação científica)
+    return None if v is None else datetime.fromtimestamp(float(v), tz=timezone.utc)
+
+
+def _to_price(v):
+    # Compatível com o cliente antigo: price sempre float, valor inválido -> 0.0
+    if v is None:
+        return None
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+TYPE_CASTS: Dict[str, Callable] = {
+    "INTEGER": _to_int,
+    "INT64": _to_int,
+    "FLOAT": _to_float,
+    "FLOAT64": _to_float,
+    "NUMERIC": _to_float,
+    "BIGNUMERIC": _to_float,
+    "BOOLEAN": _to_bool,
+    "BOOL": _to_bool,
+    "TIMESTAMP": _to_timestamp,
+}
+
+# Overrides por nome de coluna (têm prioridade sobre o tipo)
+FIELD_CASTS: Dict[str, Callable] = {
+    "price": _to_price,
+}
+
+
+class RowDecoder:
+    """
+    Decoder especializado para um schema: gera (via exec, como namedtuple) funções sem
+    loop por campo que convertem uma página inteira de rows em tuplas compactas
+    (ordem das colunas = ordem do SELECT, ver `index`) ou, para respostas da API, em dicts.
+    """
+
+    def __init__(self, schema: List[Dict[str, Any]]):
+        self.fields: Tuple[str, ...] = tuple(f.get("name") for f in schema)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.fields)}
+        self.decode_page, self.decode_page_dicts = self._compile(schema)
+
+    def _compile(self, schema: List[Dict[str, Any]]):
+        namespace = {}
+        exprs = []
+        for i, field in enumerate(schema):
+            cast = None
+            if field.get("mode") != "REPEATED" and field.get("type") != "RECORD":
+                cast = FIELD_CASTS.get(field.get("name")) or TYPE_CASTS.get((field.get("type") or "").upper())
+            if cast is None:
+                exprs.append(f"f[{i}]['v']")
+            else:
+                namespace[f"_c{i}"] = cast
+                exprs.append(f"_c{i}(f[{i}]['v'])")
+
+        values = ", ".join(exprs) + ("," if len(exprs) == 1 else "")
+        items = ", ".join(f"{name!r}: {expr}" for name, expr in zip(self.fields, exprs))
+        source = (
+            "def decode_page(rows):\n"
+            "    out = []\n"
+            "    append = out.append\n"
+            "    for row in rows:\n"
+            "        f = row['f']\n"
+            f"        append(({values}))\n"
+            "    return out\n"
+            "\n"
+            "def decode_page_dicts(rows):\n"
+            "    out = []\n"
+            "    append = out.append\n"
+            "    for row in rows:\n"
+            "        f = row['f']\n"
+            f"        append({{{items}}})\n"
+            "    return out\n"
+        )
+        exec(source, namespace)
+        return namespace["decode_page"], namespace["decode_page_dicts"]
+
+    def as_dict(self, record: tuple) -> Dict[str, Any]:
+        """Visão dict de uma tupla (para respostas da API)."""
+        return dict(zip(self.fields, record))
+
+
+_DECODERS: Dict[tuple, RowDecoder] = {}
+_DECODERS_LOCK = threading.Lock()
+
+
+def get_row_decoder(schema: List[Dict[str, Any]]) -> RowDecoder:
+    """Decoder em cache por assinatura de schema (nome, tipo, modo)."""
+    signature = tuple((f.get("name"), f.get("type"), f.get("mode")) for f in schema)
+    decoder = _DECODERS.get(signature)
+    if decoder is None:
+        with _DECODERS_LOCK:
+            decoder = _DECODERS.get(signature)
+            if decoder is None:
+                decoder = RowDecoder(schema)
+                _DECODERS[signature] = decoder
+    return decoder
@@ -0,0 +1,240 @@
+import os
+import sys
+import threading
+from collections import Counter, OrderedDict
+from itertools import chain
+from typing import List, Dict, Any, Optional
+
+from core.catalog_snapshot import catalog_key
+from core.substring_index import SubstringIndex
+from services.fuzzy_matcher import FuzzyMatcher
+from services.fuzzy_scorers import resolve_scorer
+
+# V122: Estruturas de matching derivadas do catálogo, montadas 1x por (unidade, versão do catálogo)
+# e reutilizadas entre chamadas de validate_batch. O custo por request passa a depender só dos termos.
+CATALOG_INDEX_MEMORY_MB = int(os.getenv("CATALOG_INDEX_MEMORY_MB", "256"))
+
+# Tokens curtos que ainda contam como essenciais no termo de busca (STAGE 4)
+SHORT_ESSENTIAL_TOKENS = {"d", "k", "p", "ca", "fe", "zn", "c3", "c4"}
+
+
+class CatalogIndex:
+    """
+    Visão indexada e imutável do catálogo de uma unidade:
+      - exam_map   : chave normalizada -> itens (na ordem do catálogo)
+      - exam_keys  : chaves únicas (ordem de primeira ocorrência)
+      - substring  : Aho-Corasick + trigramas sobre as chaves (STAGE 3, montado no 1º uso)
+      - token_postings / essential_postings : índice invertido token -> ids de chave (STAGE 4)
+      - fuzzy_map  : mapa normalizado -> chave para o FuzzyMatcher (chaves já normalizadas)
+      - fuzzy_matcher : FuzzyMatcher da unidade sobre fuzzy_map (somente leitura)
+    """
+
+    def __init__(self, items: List[Dict[str, Any]], keys: Optional[List[str]] = None,
+                 unit: str = None, version: Optional[int] = None):
+        self.unit = unit
+        self.version = version
+        self.items = items
+        if keys is None:
+            keys = [catalog_key(item["search_name"]) for item in items]
+
+        self.exam_map: Dict[str, List[Dict[str, Any]]] = {}
+        for key, item in zip(keys, items):
+            bucket = self.exam_map.get(key)
+            if bucket is None:
+                self.exam_map[key] = [item]
+            else:
+                bucket.append(item)
+        self.exam_keys: List[str] = list(self.exam_map)
+        self.key_ids: Dict[str, int] = {key: i for i, key in enumerate(self.exam_keys)}
+        self._substring: Optional[SubstringIndex] = None
+        self._substring_lock = threading.Lock()
+
+        # V123: Índice invertido do STAGE 4. O STAGE 4 re-normaliza a chave antes de tokenizar:
+        # mesmo resultado, calculado 1x. Postings em ordem crescente de id (= ordem de exam_keys).
+        self.token_postings: Dict[str, List[int]] = {}
+        self.essential_postings: Dict[str, List[int]] = {}
+        self.essential_counts: List[int] = []
+        for key_id, key in enumerate(self.exam_keys):
+            tokens = set(catalog_key(key).split())
+            essential = 0
+            for token in tokens:
+                self.token_postings.setdefault(token, []).append(key_id)
+                if len(token) > 2:
+                    self.essential_postings.setdefault(token, []).append(key_id)
+                    essential += 1
+            self.essential_counts.append(essential)
+
+        # Chaves do catálogo já saem normalizadas: a normalização do FuzzyMatcher é identidade
+        self.fuzzy_map: Dict[str, str] = {key: key for key in self.exam_keys}
+        # V131: Matcher por catálogo (antes: singleton global mutado a cada request)
+        self.fuzzy_matcher = FuzzyMatcher(self.exam_keys, self.fuzzy_map)
+
+        self._base_bytes = self._estimate_bytes()
+
+    def _estimate_bytes(self) -> int:
+        # Estimativa rasa (strings/containers próprios do índice; os itens pertencem ao CatalogCache)
+        size = sys.getsizeof(self.exam_map) + sys.getsizeof(self.exam_keys) + sys.getsizeof(self.fuzzy_map)
+        for key, bucket in self.exam_map.items():
+            size += sys.getsizeof(key) + sys.getsizeof(bucket)
+        for postings in (self.token_postings, self.essential_postings):
+            size += sys.getsizeof(postings)
+            for token, ids in postings.items():
+                size += sys.getsizeof(token) + sys.getsizeof(ids) + 8 * len(ids)
+        return size + sys.getsizeof(self.essential_counts) + 8 * len(self.essential_counts)
+
+    @property
+    def approx_bytes(self) -> int:
+        substring = self._substring
+        size = self._base_bytes + self.fuzzy_matcher.approx_bytes
+        return size + (substring.approx_bytes if substring is not None else 0)
+
+    @property
+    def substring(self) -> SubstringIndex:
+        # Montado só quando o STAGE 3 é alcançado (a maioria dos termos resolve no STAGE 1)
+        if self._substring is None:
+            with self._substring_lock:
+                if self._substring is None:
+                    self._substring = SubstringIndex(self.exam_keys)
+        return self._substring
+
+    def substring_matches(self, text: str) -> List[int]:
+        """
+        STAGE 3 via motor de substring. Ids das chaves (ordem de exam_keys) onde
+        `text == key or (len(text) > 5 and (text in key or key in text))`; termos < 4 chars ignorados.
+        """
+        if len(text) < 4:
+            return []
+        if len(text) <= 5:
+            key_id = self.key_ids.get(text)
+            return [] if key_id is None else [key_id]
+        engine = self.substring
+        return sorted(engine.keys_in(text) | engine.keys_containing(text))
+
+    def token_overlap(self, text: str) -> List[int]:
+        """
+        STAGE 4 (V109 bidirecional) via posting lists. Ids das chaves (ordem de exam_keys) onde:
+          - tokens essenciais do termo ⊆ tokens da chave (clássico), ou
+          - tokens essenciais da chave ⊆ tokens do termo (descritivo)
+        Chaves sem token essencial (> 2 chars) nunca casam, como no loop original.
+        """
+        v_tokens = set(text.split())
+        # Essential tokens: > 2 chars OR specific medical codes/letters
+        essential_v = {t for t in v_tokens if len(t) > 2 or t in SHORT_ESSENTIAL_TOKENS}
+        if not essential_v:
+            return []
+
+        # Clássico: interseção das postings, começando pela menor
+        postings = [self.token_postings.get(t) for t in essential_v]
+        matched = set()
+        if all(postings):
+            postings.sort(key=len)
+            matched = set(postings[0])
+            for ids in postings[1:]:
+                matched.intersection_update(ids)
+                if not matched:
+                    break
+            counts = self.essential_counts
+            matched = {i for i in matched if counts[i]}
+
+        # Descritivo: chave cujos tokens essenciais aparecem todos no termo
+        shared = Counter(chain.from_iterable(
+            self.essential_postings.get(t, ()) for t in v_tokens if len(t) > 2
+        ))
+        counts = self.essential_counts
+        matched.update(i for i, n in shared.items() if n == counts[i])
+        return sorted(matched)
+
+
+class CatalogIndexCache:
+    """LRU de CatalogIndex por unidade, limitado por memória estimada (não por número de unidades)."""
+
+    def __init__(self, budget_bytes: int = CATALOG_INDEX_MEMORY_MB * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self._indexes: "OrderedDict[str, CatalogIndex]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _key(unit: str) -> str:
+        return (unit or "").strip().lower()
+
+    @property
+    def total_bytes(self) -> int:
+        # Recalculado: índices crescem depois do build (motor de substring é montado sob demanda)
+        return sum(index.approx_bytes for index in list(self._indexes.values()))
+
+    def get(self, unit: str, items: List[Dict[str, Any]], bq_client: Any = None) -> CatalogIndex:
+        """
+        Índice do catálogo `items` da unidade. Reaproveitado enquanto a versão do catálogo em
+        cache não mudar; catálogos fora do CatalogCache (ex: blind fetch) geram índice avulso.
+        """
+        entry = None
+        catalog_cache = getattr(bq_client, "catalog_cache", None)
+        if catalog_cache is not None:
+            entry = catalog_cache.get_entry(unit)
+        if entry is None or entry["items"] is not items:
+            return CatalogIndex(items, unit=unit)
+
+        key = self._key(unit)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None and index.version == entry["version"]:
+                self._indexes.move_to_end(key)
+                self.hits += 1
+                self._enforce_budget()
+                return index
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+
+        # Um build por unidade; requests concorrentes aguardam o mesmo índice
+        with build_lock:
+            with self._lock:
+                index = self._indexes.get(key)
+                if index is not None and index.version == entry["version"]:
+                    self.hits += 1
+                    return index
+            index = CatalogIndex(items, entry.get("keys"), unit=unit, version=entry["version"])
+            self._store(key, index)
+            return index
+
+    def _store(self, key: str, index: CatalogIndex):
+        with self._lock:
+            self.builds += 1
+            self._indexes.pop(key, None)
+            self._indexes[key] = index
+            self._enforce_budget()
+
+    def _enforce_budget(self):
+        # Chamado com self._lock. Sempre mantém o índice mais recente, mesmo que sozinho exceda o orçamento
+        total = self.total_bytes
+        while total > self.budget_bytes and len(self._indexes) > 1:
+            _, evicted = self._indexes.popitem(last=False)
+            total -= evicted.approx_bytes
+            self.evictions += 1
+
+    def invalidate(self, unit: str = None):
+        with self._lock:
+            if unit is None:
+                self._indexes.clear()
+            else:
+                self._indexes.pop(self._key(unit), None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "budget_mb": round(self.budget_bytes / (1024 * 1024), 1),
+                "used_mb": round(self.total_bytes / (1024 * 1024), 2),
+                "hits": self.hits,
+                "builds": self.builds,
+                "evictions": self.evictions,
+                "fuzzy_scorer": resolve_scorer(),
+                "units": {
+                    index.unit: {"version": index.version, "keys": len(index.exam_keys)}
+                    for index in self._indexes.values()
+                }
+            }
+
+
+catalog_indexes = CatalogIndexCache()
@@ -0,0 +1,193 @@
+import hashlib
+import json
+import os
+import struct
+import tempfile
+import time
+from typing import List, Dict, Any, Optional
+
+from core.text_normalizer import normalize_validation
+
+# Formato binário compacto e versionado do catálogo processado de uma unidade.
+#
+#   header  : MAGIC (6s) | FORMAT_VERSION (H) | row_count (I) | meta_len (I)
+#   meta    : JSON utf-8 (unit, saved_at, key_version, int_columns)
+#   colunas : para cada coluna de texto -> nulls (row_count bytes) | offsets (row_count+1 x uint32,
+#             em code points) | blob_len (I) | blob utf-8
+#             price -> nulls (row_count bytes) | valores (row_count x float64)
+#   Cada seção é alinhada em 8 bytes (offsets/float64 lidos com memoryview.cast).
+#   O load lê o arquivo inteiro de uma vez (1 read) e materializa os dicts: o catálogo é consumido
+#   como lista de dicts mutável (validação, índices), então não há ganho em manter colunas lazy.
+MAGIC = b"VSQCAT"
+FORMAT_VERSION = 1
+# Incrementar quando a regra de normalização das chaves mudar (invalida snapshots antigos)
+KEY_VERSION = 1
+
+TEXT_COLUMNS = ("item_id", "item_name", "search_name", "group_name", "name_key")
+_HEADER = struct.Struct("<6sHII")
+
+SNAPSHOT_DIR = os.getenv("BQ_SNAPSHOT_DIR", os.path.join(tempfile.gettempdir(), "vitta_catalog"))
+
+
+def catalog_key(text: str) -> str:
+    """Chave normalizada do catálogo (mesma regra de ValidationService.normalize_text)."""
+    return normalize_validation(text)
+
+
+def _pad(buf: bytearray):
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+class CatalogSnapshotStore:
+    """Persiste/carrega snapshots de catálogo por unidade em disco (/tmp por padrão)."""
+
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.directory = directory
+        self.enabled = bool(directory) and directory.lower() != "off"
+
+    def path_for(self, unit: str) -> str:
+        key = (unit or "").strip().lower()
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"catalog_{digest}.vsc")
+
+    def save(self, unit: str, items: List[Dict[str, Any]], keys: List[str]) -> Optional[str]:
+        if not self.enabled:
+            return None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            row_count = len(items)
+            # Colunas INT64 (ex: item_id tipado pelo decoder) voltam como int no load
+            int_columns = [
+                col for col in ("item_id",)
+                if items and all(type(row.get(col)) is int for row in items)
+            ]
+            meta = json.dumps({
+                "unit": unit,
+                "saved_at": time.time(),
+                "key_version": KEY_VERSION,
+                "int_columns": int_columns
+            }).encode("utf-8")
+
+            buf = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, row_count, len(meta)))
+            buf.extend(meta)
+            _pad(buf)
+
+            for col in TEXT_COLUMNS:
+                values = keys if col == "name_key" else [row.get(col) for row in items]
+                nulls = bytes(1 if v is None else 0 for v in values)
+                offsets = [0]
+                parts = []
+                pos = 0
+                for v in values:
+                    s = "" if v is None else str(v)
+                    parts.append(s)
+                    pos += len(s)
+                    offsets.append(pos)
+                blob = "".join(parts).encode("utf-8")
+
+                buf.extend(nulls)
+                _pad(buf)
+                buf.extend(struct.pack(f"<{row_count + 1}I", *offsets))
+                _pad(buf)
+                buf.extend(struct.pack("<I", len(blob)))
+                buf.extend(blob)
+                _pad(buf)
+
+            prices = [row.get("price") for row in items]
+            buf.extend(bytes(1 if p is None else 0 for p in prices))
+            _pad(buf)
+            buf.extend(struct.pack(f"<{row_count}d", *[0.0 if p is None else float(p) for p in prices]))
+
+            # Escrita atômica: leitores nunca veem um arquivo pela metade
+            path = self.path_for(unit)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(buf)
+            os.replace(tmp_path, path)
+            return path
+        except Exception as e:
+            print(f"⚠️ Catalog snapshot save failed for '{unit}': {e}")
+            return None
+
+    def load(self, unit: str) -> Optional[Dict[str, Any]]:
+        """Carrega o snapshot (1 read). Retorna {"meta", "items", "keys"} ou None."""
+        if not self.enabled:
+            return None
+        path = self.path_for(unit)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            snapshot = self._decode(memoryview(data))
+            if snapshot and (snapshot["meta"].get("unit") or "").strip().lower() != (unit or "").strip().lower():
+                return None
+            return snapshot
+        except Exception as e:
+            print(f"⚠️ Catalog snapshot unreadable ({path}): {e}")
+            return None
+
+    @staticmethod
+    def _decode(mv: memoryview) -> Optional[Dict[str, Any]]:
+        try:
+            magic, version, row_count, meta_len = _HEADER.unpack_from(mv, 0)
+            if magic != MAGIC or version != FORMAT_VERSION:
+                return None
+            pos = _HEADER.size
+            meta = json.loads(bytes(mv[pos:pos + meta_len]).decode("utf-8"))
+            if meta.get("key_version") != KEY_VERSION:
+                return None
+            pos += meta_len
+            pos += -pos % 8
+
+            columns = {}
+            for col in TEXT_COLUMNS:
+                nulls = mv[pos:pos + row_count]
+                pos += row_count
+                pos += -pos % 8
+                offsets = mv[pos:pos + 4 * (row_count + 1)].cast("I")
+                pos += 4 * (row_count + 1)
+                pos += -pos % 8
+                (blob_len,) = struct.unpack_from("<I", mv, pos)
+                pos += 4
+                # Decodifica direto da view (sem cópia intermediária em bytes)
+                text = str(mv[pos:pos + blob_len], "utf-8")
+                pos += blob_len
+                pos += -pos % 8
+                columns[col] = [
+                    None if nulls[i] else text[offsets[i]:offsets[i + 1]]
+                    for i in range(row_count)
+                ]
+                offsets.release()
+                nulls.release()
+
+            price_nulls = mv[pos:pos + row_count]
+            pos += row_count
+            pos += -pos % 8
+            price_view = mv[pos:pos + 8 * row_count].cast("d")
+            prices = [None if price_nulls[i] else price_view[i] for i in range(row_count)]
+            price_view.release()
+            price_nulls.release()
+        finally:
+            mv.release()
+
+        for col in meta.get("int_columns", []):
+            columns[col] = [None if v is None else int(v) for v in columns[col]]
+
+        item_ids, names, search_names, groups = (
+            columns["item_id"], columns["item_name"], columns["search_name"], columns["group_name"]
+        )
+        items = [
+            {
+                "item_id": item_ids[i],
+                "item_name": names[i],
+                "search_name": search_names[i],
+                "group_name": groups[i],
+                "price": prices[i]
+            }
+            for i in range(row_count)
+        ]
+        return {"meta": meta, "items": items, "keys": columns["name_key"]}
+
+
+catalog_snapshot_store = CatalogSnapshotStore()
@@ -0,0 +1,208 @@
+import os
+import random
+import threading
+import time
+from typing import Dict, Any, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# V119: Camada única de transporte HTTP para BigQuery, Vision e Gemini.
+# - pools keep-alive por host (sem handshake TLS a cada chamada)
+# - timeouts de connect/read por endpoint (nada de chamada sem timeout)
+# - retries com jitter limitados por um retry budget (não amplifica incidentes)
+# - contadores de latência/erro por endpoint
+
+
+class EndpointConfig:
+    def __init__(self, host: str, connect_timeout: float, read_timeout: float,
+                 pool_maxsize: int = 10, max_retries: int = 2):
+        self.host = host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+ENDPOINTS: Dict[str, EndpointConfig] = {
+    "bigquery": EndpointConfig(
+        "bigquery.googleapis.com",
+        connect_timeout=_env_float("HTTP_BQ_CONNECT_TIMEOUT", 3.05),
+        read_timeout=_env_float("HTTP_BQ_READ_TIMEOUT", 30),
+        pool_maxsize=10, max_retries=2
+    ),
+    "vision": EndpointConfig(
+        "vision.googleapis.com",
+        connect_timeout=_env_float("HTTP_VISION_CONNECT_TIMEOUT", 3.05),
+        read_timeout=_env_float("HTTP_VISION_READ_TIMEOUT", 20),
+        pool_maxsize=4, max_retries=1
+    ),
+    "gemini": EndpointConfig(
+        "generativelanguage.googleapis.com",
+        connect_timeout=_env_float("HTTP_GEMINI_CONNECT_TIMEOUT", 3.05),
+        read_timeout=_env_float("HTTP_GEMINI_READ_TIMEOUT", 30),
+        pool_maxsize=8, max_retries=1
+    ),
+}
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class RetryBudget:
+    """
+    Token bucket de retries: cada request deposita `ratio` tokens e cada retry gasta 1.
+    Em incidente (tudo falhando) os retries ficam limitados a ~ratio x tráfego.
+    """
+
+    def __init__(self, ratio: float = 0.2, initial: float = 5.0, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = initial
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class EndpointStats:
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.retries_denied = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.status: Dict[str, int] = {}
+
+    def record(self, elapsed_ms: float, status: str, error: bool):
+        self.requests += 1
+        self.errors += 1 if error else 0
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.status[status] = self.status.get(status, 0) + 1
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        histogram = {f"le_{b}ms": n for b, n in zip(LATENCY_BUCKETS_MS, self.buckets)}
+        histogram["gt_30000ms"] = self.buckets[-1]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "retries_denied": self.retries_denied,
+            "avg_ms": round(self.total_ms / self.requests, 1) if self.requests else 0.0,
+            "max_ms": round(self.max_ms, 1),
+            "status": dict(self.status),
+            "latency_histogram": histogram
+        }
+
+
+class HttpTransport:
+    def __init__(self, endpoints: Dict[str, EndpointConfig] = None):
+        self.endpoints = endpoints or ENDPOINTS
+        self._sessions: Dict[str, requests.Session] = {}
+        self._budgets = {name: RetryBudget() for name in self.endpoints}
+        self._stats = {name: EndpointStats() for name in self.endpoints}
+        self._lock = threading.Lock()
+
+    def _adapter(self, endpoint: str) -> HTTPAdapter:
+        config = self.endpoints[endpoint]
+        # Retries ficam a cargo do transporte (com budget), não do urllib3
+        return HTTPAdapter(pool_connections=1, pool_maxsize=config.pool_maxsize, max_retries=0)
+
+    def mount(self, session: requests.Session, endpoint: str) -> requests.Session:
+        """Configura o pool do endpoint numa sessão externa (ex: AuthorizedSession do BigQuery)."""
+        session.mount(f"https://{self.endpoints[endpoint].host}", self._adapter(endpoint))
+        return session
+
+    def session(self, endpoint: str) -> requests.Session:
+        """Sessão keep-alive compartilhada do endpoint."""
+        session = self._sessions.get(endpoint)
+        if session is None:
+            with self._lock:
+                session = self._sessions.get(endpoint)
+                if session is None:
+                    session = self.mount(requests.Session(), endpoint)
+                    self._sessions[endpoint] = session
+        return session
+
+    def request(self, endpoint: str, method: str, url: str,
+                session: Optional[requests.Session] = None, **kwargs) -> requests.Response:
+        """
+        Executa a chamada com timeout do endpoint e retries com jitter (limitados pelo budget).
+        Devolve a última resposta (mesmo com status de erro) ou propaga a última exceção de rede.
+        """
+        config = self.endpoints[endpoint]
+        budget = self._budgets[endpoint]
+        stats = self._stats[endpoint]
+        session = session or self.session(endpoint)
+        kwargs.setdefault("timeout", (config.connect_timeout, config.read_timeout))
+
+        budget.deposit()
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = session.request(method, url, **kwargs)
+                error = None
+            except (requests.ConnectionError, requests.Timeout) as e:
+                response = None
+                error = e
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            retryable = error is not None or response.status_code in RETRYABLE_STATUS
+            with self._lock:
+                stats.record(
+                    elapsed_ms,
+                    type(error).__name__ if error is not None else str(response.status_code),
+                    retryable or (response is not None and response.status_code >= 400)
+                )
+
+            if not retryable or attempt >= config.max_retries:
+                break
+            if not budget.try_withdraw():
+                with self._lock:
+                    stats.retries_denied += 1
+                break
+
+            with self._lock:
+                stats.retries += 1
+            attempt += 1
+            # Full jitter: 0..min(4s, 0.25s * 2^tentativa)
+            time.sleep(random.uniform(0, min(4.0, 0.25 * (2 ** attempt))))
+
+        if error is not None:
+            raise error
+        return response
+
+    def post(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        return self.request(endpoint, "POST", url, **kwargs)
+
+    def get(self, endpoint: str, url: str, **kwargs) -> requests.Response:
+        return self.request(endpoint, "GET", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+
+http_transport = HttpTransport()
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+# V128: Cache entre requests do resultado final por termo (matches, status, estratégia).
+# A chave carrega tudo que muda o resultado: (unidade, versão do catálogo, versão do aprendizado,
+# versão dos sinônimos, termo normalizado). Quando learn()/refresh do catálogo/sinônimos mudam,
+# a versão muda e as entradas antigas simplesmente deixam de ser alcançadas (saem por LRU/TTL).
+MATCH_CACHE_SIZE = int(os.getenv("MATCH_CACHE_SIZE", "4096"))
+MATCH_CACHE_TTL_SECONDS = int(os.getenv("MATCH_CACHE_TTL_SECONDS", "3600"))
+
+MatchContext = Tuple[str, int, int, int]
+
+
+class MatchResultCache:
+    """LRU + TTL de resultados de matching por (contexto, termo normalizado)."""
+
+    def __init__(self, max_entries: int = MATCH_CACHE_SIZE, ttl_seconds: int = MATCH_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def context(self, unit: str, catalog_version: Optional[int], learning_version: int, synonyms_version: int) -> Optional[MatchContext]:
+        """Contexto de cache da request; None quando o catálogo não tem versão (não cacheável)."""
+        if not catalog_version or self.max_entries <= 0:
+            return None
+        return ((unit or "").strip().lower(), catalog_version, learning_version, synonyms_version)
+
+    def get(self, context: Optional[MatchContext], term_key: str) -> Optional[Dict[str, Any]]:
+        if context is None:
+            return None
+        key = (context, term_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.time() - entry["stored_at"] >= self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["result"]
+
+    def put(self, context: Optional[MatchContext], term_key: str, result: Dict[str, Any]):
+        if context is None:
+            return
+        with self._lock:
+            self._entries[(context, term_key)] = {"result": result, "stored_at": time.time()}
+            self._entries.move_to_end((context, term_key))
+            self.stores += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, unit: str = None):
+        with self._lock:
+            if unit is None:
+                self._entries.clear()
+                return
+            unit_key = (unit or "").strip().lower()
+            for key in [k for k in self._entries if k[0][0] == unit_key]:
+                del self._entries[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "expirations": self.expirations,
+                "evictions": self.evictions
+            }
+
+
+match_cache = MatchResultCache()
@@ -6,15 +6,66 @@ import traceback
 from PIL import Image
 import re
 from core.auth_utils import get_gcp_credentials
+from core.text_normalizer import normalize_ocr
+from services.fuzzy_index import FuzzySearchIndex
+from services.ocr_confusion_index import OCRConfusionTable, OCRConfusionIndex
 import json
-import unicodedata
 import os
+import threading
 
 # New OCR Pipeline V87.0
 from services.image_preprocessor import ImagePreprocessor
 from services.llm_interpreter import LLMInterpreter
 from services.ocr_resolute_auditor import OCRResoluteAuditor
 
+class OCRMatchingIndexes:
+    """
+    V135: Índices sobre o dicionário achatado (antes: 2 varreduras lineares por linha do OCR)
+      - exact_map: termo normalizado -> nome oficial (1ª ocorrência, como a varredura antiga)
+      - confusion_index: distância ponderada por confusões OCR (api/data/ocr_confusions.json)
+      - fuzzy_engine: melhor ratio do difflib com poda (mesmo score da varredura antiga)
+    V136: Montados 1x por processo e compartilhados (o /api/ocr cria um OCRProcessor por request).
+    """
+
+    def __init__(self, flat_list: List[Tuple[str, str]]):
+        self.exact_map: Dict[str, str] = {}
+        # Posição da 1ª ocorrência no dicionário: desempate da varredura antiga
+        self.positions: Dict[str, int] = {}
+        for position, (norm_term, official_name) in enumerate(flat_list):
+            if norm_term not in self.exact_map:
+                self.exact_map[norm_term] = official_name
+                self.positions[norm_term] = position
+        self.confusions = OCRConfusionTable.load()
+        self.confusion_index = OCRConfusionIndex(list(self.exact_map), self.confusions)
+        self.fuzzy_engine = FuzzySearchIndex(list(self.exact_map))
+
+    def best_ratio_term(self, text_norm: str) -> Optional[Tuple[str, float]]:
+        """
+        (termo, ratio 0-100) de maior SequenceMatcher(None, texto, termo).ratio(); empate fica com o
+        termo que aparece primeiro no dicionário, como na varredura linear.
+        """
+        best = self.fuzzy_engine.close_matches(text_norm, n=1, cutoff=0.0, word_first=True)
+        if not best or best[0][0] <= 0.0:
+            return None
+        # Todos os empatados no melhor ratio (cutoff = ele); fica o 1º na ordem do dicionário
+        tied = self.fuzzy_engine.close_matches(text_norm, n=len(self.exact_map), cutoff=best[0][0], word_first=True)
+        norm_term = min((key for _, key in tied), key=self.positions.__getitem__)
+        return norm_term, best[0][0] * 100.0
+
+
+_matching_indexes: Optional[OCRMatchingIndexes] = None
+_matching_lock = threading.Lock()
+
+
+def get_matching_indexes(flat_list: List[Tuple[str, str]]) -> OCRMatchingIndexes:
+    global _matching_indexes
+    if _matching_indexes is None:
+        with _matching_lock:
+            if _matching_indexes is None:
+                _matching_indexes = OCRMatchingIndexes(flat_list)
+    return _matching_indexes
+
+
 class OCRProcessor:
     def __init__(self):
         print("Initializing OCRProcessor with Google Cloud Vision API V87.0...")
@@ -94,7 +145,9 @@ class OCRProcessor:
                 ]
             }
 
-            response_obj = requests.post(url, headers=headers, json=payload)
+            # V119: pool keep-alive + timeout/retry do transporte compartilhado
+            from core.http_transport import http_transport
+            response_obj = http_transport.post("vision", url, headers=headers, json=payload)
             
             if response_obj.status_code != 200:
                 return {"error": f"API ERROR {response_obj.status_code}: {response_obj.text}", "status": "error"}
@@ -233,34 +286,39 @@ class OCRProcessor:
                 "debug_meta": {"error_trace": str(e)}
             }
 
+    @property
+    def matching(self) -> OCRMatchingIndexes:
+        # V136: Montados no 1º _match_term do processo, não a cada OCRProcessor()
+        return get_matching_indexes(self.exams_flat_list)
+
     def _match_term(self, text: str) -> Optional[Tuple[str, float, str]]:
         text_norm = self._normalizar_texto(text)
         if not text_norm: return None
+        matching = self.matching
 
         # Phase A: Exact Match
-        best_ratio = 0.0
-        best_official = None
-        best_norm_term = ""
-
-        for norm_term, official_name in self.exams_flat_list:
-            if text_norm == norm_term:
-                return official_name, 100.0, "exact_match"
-        
-        from difflib import SequenceMatcher
-        
-        for norm_term, official_name in self.exams_flat_list:
-            sm = SequenceMatcher(None, text_norm, norm_term)
-            ratio = sm.ratio() * 100.0
-            
-            if ratio > best_ratio:
-                best_ratio = ratio
-                best_official = official_name
-                best_norm_term = norm_term
-
-        score = best_ratio
-        
-        if not best_official:
+        official_name = matching.exact_map.get(text_norm)
+        if official_name:
+            return official_name, 100.0, "exact_match"
+
+        # Regras determinísticas (dado): linha inteira -> termo do dicionário
+        corrected = matching.confusions.apply_rules(text_norm)
+        if corrected and corrected in matching.exact_map:
+            return matching.exact_map[corrected], 95.0, "ocr_rule"
+
+        # Confusões OCR: mesmos limiares da calibração abaixo (token curto >= 95, demais >= 85)
+        min_score = 95 if len(text_norm) <= 4 else 85
+        confusion = matching.confusion_index.best_match(text_norm, min_score=min_score)
+        if confusion:
+            norm_term, score = confusion
+            return matching.exact_map[norm_term], score, "ocr_confusion"
+
+        # Melhor ratio do dicionário inteiro (índice com poda em vez da varredura)
+        best = matching.best_ratio_term(text_norm)
+        if not best:
             return None
+        best_norm_term, score = best
+        best_official = matching.exact_map[best_norm_term]
             
         # Calibration Rules
         if len(text_norm) <= 4:
@@ -321,33 +379,8 @@ class OCRProcessor:
         return True
 
     def _normalizar_texto(self, texto: str) -> str:
-        if not texto: return ""
-        texto = texto.upper()
-        
-        noise = [
-            "EXAMES LABORATORIAIS", 
-            "EXAME LABORATORIAL",
-            "SOLICITACAO DE EXAMES",
-            " E EXAMES",
-            "LABORATORIAIS",
-            "LABORATORIAL"
-        ]
-        for n in noise:
-            texto = texto.replace(n, "")
-
-        # Remove acentos
-        texto = unicodedata.normalize('NFKD', texto)
-        texto = "".join([c for c in texto if not unicodedata.combining(c)])
-        
-        # Vitamin D special
-        texto = texto.replace("2,5", "25").replace("2.5", "25")
-
-        # Keep only letters and numbers
-        texto = re.sub(r'[^A-Z0-9\s]', ' ', texto)
-        
-        # Collapse whitespace
-        texto = re.sub(r'\s+', ' ', texto).strip()
-        return texto
+        # V126: normalizador compartilhado (perfil OCR), mesma saída de antes
+        return normalize_ocr(texto)
 
     def _load_exams_dictionary(self) -> Dict:
         try:
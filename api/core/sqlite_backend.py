@@ -0,0 +1,180 @@
+import os
+import random
+import re
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from typing import List, Dict, Any, Iterator, Optional
+
+# V121: Stand-in local do BigQuery (SQLite) para benchmark / teste de carga sem rede.
+# Executa as MESMAS queries do BigQueryClient: a tabela `projeto.dataset.tabela` vira o nome
+# da tabela local e os parâmetros nomeados @param viram :param (tipados pelo parameterType).
+#
+#   BQ_BACKEND=sqlite BQ_SQLITE_PATH=/tmp/vitta_lista_precos.db
+#   python api/core/sqlite_backend.py /tmp/vitta_lista_precos.db 200 5000   (gera o catálogo sintético)
+
+BQ_SQLITE_PATH = os.getenv("BQ_SQLITE_PATH", os.path.join(tempfile.gettempdir(), "vitta_lista_precos.db"))
+SQLITE_PAGE_SIZE = int(os.getenv("BQ_PAGE_SIZE", "10000"))
+
+_TABLE_REF = re.compile(r"`[^`]*?([A-Za-z0-9_]+)`")
+_PARAM_REF = re.compile(r"@([A-Za-z_][A-Za-z0-9_]*)")
+
+PARAM_CASTS = {
+    "INT64": int,
+    "INTEGER": int,
+    "FLOAT64": float,
+    "FLOAT": float,
+    "NUMERIC": float,
+    "BOOL": lambda v: str(v).lower() == "true",
+    "BOOLEAN": lambda v: str(v).lower() == "true",
+}
+
+
+def _lower(value):
+    # LOWER do SQLite só trata ASCII; o do BigQuery é Unicode ("GOIÂNIA" -> "goiânia")
+    return value.lower() if isinstance(value, str) else value
+
+
+class SQLiteBackend:
+    """Executa SQL no dialeto usado pelo BigQueryClient contra um arquivo SQLite local."""
+
+    def __init__(self, path: str = BQ_SQLITE_PATH, page_size: int = SQLITE_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Conexão somente-leitura por thread (o cliente consulta de várias threads)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if not os.path.exists(self.path):
+                raise FileNotFoundError(f"SQLite catalog not found: {self.path} (run the synthetic loader)")
+            conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            conn.create_function("LOWER", 1, _lower, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def translate(query: str, parameters: List[Dict[str, Any]] = None):
+        """SQL do BigQuery -> (SQL do SQLite, parâmetros nomeados)."""
+        sql = _PARAM_REF.sub(r":\1", _TABLE_REF.sub(r"\1", query))
+        params = {}
+        for p in parameters or []:
+            value = p.get("parameterValue", {}).get("value")
+            cast = PARAM_CASTS.get(p.get("parameterType", {}).get("type", "STRING").upper())
+            params[p["name"]] = cast(value) if cast and value is not None else value
+        return sql, params
+
+    def iter_query(self, query: str, parameters: List[Dict[str, Any]] = None, as_dict: bool = True) -> Iterator[Any]:
+        """Mesmo contrato de BigQueryClient._iter_query: dicts ou tuplas na ordem do SELECT."""
+        sql, params = self.translate(query, parameters)
+        cursor = self._connect().execute(sql, params)
+        columns = [d[0] for d in cursor.description]
+        price_idx = columns.index("price") if "price" in columns else None
+        while True:
+            rows = cursor.fetchmany(self.page_size)
+            if not rows:
+                break
+            for row in rows:
+                if price_idx is not None and row[price_idx] is not None:
+                    # Mesmo cast do decoder do BigQuery: price sempre float
+                    row = row[:price_idx] + (float(row[price_idx]),) + row[price_idx + 1:]
+                yield dict(zip(columns, row)) if as_dict else row
+
+    def table_last_modified(self) -> Optional[int]:
+        """Equivalente ao lastModifiedTime (ms) do tables.get."""
+        try:
+            return int(os.path.getmtime(self.path) * 1000)
+        except OSError:
+            return None
+
+
+# --- Loader sintético -------------------------------------------------------
+
+BASE_EXAMS = [
+    "HEMOGRAMA COMPLETO", "GLICOSE", "HEMOGLOBINA GLICADA", "COLESTEROL TOTAL", "COLESTEROL HDL",
+    "COLESTEROL LDL", "TRIGLICERIDEOS", "UREIA", "CREATININA", "ACIDO URICO", "TSH", "T4 LIVRE",
+    "T3 TOTAL", "FSH", "LH", "PROLACTINA", "ESTRADIOL", "PROGESTERONA", "TESTOSTERONA TOTAL",
+    "FERRITINA", "FERRO SERICO", "VITAMINA D 25 HIDROXI", "VITAMINA B12", "ACIDO FOLICO",
+    "TGO TRANSAMINASE OXALACETICA", "TGP TRANSAMINASE PIRUVICA", "GAMA GT", "FOSFATASE ALCALINA",
+    "BILIRRUBINAS TOTAL E FRACOES", "PROTEINAS TOTAIS E FRACOES", "SODIO", "POTASSIO", "CALCIO",
+    "MAGNESIO", "FOSFORO", "PCR PROTEINA C REATIVA", "VHS", "EAS URINA TIPO I", "UROCULTURA",
+    "PARASITOLOGICO DE FEZES", "PSA TOTAL", "PSA LIVRE", "BETA HCG", "INSULINA", "CORTISOL",
+    "TEMPO DE PROTROMBINA", "TTPA", "FIBRINOGENIO", "PLAQUETAS", "RETICULOCITOS",
+    "HIV 1 E 2 ANTICORPOS", "HEPATITE B HBSAG", "HEPATITE C ANTI HCV", "VDRL", "TOXOPLASMOSE IGG",
+    "TOXOPLASMOSE IGM", "RUBEOLA IGG", "CITOMEGALOVIRUS IGG", "AMILASE", "LIPASE",
+]
+VARIANTS = [
+    "", "SORO", "PLASMA", "URINA 24 HORAS", "SANGUE TOTAL", "POS PRANDIAL", "JEJUM",
+    "QUANTITATIVO", "QUALITATIVO", "ULTRASSENSIVEL", "PESQUISA", "DOSAGEM",
+]
+GROUPS = ["LABORATORIO", "IMAGEM", "CARDIOLOGIA", "ANATOMIA PATOLOGICA"]
+
+
+def synthetic_catalog_names(items_per_unit: int, seed: int = 42) -> List[str]:
+    """Nomes de exames plausíveis (com o sufixo ' - EXAMES LABORATORIAIS' do catálogo real)."""
+    rng = random.Random(seed)
+    names = []
+    for i in range(items_per_unit):
+        base = BASE_EXAMS[i % len(BASE_EXAMS)]
+        variant = VARIANTS[(i // len(BASE_EXAMS)) % len(VARIANTS)]
+        name = f"{base} {variant}".strip()
+        if i >= len(BASE_EXAMS) * len(VARIANTS):
+            name = f"{name} {i // (len(BASE_EXAMS) * len(VARIANTS))}"
+        if rng.random() < 0.6:
+            name += " - EXAMES LABORATORIAIS"
+        names.append(name)
+    return names
+
+
+def generate_synthetic_db(path: str = BQ_SQLITE_PATH, units: int = 200, items_per_unit: int = 5000,
+                          seed: int = 42) -> Dict[str, Any]:
+    """Cria (ou recria) lista_precos com `units` tabelas de preço x `items_per_unit` itens."""
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    names = synthetic_catalog_names(items_per_unit, seed)
+    unit_names = (["Goiânia Centro"] + [f"Unidade {i:03d}" for i in range(1, units)])[:units]
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        conn.execute("""
+            CREATE TABLE lista_precos (
+                price_table_name TEXT,
+                item_id INTEGER,
+                item_name TEXT,
+                group_name TEXT,
+                price REAL
+            )
+        """)
+        for unit_name in unit_names:
+            conn.executemany(
+                "INSERT INTO lista_precos VALUES (?, ?, ?, ?, ?)",
+                (
+                    (unit_name, 100000 + i, name, GROUPS[i % len(GROUPS)], round(rng.uniform(5, 900), 2))
+                    for i, name in enumerate(names)
+                )
+            )
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return {
+        "path": path,
+        "units": len(unit_names),
+        "rows": len(unit_names) * items_per_unit,
+        "seconds": round(time.perf_counter() - start, 2)
+    }
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else BQ_SQLITE_PATH
+    n_units = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    n_items = int(sys.argv[3]) if len(sys.argv) > 3 else 5000
+    print(generate_synthetic_db(target, n_units, n_items))
@@ -0,0 +1,109 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Any, Optional
+
+# V130: Instrumentação por etapa do validate_batch (tempo de parede + tentativas/hits/misses).
+# Cada request acumula num StageTimings local (sem lock no hot path) e, ao final, soma tudo
+# nos histogramas do processo (StageMetrics), lidos pelo /api/metrics.
+STAGE_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class StageStats:
+    def __init__(self):
+        self.attempted = 0
+        self.hits = 0
+        self.misses = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(STAGE_BUCKETS_MS) + 1)
+
+    def observe(self, elapsed_ms: float, hit: Optional[bool]):
+        self.attempted += 1
+        if hit is not None:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+        self.buckets[bisect_left(STAGE_BUCKETS_MS, elapsed_ms)] += 1
+
+    def merge(self, other: "StageStats"):
+        self.attempted += other.attempted
+        self.hits += other.hits
+        self.misses += other.misses
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def as_dict(self, histogram: bool = True) -> Dict[str, Any]:
+        data = {
+            "attempted": self.attempted,
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_ms": round(self.total_ms, 3),
+            "avg_ms": round(self.total_ms / self.attempted, 3) if self.attempted else 0.0,
+            "max_ms": round(self.max_ms, 3)
+        }
+        if histogram:
+            data["latency_histogram"] = {f"le_{b}ms": n for b, n in zip(STAGE_BUCKETS_MS, self.buckets)}
+            data["latency_histogram"][f"gt_{STAGE_BUCKETS_MS[-1]}ms"] = self.buckets[-1]
+        return data
+
+
+class StageTimings:
+    """Medições de uma request. `record` recebe o perf_counter() do início da etapa."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, StageStats] = {}
+
+    def record(self, stage: str, started: float, hit: Optional[bool] = None) -> float:
+        now = time.perf_counter()
+        stats = self.stages.get(stage)
+        if stats is None:
+            stats = self.stages[stage] = StageStats()
+        stats.observe((now - started) * 1000, hit)
+        return now
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 3),
+            "stages": {name: stats.as_dict(histogram=False) for name, stats in self.stages.items()}
+        }
+
+
+class StageMetrics:
+    """Agregado do processo (por etapa) + latência total das requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = StageStats()
+        self.stages: Dict[str, StageStats] = {}
+
+    def merge(self, timings: StageTimings):
+        elapsed_ms = (time.perf_counter() - timings.started) * 1000
+        with self._lock:
+            self.requests.observe(elapsed_ms, None)
+            for name, stats in timings.stages.items():
+                total = self.stages.get(name)
+                if total is None:
+                    total = self.stages[name] = StageStats()
+                total.merge(stats)
+
+    def reset(self):
+        with self._lock:
+            self.requests = StageStats()
+            self.stages = {}
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests.as_dict(),
+                "stages": {name: stats.as_dict() for name, stats in self.stages.items()}
+            }
+
+
+stage_metrics = StageMetrics()
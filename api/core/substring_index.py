@@ -0,0 +1,116 @@
+import sys
+from collections import deque
+from typing import List, Dict, Set
+
+# V124: Motor de substring do STAGE 3 sobre as chaves do catálogo.
+#   - "chave in termo": autômato Aho-Corasick (uma passada pelo termo, O(len + matches))
+#   - "termo in chave": postings de trigramas (interseção das mais raras + verificação)
+# Transições num único dict com chave inteira (estado, caractere) -> bem mais leve que um dict por nó.
+
+_CHAR_SPACE = 0x110000
+
+
+class SubstringIndex:
+    def __init__(self, keys: List[str]):
+        self.keys = keys
+        self._build_automaton()
+        self._build_trigrams()
+        self.approx_bytes = self._estimate_bytes()
+
+    def _estimate_bytes(self) -> int:
+        # ~100 bytes por transição/terminal (int + slot de dict), 16 por estado, 8 por entrada de posting
+        size = 100 * len(self._goto) + 16 * len(self._fail) + 100 * len(self._terminal)
+        for gram, ids in self._trigram_postings.items():
+            size += sys.getsizeof(gram) + sys.getsizeof(ids) + 8 * len(ids)
+        return size
+
+    # --- chave contida no termo (Aho-Corasick) ---
+
+    def _build_automaton(self):
+        goto: Dict[int, int] = {}
+        terminal: Dict[int, int] = {}
+        self.empty_key_ids: List[int] = []
+        n_states = 1
+        for key_id, key in enumerate(self.keys):
+            if not key:
+                # Chave vazia é substring de qualquer termo
+                self.empty_key_ids.append(key_id)
+                continue
+            state = 0
+            for ch in key:
+                edge = state * _CHAR_SPACE + ord(ch)
+                nxt = goto.get(edge)
+                if nxt is None:
+                    nxt = goto[edge] = n_states
+                    n_states += 1
+                state = nxt
+            # Chaves são únicas (exam_keys), então no máximo uma por estado
+            terminal[state] = key_id
+
+        children: Dict[int, List[tuple]] = {}
+        for edge, nxt in goto.items():
+            children.setdefault(edge // _CHAR_SPACE, []).append((edge % _CHAR_SPACE, nxt))
+
+        fail = [0] * n_states
+        # Próximo estado terminal seguindo os links de falha (dictionary suffix link)
+        out_link = [0] * n_states
+        queue = deque()
+        for _, nxt in children.get(0, ()):
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for code, nxt in children.get(state, ()):
+                f = fail[state]
+                while f and (f * _CHAR_SPACE + code) not in goto:
+                    f = fail[f]
+                target = goto.get(f * _CHAR_SPACE + code, 0)
+                fail[nxt] = target if target != nxt else 0
+                out_link[nxt] = fail[nxt] if fail[nxt] in terminal else out_link[fail[nxt]]
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._terminal = terminal
+        self._out_link = out_link
+
+    def keys_in(self, text: str) -> Set[int]:
+        """Ids das chaves que ocorrem como substring de `text`."""
+        found = set(self.empty_key_ids)
+        goto, fail, terminal, out_link = self._goto, self._fail, self._terminal, self._out_link
+        state = 0
+        for ch in text:
+            code = ord(ch)
+            while state and (state * _CHAR_SPACE + code) not in goto:
+                state = fail[state]
+            state = goto.get(state * _CHAR_SPACE + code, 0)
+            s = state if state in terminal else out_link[state]
+            while s:
+                found.add(terminal[s])
+                s = out_link[s]
+        return found
+
+    # --- termo contido na chave (trigramas) ---
+
+    def _build_trigrams(self):
+        postings: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(self.keys):
+            for gram in {key[i:i + 3] for i in range(len(key) - 2)}:
+                postings.setdefault(gram, []).append(key_id)
+        self._trigram_postings = postings
+
+    def keys_containing(self, text: str) -> Set[int]:
+        """Ids das chaves que contêm `text` (len(text) >= 3)."""
+        grams = {text[i:i + 3] for i in range(len(text) - 2)}
+        lists = []
+        for gram in grams:
+            ids = self._trigram_postings.get(gram)
+            if not ids:
+                return set()
+            lists.append(ids)
+        lists.sort(key=len)
+        # Filtra pelas postings mais raras e confirma com `in` (trigramas não garantem contiguidade)
+        candidates = set(lists[0])
+        for ids in lists[1:3]:
+            candidates.intersection_update(ids)
+        keys = self.keys
+        return {i for i in candidates if text in keys[i]}
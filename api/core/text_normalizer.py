@@ -0,0 +1,124 @@
+import os
+import re
+import unicodedata
+from functools import lru_cache
+
+# V126: Normalizador único do hot path. Cada perfil reproduz exatamente uma das rotinas antigas:
+#   validation -> ValidationService.normalize_text / catalog_key
+#   fuzzy      -> FuzzyMatcher._normalize
+#   ocr        -> OCRProcessor._normalizar_texto
+#   tuss       -> TussService._normalize
+# As etapas por caractere (NFKD + remoção de diacríticos + lower + filtro de pontuação) viram uma
+# tabela de str.translate preenchida sob demanda; o resultado por string fica num LRU.
+NORMALIZE_CACHE_SIZE = int(os.getenv("NORMALIZE_CACHE_SIZE", "65536"))
+
+_NOT_LOWER_ALNUM = re.compile(r'[^a-z0-9\s]')
+_NOT_UPPER_ALNUM = re.compile(r'[^A-Z0-9\s]')
+
+
+def _strip_accents(c: str) -> str:
+    return "".join([d for d in unicodedata.normalize('NFKD', c) if not unicodedata.combining(d)])
+
+
+class _CharTable(dict):
+    """Tabela de translate que calcula (e memoriza) o mapeamento de cada code point no 1º uso."""
+
+    def __init__(self, fn):
+        super().__init__()
+        self._fn = fn
+        for code in range(128):
+            self[code] = fn(chr(code))
+
+    def __missing__(self, code):
+        value = self[code] = self._fn(chr(code))
+        return value
+
+
+# Remover diacríticos por caractere equivale ao NFKD da string inteira: a reordenação canônica
+# só move marcas combinantes, que são descartadas. O lower por caractere só difere no sigma final,
+# que o filtro de pontuação troca por espaço de qualquer forma.
+_VALIDATION_TABLE = _CharTable(lambda c: _NOT_LOWER_ALNUM.sub(' ', _strip_accents(c).lower()))
+_ACCENT_TABLE = _CharTable(_strip_accents)
+_OCR_FILTER_TABLE = _CharTable(lambda c: _NOT_UPPER_ALNUM.sub(' ', c))
+
+OCR_NOISE = (
+    "EXAMES LABORATORIAIS",
+    "EXAME LABORATORIAL",
+    "SOLICITACAO DE EXAMES",
+    " E EXAMES",
+    "LABORATORIAIS",
+    "LABORATORIAL"
+)
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _validation(text: str) -> str:
+    text = text.translate(_VALIDATION_TABLE)
+    # Remove sufixos comuns que poluem o match
+    text = text.replace(' exames laboratoriais', '').replace(' exames', '')
+    return " ".join(text.split())
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _fuzzy(text: str) -> str:
+    return " ".join(text.translate(_VALIDATION_TABLE).split())
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _ocr(text: str) -> str:
+    text = text.upper()
+    for noise in OCR_NOISE:
+        text = text.replace(noise, "")
+    text = text.translate(_ACCENT_TABLE)
+    # Vitamin D special
+    text = text.replace("2,5", "25").replace("2.5", "25")
+    return " ".join(text.translate(_OCR_FILTER_TABLE).split())
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def _tuss(text: str) -> str:
+    # NFKD + encode ASCII já são caminhos em C mais rápidos que a tabela: só ganha o memo
+    return unicodedata.normalize('NFKD', text).encode('ASCII', 'ignore').decode('ASCII').lower().strip()
+
+
+def normalize_validation(text) -> str:
+    """Sem acentos, minúsculo, só [a-z0-9 ], sem sufixo ' exames (laboratoriais)', espaços colapsados."""
+    if not text: return ""
+    return _validation(str(text))
+
+
+def normalize_fuzzy(text) -> str:
+    """Como normalize_validation, mas preservando os sufixos ' exames'."""
+    if not text: return ""
+    return _fuzzy(str(text))
+
+
+def normalize_ocr(text: str) -> str:
+    """Maiúsculo, sem ruído de cabeçalho ('EXAMES LABORATORIAIS'...), sem acentos, só [A-Z0-9 ]."""
+    if not text: return ""
+    return _ocr(text)
+
+
+def normalize_tuss(text) -> str:
+    """Transliteração ASCII + minúsculo (mantém pontuação: 'h.pylori', '25-oh')."""
+    if not text: return ""
+    return _tuss(str(text))
+
+
+PROFILES = {
+    "validation": normalize_validation,
+    "fuzzy": normalize_fuzzy,
+    "ocr": normalize_ocr,
+    "tuss": normalize_tuss,
+}
+
+
+def normalize(text, profile: str = "validation") -> str:
+    return PROFILES[profile](text)
+
+
+def cache_info() -> dict:
+    return {
+        name: fn.cache_info()._asdict()
+        for name, fn in (("validation", _validation), ("fuzzy", _fuzzy), ("ocr", _ocr), ("tuss", _tuss))
+    }
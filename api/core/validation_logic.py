@@ -1,21 +1,26 @@
-from typing import List, Dict, Any
+import time
+from typing import List, Dict, Any, Iterator
 from difflib import get_close_matches
 from services.tuss_service import tuss_service
 from services.missing_terms_logger import missing_terms_logger
 from services.pdca_service import pdca_service
 from services.resolute_orchestrator import resolute_orchestrator
-from services.fuzzy_matcher import fuzzy_matcher
 from services.learning_service import learning_service
 from services.semantic_service import semantic_service
+from services.synonym_store import synonym_store
+from core.catalog_index import catalog_indexes
+from core.match_cache import match_cache
+from core.stage_metrics import StageTimings, stage_metrics
+from core.text_normalizer import normalize_validation
 
 print("🛡️ Validation Logic: Module Loaded Successfully")
 
 class ValidationService:
     @staticmethod
-    def calculate_similarity(term1: str, term2: str) -> float:
-        # Usa o fuzzy_matcher se possível, senão difflib
+    def calculate_similarity(term1: str, term2: str, matcher: Any) -> float:
+        # Usa o FuzzyMatcher do catálogo da unidade (CatalogIndex.fuzzy_matcher) se possível, senão difflib
         try:
-            match = fuzzy_matcher.find_best_match(term1, min_score=0)
+            match = matcher.find_best_match(term1, min_score=0)
             if match:
                 return match["score"] / 100.0
         except:
@@ -26,22 +31,42 @@ class ValidationService:
     @staticmethod
     def normalize_text(text: str) -> str:
         """Remove acentos, pontuação e normaliza espaços para comparação robusta"""
-        import unicodedata
-        import re
-        if not text: return ""
-        # Remove acentos
-        nfkd_form = unicodedata.normalize('NFKD', str(text))
-        text = "".join([c for c in nfkd_form if not unicodedata.combining(c)]).lower()
-        # Remove pontuação e caracteres especiais, mantendo apenas letras, números e espaços
-        text = re.sub(r'[^a-z0-9\s]', ' ', text)
-        # Remove sufixos comuns que poluem o match
-        text = text.replace(' exames laboratoriais', '').replace(' exames', '')
-        # Normaliza espaços extras
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        # V126: normalizador compartilhado (tabela de translate + memo), mesma saída de antes
+        return normalize_validation(text)
 
     @staticmethod
-    def validate_batch(terms: List[str], unit: str, bq_client: Any) -> Dict[str, Any]:
+    def validate_batch(terms: List[str], unit: str, bq_client: Any, debug: bool = False) -> Dict[str, Any]:
+        """Resposta completa (items na ordem de entrada + stats), montada a partir dos eventos do stream."""
+        items = {}
+        stats = {}
+        for event in ValidationService.iter_validate_batch(terms, unit, bq_client, debug=debug):
+            if event["type"] == "item":
+                items[event["index"]] = event["item"]
+            else:
+                stats = event["stats"]
+        return {"items": [items[index] for index in sorted(items)], "stats": stats}
+
+    @staticmethod
+    def _finished_item_events(items: List[Dict[str, Any]], start: int, held: List[int]) -> Iterator[Dict[str, Any]]:
+        # not_found fica retido: o lote semântico do fim ainda pode resolvê-lo
+        for index in range(start, len(items)):
+            if items[index]["status"] == "not_found":
+                held.append(index)
+            else:
+                yield {"type": "item", "index": index, "item": items[index]}
+
+    @staticmethod
+    def iter_validate_batch(terms: List[str], unit: str, bq_client: Any, debug: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        V129: Validação em eventos, na ordem de conclusão:
+          {"type": "item", "index": i, "item": {...}}  assim que o item i (ordem de entrada) fica pronto
+          {"type": "stats", "stats": {...}}            ao final, após o lote semântico
+        Itens resolvidos localmente saem durante o loop; os que dependem da IA, depois do lote semântico.
+        Com `debug`, o stats traz `timings` (tempo e tentativas/hits/misses por etapa).
+        """
+        # V130: Tempo por etapa (request) -> somado em stage_metrics (processo) no fim
+        timings = StageTimings()
+        clock = time.perf_counter
         results = {
             "items": [],
             "stats": {
@@ -57,6 +82,7 @@ class ValidationService:
         
         # 1. Carregar catálogo completo (Cache Local) - O(1) Query
         print(f"Carregando catálogo para unidade: {unit}...")
+        started = clock()
         try:
             all_exams = bq_client.get_all_exams(unit)
             results["stats"]["catalog_count"] = len(all_exams)
@@ -64,112 +90,31 @@ class ValidationService:
             print(f"❌ Critical BQ Error: {e}")
             all_exams = []
             results["stats"]["bq_error"] = str(e)
+        timings.record("catalog_load", started, hit=bool(all_exams))
         
-        # Mapa para busca exata rápida: "termo_normalizado" -> Objeto Exame
-        exam_map = {}
         # Dynamic versioning to help debug
         auth_status = getattr(bq_client, 'auth_info', 'INIT')
-        stats = bq_client.get_raw_table_stats()
+        # V113: Snapshot em cache (sem round-trip ao BigQuery por request)
+        stats = bq_client.get_cached_table_stats()
         total_rows = stats.get("total", 0)
         samples = stats.get("sample_units", "NONE")
         
         results["stats"]["backend_version"] = f"V112.0-Expert (Rows:{total_rows}, Units:{samples}, Auth: {auth_status})"
         results["stats"]["unit_selected"] = unit
         
-        for exam in all_exams:
-            # Normaliza chave do mapa (sem acentos)
-            name_key = ValidationService.normalize_text(exam["search_name"])
-            if name_key not in exam_map:
-                exam_map[name_key] = []
-            exam_map[name_key].append(exam)
-        
-        exam_keys = list(exam_map.keys()) # Para fuzzy search
+        # V122: Índice do catálogo montado 1x por (unidade, versão) e reaproveitado entre requests
+        started = clock()
+        catalog_index = catalog_indexes.get(unit, all_exams, bq_client)
+        timings.record("catalog_index", started)
+        # Mapa para busca exata rápida: "termo_normalizado" -> [Objetos Exame]
+        exam_map = catalog_index.exam_map
+        exam_keys = catalog_index.exam_keys # Para fuzzy search
         print(f"📊 Catálogo Carregado: {len(all_exams)} itens, {len(exam_keys)} chaves únicas.")
         if exam_keys:
             print(f"🔬 Amostra de Chaves: {exam_keys[:10]}")
         
-        # Atualizar FuzzyMatcher
-        fuzzy_matcher.update_known_exams(exam_keys)
-        
-        # Dicionário de Sinônimos Médicos (Normalizados)
-        SYNONYMS = {
-            "eas": ["urina rotina eas", "urina tipo i", "urina tipo 1", "sumario de urina", "elementos anormais do sedimento"],
-            "elementos anormais do sedimento": ["urina tipo i", "urina rotina eas"],
-            "urina tipo i": ["urina tipo i", "eas", "urina rotina eas"],
-            "hemograma": ["hemograma completo", "hemograma com contagem de plaquetas"],
-            "hemograma completo": ["hemograma"],
-            "epf": ["parasitologico de fezes", "protoparasitologico"],
-            "parasitologico": ["parasitologico de fezes"],
-            "glicose": ["glicemia", "glicemia de jejum", "dosagem de glicose"],
-            "glicemia": ["glicemia", "glicemia de jejum"],
-            "glicada": ["hemoglobina glicada", "hemoglobina glicada a1c", "hba1c"],
-            "hemoglobina glicada": ["hemoglobina glicada", "hemoglobina glicada a1c", "hba1c"],
-            "colesterol": ["colesterol total", "colesterol total e fracoes"],
-            "perfil lipidico": ["lipidogramas"],
-            "lipidogramas": ["lipidogramas"],
-            "coprologico funcional": ["coprologico funcional"],
-            "coprologico": ["coprologico funcional"],
-            "h.pylori": ["antigeno helicobacter pylori", "pesquisa de helicobacter pylori", "helicobacter pylori fezes"],
-            "h pylori": ["antigeno helicobacter pylori"],
-            "pylori": ["antigeno helicobacter pylori"],
-            "helicobacter pylori": ["antigeno helicobacter pylori"],
-            "tsh": ["hormonio tireoestimulante", "tsh ultra sensivel"],
-            "fsh": ["hormonio foliculo estimulante", "dosagem de hormonio foliculo estimulante", "fsh"],
-            "hormonio foliculo estimulante": ["hormonio foliculo estimulante", "fsh"],
-            "t4 livre": ["tiroxina livre", "t4"],
-            "ureia": ["dosagem de ureia", "ureia"],
-            "creatinina": ["dosagem de creatinina", "creatinina"],
-            "acido urico": ["dosagem de acido urico", "acido urico"],
-            "beta hcg": ["beta hcg qualitativo", "beta hcg quantitativo"],
-            "grupo sanguineo": ["tipagem sanguinea", "grupo sanguineo fator rh"],
-            "tgo": ["dosagem de tgo", "tgo transaminase oxalacetica", "transaminase glutamico oxalacetica", "aspartato aminotransferase", "ast"],
-            "ast": ["dosagem de tgo", "aspartato aminotransferase", "tgo"],
-            "tgp": ["dosagem de tgp", "tgp transaminase piruvica", "transaminase glutamico piruvica", "alanina aminotransferase", "alt"],
-            "alt": ["dosagem de tgp", "alanina aminotransferase", "tgp"],
-            "vitamina d": ["25 hidroxivitamina d", "dosagem de vitamina d", "vitamina d 25 oh", "vit d", "25 oh vitamina d"],
-            "25 hidroxivitamina d": ["vitamina d", "vitamina d 25 oh", "25 oh vitamina d"],
-            "vitamina d 25-oh": ["25 hidroxivitamina d", "vitamina d"],
-            "vit d": ["25 hidroxivitamina d", "vitamina d"],
-            "ferritina": ["ferritina serica", "dosagem de ferritina"],
-            "vitamina b12": ["vitamina b12 serica", "dosagem de vitamina b12", "cobalamina"],
-            "vhs": ["vhs hemossedimentacao", "vhs hemossedimentacao exames laboratoriais", "velocidade de hemossedimentacao"],
-            "tsh ultra": ["hormonio tireoestimulante", "tsh"],
-            "urocultura": ["cultura de urina (urocultura)", "pesquisa de bacterias na urina"],
-            "antibiogram": ["teste de sensibilidade a antibioticos (antibiograma)"],
-            # V83 Synonyms
-            "complemento c3": ["c3", "complemento c3"],
-            "complemento c4": ["c4", "complemento c4"],
-            "ch 50": ["ch50", "complemento ch50"],
-            "dosagens de imunoglobulinas igg": ["igg", "imunoglobulina g"],
-            "dosagens de imunoglobulinas igm": ["igm", "imunoglobulina m"],
-            "dosagens de imunoglobulinas iga": ["iga", "imunoglobulina a"],
-            "igg": ["imunoglobulina g", "dosagem de igg"],
-            "igm": ["imunoglobulina m", "dosagem de igm"],
-            "iga": ["imunoglobulina a", "dosagem de iga"],
-            "colesterol total": ["colesterol total e fracoes"],
-            "gama gt": ["gama glutamil transferase", "gama - gt", "ggt"],
-            "gama-gt": ["gama glutamil transferase", "gama gt", "ggt"],
-            "pcr": ["proteina c reativa", "pcr ultra sensivel"],
-            # V108 Synonyms
-            "25oh": ["vitamina d", "25 hidroxivitamina d", "vitamina d 25 oh"],
-            "vitamina d 25 oh": ["25 hidroxivitamina d", "vitamina d", "25oh"],
-            "citomegalovirus": ["cmv"],
-            "cmv": ["citomegalovirus"],
-            "toxoplasmose": ["toxo"],
-            "toxo": ["toxoplasmose"],
-            "rubéola": ["rubeola"],
-            "rubeola": ["rubeola"],
-            "herpes simples": ["hsv"],
-            "hsv": ["herpes simples"],
-            "anti hcv": ["hcv", "hepatite c"],
-            "hbsag": ["hepatite b", "antigeno australia"],
-            # V109 Synonyms
-            "elastase": ["elastase fecal", "elastase pancreatica", "elastase pancreatica fecal"],
-            "gordura fecal": ["gordura nas fezes", "sudan iii", "pesquisa de gordura fecal"],
-            "gordura nas fezes": ["gordura fecal", "sudan iii"],
-            "nas fezes": ["fecal"],
-            "fecal": ["nas fezes"],
-        }
+        # V131: FuzzyMatcher da própria unidade (imutável, compartilhado pelo CatalogIndex)
+        matcher = catalog_index.fuzzy_matcher
         
         seen_terms = set()
         
@@ -199,16 +144,74 @@ class ValidationService:
             
         results["stats"]["total"] = len(valid_terms)
         
+        # V127: Termos repetidos no pedido ("TSH", "tsh ", "- TSH") viram um grupo pela chave normalizada.
+        # Resolute (Gemini) + matching rodam 1x por grupo; as repetições voltam na ordem original como "duplicate".
+        group_of_key = {}
+        group_keys = []
+        term_groups = []
+        unique_terms = []
+        for term in valid_terms:
+            key = ValidationService.normalize_text(term) or term.lower()
+            group = group_of_key.get(key)
+            if group is None:
+                group = group_of_key[key] = len(unique_terms)
+                group_keys.append(key)
+                unique_terms.append(term)
+            term_groups.append(group)
+        results["stats"]["unique_terms"] = len(unique_terms)
+
+        # V128: Resultado final por termo reaproveitado entre requests; grupos em cache pulam Resolute e matching
+        cache_context = match_cache.context(unit, catalog_index.version, learning_service.version, synonym_store.current_version())
+        cached_groups = {}
+        for group, key in enumerate(group_keys):
+            started = clock()
+            cached = match_cache.get(cache_context, key)
+            timings.record("match_cache", started, hit=cached is not None)
+            if cached is not None:
+                cached_groups[group] = cached
+        results["stats"]["cache_hits"] = len(cached_groups)
+        terms_to_resolve = [t for group, t in enumerate(unique_terms) if group not in cached_groups]
+
         # V85: Vitta Resolute AI Pipeline - Standardize BEFORE search
+        started = clock()
         try:
-            resolute_items = resolute_orchestrator.standardize_batch(valid_terms)
+            resolute_items = resolute_orchestrator.standardize_batch(terms_to_resolve)
         except Exception as e:
             print(f"⚠️ Resolute Pipeline Error: {e}")
-            resolute_items = [{"original": t, "resolved": t, "source": "fallback"} for t in valid_terms]
+            resolute_items = [{"original": t, "resolved": t, "source": "fallback"} for t in terms_to_resolve]
+        timings.record("resolute", started)
+        fresh_items = iter(resolute_items)
+        resolute_by_group = [
+            cached_groups[group] if group in cached_groups else next(fresh_items)
+            for group in range(len(unique_terms))
+        ]
 
-        for res_item in resolute_items:
-            original_term = res_item["original"]
+        resolved_groups = set()
+        learned_groups = {}
+        emitted = 0
+        held = []
+        for original_term, group in zip(valid_terms, term_groups):
+            # V129: Emite o que já ficou pronto antes de seguir para o próximo termo
+            yield from ValidationService._finished_item_events(results["items"], emitted, held)
+            emitted = len(results["items"])
+
+            res_item = resolute_by_group[group]
             resolved_term = res_item["resolved"]
+
+            if group in resolved_groups:
+                # Repetição: conhecimento aprendido confirma toda ocorrência (como antes), o resto é duplicata
+                learned_matches = learned_groups.get(group)
+                if learned_matches is not None:
+                    results["items"].append({
+                        "term": original_term,
+                        "status": "confirmed",
+                        "matches": learned_matches
+                    })
+                    results["stats"]["confirmed"] += 1
+                else:
+                    results["items"].append({"term": original_term, "resolved_term": resolved_term, "status": "duplicate", "matches": [], "original_term": original_term})
+                continue
+            resolved_groups.add(group)
             
             # Diagnostic for expert
             # print(f"🔍 Cruzando: '{original_term}' (AI: '{resolved_term}')")
@@ -217,9 +220,36 @@ class ValidationService:
             
             # Normaliza o termo de busca (sem acentos, lower)
             term_norm = ValidationService.normalize_text(resolved_term)
+
+            cached = cached_groups.get(group)
+            if cached is not None:
+                if cached["learned"]:
+                    results["items"].append({
+                        "term": original_term,
+                        "status": "confirmed",
+                        "matches": list(cached["matches"])
+                    })
+                    results["stats"]["confirmed"] += 1
+                    seen_terms.add(original_term)
+                    learned_groups[group] = cached["matches"]
+                    continue
+                if term_norm in seen_terms:
+                    item["status"] = "duplicate"
+                else:
+                    seen_terms.add(term_norm)
+                    item["matches"] = list(cached["matches"])
+                    item["selectedMatch"] = 0
+                    item["status"] = cached["status"]
+                    item["match_strategy"] = cached["strategy"]
+                    results["stats"]["confirmed" if cached["status"] == "confirmed" else "pending"] += 1
+                results["items"].append(item)
+                continue
             
             # --- PRIORIDADE 0: Mapeamento Aprendido (Knowledge Base) ---
+            started = clock()
             learned_target = learning_service.get_learned_match(term_norm)
+            learned_hit = bool(learned_target) and ValidationService.normalize_text(learned_target) in exam_map
+            timings.record("learned", started, hit=learned_hit)
             if learned_target:
                 print(f"🎯 Aplicando conhecimento aprendido: '{original_term}' -> '{learned_target}'")
                 target_key = ValidationService.normalize_text(learned_target)
@@ -232,6 +262,10 @@ class ValidationService:
                     })
                     results["stats"]["confirmed"] += 1
                     seen_terms.add(original_term)
+                    learned_groups[group] = exam_map[target_key]
+                    match_cache.put(cache_context, group_keys[group], {
+                        "resolved": resolved_term, "learned": True, "matches": exam_map[target_key]
+                    })
                     continue
 
             # 1. Checar duplicidade na lista atual
@@ -265,73 +299,61 @@ class ValidationService:
                     search_variants.append({"text": p_norm, "tag": "parentheses_acronym"})
             
             # Se forem muito diferentes, adiciona sinônimos de ambos
+            # V125: grafo de sinônimos compilado (já normalizado, com fecho transitivo) - data/synonyms.json
             for var in list(search_variants):
-                if var["text"] in SYNONYMS:
-                    for syn in SYNONYMS[var["text"]]:
-                        search_variants.append({"text": ValidationService.normalize_text(syn), "tag": f"synonym_of_{var['tag']}"})
+                for syn in synonym_store.lookup(var["text"]):
+                    search_variants.append({"text": syn, "tag": f"synonym_of_{var['tag']}"})
 
             # STAGE 1: Exact Match on any variant
+            started = clock()
             for var in search_variants:
                 if var["text"] in exam_map:
                     found_matches = exam_map[var["text"]]
                     strategy = f"exact_{var['tag']}"
                     break
+            timings.record("stage1_exact", started, hit=bool(found_matches))
             
             # STAGE 2: TUSS Lookup
             if not found_matches:
+                started = clock()
                 tuss_name = tuss_service.search(original_term) or tuss_service.search(resolved_term)
                 if tuss_name:
                     tuss_key = ValidationService.normalize_text(tuss_name)
                     if tuss_key in exam_map:
                         found_matches = exam_map[tuss_key]
                         strategy = "tuss_match"
+                timings.record("stage2_tuss", started, hit=bool(found_matches))
 
             # STAGE 3: Substring Search (More conservative)
             if not found_matches:
+                started = clock()
                 for var in search_variants:
-                    v_text = var["text"]
-                    if len(v_text) < 4: continue
-                    for key in exam_keys:
-                        if v_text == key or (len(v_text) > 5 and (v_text in key or key in v_text)):
-                            found_matches.extend(exam_map[key])
+                    # V124: Aho-Corasick (chave no termo) + trigramas (termo na chave), mesmas guardas de tamanho
+                    for key_id in catalog_index.substring_matches(var["text"]):
+                        found_matches.extend(exam_map[exam_keys[key_id]])
                     if found_matches:
                         strategy = f"substring_{var['tag']}"
                         break
+                timings.record("stage3_substring", started, hit=bool(found_matches))
 
             # STAGE 4: Token Overlap Discovery (V100.0 Power Feature)
             # Find exams that contain all essential tokens of the search term
+            # V123: Índice invertido do CatalogIndex (mesmo resultado do loop por chave)
             if not found_matches:
+                started = clock()
                 for var in search_variants:
-                    v_tokens = set(var["text"].split())
-                    if not v_tokens: continue
-                    # Essential tokens: > 2 chars OR specific medical codes/letters
-                    essential_v = {t for t in v_tokens if len(t) > 2 or t in ["d", "k", "p", "ca", "fe", "zn", "c3", "c4"]}
-                    if not essential_v: continue
-                    
-                    for key in exam_keys:
-                        k_norm = ValidationService.normalize_text(key)
-                        k_tokens = set(k_norm.split())
-                        # Database tokens: > 2 chars
-                        essential_k = {t for t in k_tokens if len(t) > 2}
-                        
-                        # V109 Bidirectional Overlap: Input is subset of DB (classic) OR DB is subset of Input (descriptive)
-                        is_match = False
-                        if essential_v and essential_k:
-                            if essential_v.issubset(k_tokens):
-                                is_match = True
-                            elif essential_k.issubset(v_tokens):
-                                is_match = True
-                        
-                        if is_match:
-                            found_matches.extend(exam_map[key])
+                    for key_id in catalog_index.token_overlap(var["text"]):
+                        found_matches.extend(exam_map[exam_keys[key_id]])
                     
                     if found_matches:
                         strategy = f"token_overlap_{var['tag']}"
                         break
+                timings.record("stage4_token_overlap", started, hit=bool(found_matches))
 
             # STAGE 5: SEMANTIC AI MATCH (V110 - Smart Suggestion) =====================
             # If everything failed, ask Gemini to normalize context
             if not found_matches and semantic_service.model:
+                started = clock()
                 try:
                     suggestion = semantic_service.normalize_term(resolved_term)
                     if suggestion and suggestion != resolved_term:
@@ -341,15 +363,17 @@ class ValidationService:
                             strategy = "ai_context_suggestion"
                         else:
                             # Final fuzzy on suggestion
-                            best_s = fuzzy_matcher.find_top_matches(suggestion, limit=1, min_score=80)
+                            best_s = matcher.find_top_matches(suggestion, limit=1, min_score=80)
                             if best_s:
                                 found_matches = exam_map[best_s[0]["match"]]
                                 strategy = "ai_fuzzy_context"
                 except Exception as e:
                     print(f"⚠️ Semantic Logic Error: {e}")
+                timings.record("stage5_semantic", started, hit=bool(found_matches))
 
             # FINAL RESULTS PROCESSING
             if found_matches:
+                started = clock()
                 unique_matches = {}
                 for m in found_matches:
                     unique_matches[m['item_id']] = m
@@ -384,12 +408,19 @@ class ValidationService:
                 item["selectedMatch"] = 0
                 item["status"] = "confirmed" if len(matches_list) == 1 else "multiple"
                 item["match_strategy"] = strategy
+                timings.record("ranking", started)
                 
                 if item["status"] == "confirmed": results["stats"]["confirmed"] += 1
                 else: results["stats"]["pending"] += 1
+
+                # not_found não entra no cache: o lote semântico abaixo ainda pode resolvê-lo
+                match_cache.put(cache_context, group_keys[group], {
+                    "resolved": resolved_term, "learned": False, "matches": matches_list,
+                    "status": item["status"], "strategy": strategy
+                })
             else:
                 # Completely Not Found
-                pdca_service.log_fca(original_term, unit, "not_found", matches=[])
+                pdca_service.log_fca(original_term, unit, "not_found", matches=[], matcher=matcher)
                 missing_terms_logger.log_not_found(term=original_term, unit=unit)
                 results["stats"]["not_found"] += 1
                 
@@ -399,6 +430,7 @@ class ValidationService:
 
             results["items"].append(item)
             
+        yield from ValidationService._finished_item_events(results["items"], emitted, held)
         
         # --- V67: SEMANTIC BATCH PROCESSING ("Smart Match") ---
         # Filter items that are still "not_found" (and not just placeholder mocks if we implement semantics before mocks)
@@ -423,7 +455,9 @@ class ValidationService:
         if candidates:
             try:
                 print(f"🧠 Semantic Service: Normalizando {len(candidates)} termos...")
+                started = clock()
                 normalized_map = semantic_service.normalize_batch(candidates)
+                timings.record("semantic_batch", started, hit=bool(normalized_map))
                 
                 for i, original_term in zip(candidate_indices, candidates):
                     if original_term in normalized_map:
@@ -444,11 +478,11 @@ class ValidationService:
                             results["stats"]["not_found"] -= 1
                             results["stats"]["confirmed" if len(matches) == 1 else "pending"] += 1
                             # V86 Fix: Use direct 'unit' variable
-                            pdca_service.log_fca(original_term, unit, "ai_semantic_exact", "ai_semantic_exact", matches)
+                            pdca_service.log_fca(original_term, unit, "ai_semantic_exact", "ai_semantic_exact", matches, matcher=matcher)
                             continue
 
                         # 2. Fuzzy Check
-                        best_match = fuzzy_matcher.find_best_match(norm_key, min_score=70)
+                        best_match = matcher.find_best_match(norm_key, min_score=70)
                         if best_match:
                             match_name = best_match["match"]
                             matches = exam_map[match_name]
@@ -459,14 +493,20 @@ class ValidationService:
                             results["stats"]["not_found"] -= 1
                             results["stats"]["confirmed" if len(matches) == 1 else "pending"] += 1
                             # V86 Fix: Use direct 'unit' variable
-                            pdca_service.log_fca(original_term, unit, "ai_semantic_fuzzy", "ai_semantic_fuzzy", matches)
+                            pdca_service.log_fca(original_term, unit, "ai_semantic_fuzzy", "ai_semantic_fuzzy", matches, matcher=matcher)
             except Exception as e:
                 print(f"❌ Erro Semantic Service: {e}")
         
         # Add Semantic Status to Stats
         results["stats"]["semantic_active"] = semantic_service.model is not None
 
-        return results
+        stage_metrics.merge(timings)
+        if debug:
+            results["stats"]["timings"] = timings.as_dict()
+
+        for index in held:
+            yield {"type": "item", "index": index, "item": results["items"][index]}
+        yield {"type": "stats", "stats": results["stats"]}
 
     @staticmethod
     def get_fuzzy_suggestions(term: str, all_exam_names: List[str]) -> List[str]:
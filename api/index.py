@@ -1,5 +1,8 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from email.utils import formatdate, parsedate_to_datetime
+import json
 import os
 import sys
 import traceback
@@ -51,13 +54,39 @@ async def validate_list(request: Request):
     try:
         from core.validation_logic import ValidationService
         from core.bigquery_client import bq_client
+        from core.async_bigquery_client import async_bq_client
+        from starlette.concurrency import run_in_threadpool
         
         data = await request.json()
         terms = data.get("terms", [])
         unit = data.get("unit", "Goiânia Centro")
         
+        # V120: Catálogo carregado sem bloquear o event loop; o matching (CPU + LLM) roda no threadpool
+        await async_bq_client.get_all_exams(unit)
+
+        # V129: Modo streaming (opt-in): uma linha NDJSON por item assim que resolve + linha final de stats
+        # V130: "debug" devolve stats.timings (tempo e hits por etapa)
+        debug = bool(data.get("debug")) or request.query_params.get("debug") in ("1", "true")
+
+        if data.get("stream") or "application/x-ndjson" in request.headers.get("accept", ""):
+            def ndjson_events():
+                try:
+                    for event in ValidationService.iter_validate_batch(terms, unit, bq_client, debug=debug):
+                        yield json.dumps(event, ensure_ascii=False) + "\n"
+                except Exception as e:
+                    print(f"❌ Error in validate-list stream: {e}")
+                    traceback.print_exc()
+                    yield json.dumps({"type": "error", "detail": str(e)}, ensure_ascii=False) + "\n"
+
+            # Gerador síncrono: o Starlette itera no threadpool, como o validate_batch abaixo
+            return StreamingResponse(
+                ndjson_events(),
+                media_type="application/x-ndjson",
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+            )
+
         # V93: Call static method directly to avoid singleton import issues
-        results_data = ValidationService.validate_batch(terms, unit, bq_client)
+        results_data = await run_in_threadpool(ValidationService.validate_batch, terms, unit, bq_client, debug)
             
         return results_data
     except Exception as e:
@@ -70,7 +99,7 @@ async def validate_list(request: Request):
 async def search_exams(request: Request):
     """Busca manual no BigQuery."""
     try:
-        from core.bigquery_client import bq_client
+        from core.async_bigquery_client import async_bq_client
         data = await request.json()
         term = data.get("term", "")
         unit = data.get("unit", "Goiânia Centro")
@@ -78,7 +107,7 @@ async def search_exams(request: Request):
         if len(term) < 2:
             return {"exams": []}
             
-        results = bq_client.search_exams(term, unit)
+        results = await async_bq_client.search_exams(term, unit)
         return {"exams": results}
     except Exception as e:
         print(f"❌ Error in search-exams: {e}")
@@ -86,16 +115,81 @@ async def search_exams(request: Request):
 
 @app.get("/api/units")
 @app.get("/units")
-async def get_units():
-    """Retorna lista de unidades (tabelas de preço) disponíveis."""
+async def get_units(request: Request):
+    """Retorna lista de unidades (tabelas de preço) disponíveis (V118: cache + GET condicional)."""
     try:
-        from core.bigquery_client import bq_client
-        units = bq_client.get_units()
-        return {"units": units}
+        from core.async_bigquery_client import async_bq_client
+        snapshot = await async_bq_client.get_units_snapshot()
+        if not snapshot["etag"]:
+            return {"units": snapshot["units"]}
+
+        etag = f'"{snapshot["etag"]}"'
+        headers = {
+            "ETag": etag,
+            "Last-Modified": formatdate(snapshot["last_modified"], usegmt=True),
+            "Cache-Control": "no-cache"
+        }
+
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            candidates = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+            if etag in candidates or "*" in candidates:
+                return Response(status_code=304, headers=headers)
+        elif request.headers.get("if-modified-since"):
+            try:
+                since = parsedate_to_datetime(request.headers["if-modified-since"]).timestamp()
+                if int(snapshot["last_modified"]) <= since:
+                    return Response(status_code=304, headers=headers)
+            except (TypeError, ValueError):
+                pass
+
+        return JSONResponse({"units": snapshot["units"]}, headers=headers)
     except Exception as e:
         print(f"❌ Error fetching units: {e}")
         return {"units": [], "error": str(e)}
 
+@app.get("/api/diagnostics")
+@app.get("/diagnostics")
+async def diagnostics(refresh: bool = False):
+    """Diagnóstico do BigQuery (estatísticas da tabela + cache de catálogos + transporte HTTP)."""
+    try:
+        from core.bigquery_client import bq_client
+        from core.async_bigquery_client import async_bq_client
+        from core.http_transport import http_transport
+        from core.catalog_index import catalog_indexes
+        from core.match_cache import match_cache
+        return {
+            "auth": getattr(bq_client, 'auth_info', 'INIT'),
+            "table_stats": await async_bq_client.get_table_stats(refresh=refresh),
+            "catalog_cache": bq_client.get_catalog_cache_stats(),
+            "catalog_index": catalog_indexes.get_stats(),
+            "match_cache": match_cache.get_stats(),
+            "async_client": dict(async_bq_client.stats),
+            "http": http_transport.get_stats()
+        }
+    except Exception as e:
+        print(f"❌ Error in diagnostics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/metrics")
+@app.get("/metrics")
+async def metrics():
+    """Métricas agregadas do processo: etapas do validate_batch, caches de matching e transporte HTTP."""
+    try:
+        from core.stage_metrics import stage_metrics
+        from core.match_cache import match_cache
+        from core.text_normalizer import cache_info
+        from core.http_transport import http_transport
+        return {
+            "validation": stage_metrics.get_stats(),
+            "match_cache": match_cache.get_stats(),
+            "normalizer_cache": cache_info(),
+            "http": http_transport.get_stats()
+        }
+    except Exception as e:
+        print(f"❌ Error in metrics: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/learn-correction")
 @app.post("/learn-correction")
 async def learn_correction(request: Request):
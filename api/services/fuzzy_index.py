@@ -0,0 +1,149 @@
+import sys
+from difflib import SequenceMatcher
+from collections import Counter
+from heapq import nlargest, heappop, heappush, heapreplace
+from itertools import chain
+from typing import List, Dict, Tuple
+
+# V132: Busca fuzzy com poda exata de candidatos. Mesmo resultado de difflib.get_close_matches
+# (mesma cascata real_quick_ratio -> quick_ratio -> ratio, mesmo desempate do nlargest), mas:
+#   1. real_quick_ratio só depende dos tamanhos: chaves agrupadas por tamanho, baldes fora do limite
+#      nem são visitados;
+#   2. quick_ratio (interseção dos multisets de caracteres) sai exato de postings de
+#      (caractere, n-ésima ocorrência): contagem em C, sem o loop por caractere de cada chave;
+#   3. sobreviventes em ordem decrescente de quick_ratio: o ratio completo (caro) para assim que o
+#      limite superior restante não alcança mais o n-ésimo melhor. Cada par é pontuado no máximo 1x.
+#   4. (V133) baldes de tamanho contados sob demanda, intercalados com os candidatos pelo limite superior.
+
+
+def _calculate_ratio(matches: int, length: int) -> float:
+    # Mesma expressão do difflib (comparações de float idênticas)
+    if length:
+        return 2.0 * matches / length
+    return 1.0
+
+
+def _occurrences(text: str) -> List[Tuple[str, int]]:
+    # "aba" -> [("a", 1), ("b", 1), ("a", 2)]: o multiset de caracteres como tokens únicos
+    seen: Dict[str, int] = {}
+    tokens = []
+    for ch in text:
+        k = seen.get(ch, 0) + 1
+        seen[ch] = k
+        tokens.append((ch, k))
+    return tokens
+
+
+class FuzzySearchIndex:
+    name = "difflib"
+
+    def __init__(self, keys: List[str]):
+        self.keys = list(keys)
+        # tamanho -> (caractere, ocorrência) -> ids das chaves desse tamanho com >= ocorrência
+        self._postings: Dict[int, Dict[Tuple[str, int], List[int]]] = {}
+        self._by_length: Dict[int, List[int]] = {}
+        for key_id, key in enumerate(self.keys):
+            length = len(key)
+            self._by_length.setdefault(length, []).append(key_id)
+            bucket = self._postings.setdefault(length, {})
+            for token in _occurrences(key):
+                bucket.setdefault(token, []).append(key_id)
+        self._lengths = sorted(self._by_length)
+        self.approx_bytes = self._estimate_bytes()
+
+    def _estimate_bytes(self) -> int:
+        # ~64 bytes por token (tupla + slot de dict) + 8 por id nas postings
+        size = sys.getsizeof(self.keys) + 8 * len(self.keys)
+        for bucket in self._postings.values():
+            size += sys.getsizeof(bucket)
+            for ids in bucket.values():
+                size += 64 + sys.getsizeof(ids)
+        return size
+
+    def _bucket_candidates(self, tokens: List[Tuple[str, int]], lw: int, length: int, cutoff: float) -> List[Tuple[float, int]]:
+        """(quick_ratio, id) das chaves de um tamanho com quick_ratio >= cutoff."""
+        total = length + lw
+        # Menor número de caracteres em comum que ainda atinge o cutoff
+        needed = max(int(cutoff * total / 2.0) - 1, 0)
+        while _calculate_ratio(needed, total) < cutoff:
+            needed += 1
+
+        # Caracteres em comum com cada chave = ocorrências do termo que a chave também tem
+        bucket = self._postings[length]
+        common = Counter(chain.from_iterable(bucket.get(token, ()) for token in tokens))
+        if needed == 0:
+            # Cutoff tão baixo que até chave sem caractere em comum passa
+            return [(_calculate_ratio(common.get(key_id, 0), total), key_id) for key_id in self._by_length[length]]
+        return [(_calculate_ratio(matches, total), key_id) for key_id, matches in common.items() if matches >= needed]
+
+    def close_matches(self, word: str, n: int = 3, cutoff: float = 0.6, settled=None, word_first: bool = False) -> List[Tuple[float, str]]:
+        """
+        Equivalente a difflib.get_close_matches(word, keys, n, cutoff), devolvendo também o ratio:
+        [(ratio, chave)] em ordem decrescente (desempate pela chave, como o nlargest do difflib).
+        `settled(ratio, chave)` é chamado 1x quando o 1º lugar não pode mais mudar; se devolver True,
+        a busca para ali e devolve só ele.
+        `word_first=True` pontua SequenceMatcher(None, word, chave) em vez da ordem do difflib
+        (o ratio não é simétrico); os limites de poda valem para as duas ordens.
+        """
+        if not n > 0:
+            raise ValueError("n must be > 0: %r" % (n,))
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
+
+        keys = self.keys
+        lw = len(word)
+        tokens = _occurrences(word)
+        s = SequenceMatcher()
+        if word_first:
+            s.set_seq1(word)
+            set_key = s.set_seq2
+        else:
+            s.set_seq2(word)
+            set_key = s.set_seq1
+
+        # V133: Busca best-first: baldes de tamanho (real_quick_ratio) e candidatos já contados
+        # (quick_ratio) saem do maior limite superior para o menor. Um balde só é contado quando seu
+        # limite supera todos os candidatos pendentes; com o top-n cheio, o n-ésimo ratio vira o
+        # cutoff efetivo e baldes abaixo dele nem são visitados.
+        buckets = sorted(
+            ((_calculate_ratio(min(length, lw), length + lw), length) for length in self._lengths),
+            reverse=True
+        )
+        next_bucket = 0
+        pending: List[Tuple[float, int, List[Tuple[float, str]], int]] = []
+        top: List[Tuple[float, str]] = []
+        while True:
+            threshold = top[0][0] if len(top) == n else cutoff
+            bucket_bound = buckets[next_bucket][0] if next_bucket < len(buckets) else -1.0
+            candidate_bound = -pending[0][0] if pending else -1.0
+            if settled is not None and top:
+                best = max(top)
+                if bucket_bound < best[0] and candidate_bound < best[0]:
+                    if settled(*best):
+                        return [best]
+                    settled = None
+            if bucket_bound < threshold and candidate_bound < threshold:
+                break
+
+            if bucket_bound >= candidate_bound:
+                length = buckets[next_bucket][1]
+                next_bucket += 1
+                bounded = [(upper, keys[key_id]) for upper, key_id in self._bucket_candidates(tokens, lw, length, threshold)]
+                if bounded:
+                    bounded.sort(reverse=True)
+                    heappush(pending, (-bounded[0][0], length, bounded, 0))
+                continue
+
+            _, length, bounded, pos = heappop(pending)
+            if pos + 1 < len(bounded):
+                heappush(pending, (-bounded[pos + 1][0], length, bounded, pos + 1))
+            key = bounded[pos][1]
+            set_key(key)
+            score = s.ratio()
+            if score < cutoff:
+                continue
+            if len(top) < n:
+                heappush(top, (score, key))
+            elif (score, key) > top[0]:
+                heapreplace(top, (score, key))
+        return nlargest(n, top)
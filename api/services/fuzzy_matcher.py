@@ -1,40 +1,85 @@
+import threading
 from typing import List, Dict, Tuple, Optional, Any
-from difflib import SequenceMatcher, get_close_matches
+from difflib import SequenceMatcher
+
+from core.text_normalizer import normalize_fuzzy
+from services.fuzzy_scorers import build_fuzzy_engine, resolve_scorer
 
 class FuzzyMatcher:
     """
     Matching inteligente de termos usando algoritmos de similaridade nativos (difflib).
     Substitui rapidfuzz para evitar dependências pesadas no Vercel.
+
+    V131: Uma instância por catálogo (CatalogIndex.fuzzy_matcher), imutável depois de montada:
+    pode ser compartilhada entre threads/requests sem lock.
+
+    V134: `scorer` escolhe o backend de busca (services.fuzzy_scorers; padrão FUZZY_SCORER). Os scores
+    são sempre os do difflib: rapidfuzz, quando instalado, só acelera a poda.
     """
     
-    def __init__(self, known_exams: List[str] = None):
+    def __init__(self, known_exams: List[str] = None, normalized_exams: Dict[str, str] = None, scorer: str = None):
         self.known_exams = known_exams or []
-        self.normalized_exams = {}
-        if self.known_exams:
-            self._build_normalized_map()
+        self.scorer = resolve_scorer(scorer)
+        if normalized_exams is None:
+            normalized_exams = self._build_normalized_map(self.known_exams)
+        self.normalized_exams = normalized_exams
+        self._engine = None
+        self._engine_lock = threading.Lock()
     
-    def _build_normalized_map(self):
-        for exam in self.known_exams:
-            normalized = self._normalize(exam)
-            self.normalized_exams[normalized] = exam
+    def _build_normalized_map(self, exams: List[str]) -> Dict[str, str]:
+        normalized_exams = {}
+        for exam in exams:
+            normalized_exams[self._normalize(exam)] = exam
+        return normalized_exams
     
     def _normalize(self, text: str) -> str:
-        import unicodedata
-        import re
-        if not text: return ""
-        # Remove acentos
-        nfkd_form = unicodedata.normalize('NFKD', str(text))
-        text = "".join([c for c in nfkd_form if not unicodedata.combining(c)]).lower()
-        # Remove pontuação e caracteres especiais, mantendo apenas letras, números e espaços
-        text = re.sub(r'[^a-z0-9\s]', ' ', text)
-        # Normaliza espaços extras
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return normalize_fuzzy(text)
     
-    def update_known_exams(self, exams: List[str]):
-        self.known_exams = exams
-        self._build_normalized_map()
+    @property
+    def engine(self):
+        # V132: Montado no 1º uso (só termos que chegam ao fuzzy pagam o build)
+        if self._engine is None:
+            with self._engine_lock:
+                if self._engine is None:
+                    self._engine = build_fuzzy_engine(list(self.normalized_exams), self.scorer)
+        return self._engine
+
+    @property
+    def approx_bytes(self) -> int:
+        engine = self._engine
+        return engine.approx_bytes if engine is not None else 0
+
+    def _close_matches(self, normalized_term: str, n: int, min_score: int) -> List[str]:
+        # Mesmo resultado de get_close_matches(normalized_term, normalized_exams.keys(), n, min_score/100)
+        return [key for _, key in self.engine.close_matches(normalized_term, n=n, cutoff=min_score/100.0)]
     
+    @staticmethod
+    def _confidence(score: int) -> str:
+        # Classificar confiança
+        if score >= 85:
+            return "high"
+        elif score >= 70:
+            return "medium"
+        return "low"
+
+    def _scored(self, term: str, normalized_term: str, matched_normalized: str) -> Dict[str, Any]:
+        # Calcula score real usando SequenceMatcher (ordem termo -> match, como sempre foi exibido)
+        score = int(SequenceMatcher(None, normalized_term, matched_normalized).ratio() * 100)
+        return {
+            "term": term,
+            "match": self.normalized_exams[matched_normalized],
+            "score": score,
+            "confidence": self._confidence(score)
+        }
+
+    def _best_of(self, term: str, normalized_term: str, matched_normalized: str, min_score: int) -> Optional[Dict[str, Any]]:
+        best = self._scored(term, normalized_term, matched_normalized)
+        if best["score"] < min_score:
+            return None
+        best["normalized_term"] = normalized_term
+        best["normalized_match"] = matched_normalized
+        return best
+
     def find_best_match(
         self, 
         term: str, 
@@ -45,37 +90,13 @@ class FuzzyMatcher:
         
         normalized_term = self._normalize(term)
         
-        # Usa difflib get_close_matches para encontrar o melhor candidato
-        matches = get_close_matches(normalized_term, self.normalized_exams.keys(), n=1, cutoff=min_score/100.0)
+        # Melhor candidato (equivalente ao difflib get_close_matches, com poda de candidatos)
+        matches = self._close_matches(normalized_term, 1, min_score)
         
         if not matches:
             return None
         
-        matched_normalized = matches[0]
-        matched_exam = self.normalized_exams[matched_normalized]
-        
-        # Calcula score real usando SequenceMatcher
-        score = int(SequenceMatcher(None, normalized_term, matched_normalized).ratio() * 100)
-        
-        if score < min_score:
-            return None
-
-        # Classificar confiança
-        if score >= 85:
-            confidence = "high"
-        elif score >= 70:
-            confidence = "medium"
-        else:
-            confidence = "low"
-            
-        return {
-            "term": term,
-            "match": matched_exam,
-            "score": score,
-            "confidence": confidence,
-            "normalized_term": normalized_term,
-            "normalized_match": matched_normalized
-        }
+        return self._best_of(term, normalized_term, matches[0], min_score)
     
     def find_top_matches(
         self, 
@@ -87,28 +108,8 @@ class FuzzyMatcher:
             return []
             
         normalized_term = self._normalize(term)
-        matches_normalized = get_close_matches(normalized_term, self.normalized_exams.keys(), n=limit, cutoff=min_score/100.0)
-        
-        results = []
-        for matched_normalized in matches_normalized:
-            score = int(SequenceMatcher(None, normalized_term, matched_normalized).ratio() * 100)
-            matched_exam = self.normalized_exams[matched_normalized]
-            
-            if score >= 85:
-                confidence = "high"
-            elif score >= 70:
-                confidence = "medium"
-            else:
-                confidence = "low"
-                
-            results.append({
-                "term": term,
-                "match": matched_exam,
-                "score": score,
-                "confidence": confidence
-            })
-            
-        return results
+        matches_normalized = self._close_matches(normalized_term, limit, min_score)
+        return [self._scored(term, normalized_term, m) for m in matches_normalized]
     
     def batch_match(
         self, 
@@ -122,9 +123,39 @@ class FuzzyMatcher:
             "uncertain": [],
             "not_found": []
         }
+
+        # V133: Wrapper de conveniência, sem pontuação em lote: cada termo distinto continua sendo
+        # 1 consulta ao índice (o ganho de velocidade vem da poda do V132, não daqui). A consulta é
+        # top-3 no menor cutoff usado e sai ordenada por ratio, então o resultado de cada cutoff maior
+        # é um prefixo dela: best (>= 50), sugestões (>= suggest_threshold) e incertos (>= 50) saem
+        # todos dela, idênticos às 2 consultas por termo de antes. Quando o 1º lugar fica definido e
+        # já é auto-aceito, a mesma consulta para ali (alternativas não são usadas nesse balde).
+        best_cutoff = 50 / 100.0
+        suggest_cutoff = suggest_threshold / 100.0
+        ranked_by_term: Dict[str, List[Tuple[float, str]]] = {}
+
+        def accepted(normalized_term: str):
+            def settled(ratio: float, key: str) -> bool:
+                if ratio < best_cutoff:
+                    return False
+                return self._scored(normalized_term, normalized_term, key)["score"] >= max(auto_accept_threshold, 50)
+            return settled
         
         for term in terms:
-            match = self.find_best_match(term, min_score=50)
+            if not self.known_exams:
+                result["not_found"].append({"term": term})
+                continue
+
+            normalized_term = self._normalize(term)
+            ranked = ranked_by_term.get(normalized_term)
+            if ranked is None:
+                ranked = ranked_by_term[normalized_term] = self.engine.close_matches(
+                    normalized_term, n=3, cutoff=min(best_cutoff, suggest_cutoff), settled=accepted(normalized_term)
+                )
+
+            match = None
+            if ranked and ranked[0][0] >= best_cutoff:
+                match = self._best_of(term, normalized_term, ranked[0][1], 50)
             
             if not match:
                 result["not_found"].append({"term": term})
@@ -133,12 +164,11 @@ class FuzzyMatcher:
             if match["score"] >= auto_accept_threshold:
                 result["auto_accepted"].append(match)
             elif match["score"] >= suggest_threshold:
-                alternatives = self.find_top_matches(term, limit=3, min_score=suggest_threshold)
+                alternatives = [self._scored(term, normalized_term, key) for ratio, key in ranked if ratio >= suggest_cutoff]
                 match["alternatives"] = alternatives[1:] if len(alternatives) > 1 else []
                 result["suggestions"].append(match)
             else:
-                alternatives = self.find_top_matches(term, limit=3, min_score=50)
-                match["alternatives"] = alternatives
+                match["alternatives"] = [self._scored(term, normalized_term, key) for ratio, key in ranked if ratio >= best_cutoff]
                 result["uncertain"].append(match)
                 
         return result
@@ -147,6 +177,3 @@ class FuzzyMatcher:
         fuzzy_conf = fuzzy_score / 100.0
         real_confidence = (ocr_confidence * 0.3) + (fuzzy_conf * 0.7)
         return real_confidence
-
-# Singleton (será inicializado com exames do BigQuery)
-fuzzy_matcher = FuzzyMatcher()
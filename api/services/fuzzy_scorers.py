@@ -0,0 +1,114 @@
+import os
+import sys
+from difflib import SequenceMatcher
+from heapq import nlargest, heappush, heapreplace
+from typing import List, Tuple, Optional
+
+from services.fuzzy_index import FuzzySearchIndex
+
+try:
+    from rapidfuzz import fuzz as rf_fuzz, process as rf_process
+    RAPIDFUZZ_AVAILABLE = True
+except ImportError:
+    RAPIDFUZZ_AVAILABLE = False
+    rf_fuzz = rf_process = None
+
+# V134: Backends de pontuação do FuzzyMatcher. Todos devolvem exatamente o resultado de
+# difflib.get_close_matches (score = SequenceMatcher.ratio), então os limiares 50/70/85 valem igual
+# em qualquer backend; o acelerado só troca a poda de candidatos.
+#   - difflib   : FuzzySearchIndex (Python puro, padrão do Vercel)
+#   - rapidfuzz : fuzz.ratio em C como filtro + ratio do difflib nos sobreviventes
+#   - auto      : rapidfuzz se instalado, senão difflib
+FUZZY_SCORER = os.getenv("FUZZY_SCORER", "auto").strip().lower()
+
+# Folga para a comparação float entre os scores 0-100 do rapidfuzz e os ratios 0-1 do difflib
+_SCORE_EPSILON = 1e-6
+
+
+class RapidFuzzIndex:
+    """
+    fuzz.ratio do rapidfuzz (Indel: 2*LCS/total) é limite superior do ratio do difflib, cujos blocos
+    (Ratcliff/Obershelp) formam uma subsequência comum. Candidatos saem do C em ordem decrescente
+    desse limite e só os que ainda podem entrar no top-n são pontuados com SequenceMatcher.
+    O Indel é simétrico, então o limite vale também para `word_first` (ratio na ordem termo -> chave).
+    """
+    name = "rapidfuzz"
+
+    # Primeira leva de candidatos pedida ao rapidfuzz; a lista completa só se a poda não fechar nela
+    FIRST_BATCH = 32
+
+    def __init__(self, keys: List[str]):
+        if not RAPIDFUZZ_AVAILABLE:
+            raise ImportError("rapidfuzz não instalado")
+        self.keys = list(keys)
+        self.approx_bytes = sys.getsizeof(self.keys) + 8 * len(self.keys)
+
+    def close_matches(self, word: str, n: int = 3, cutoff: float = 0.6, settled=None, word_first: bool = False) -> List[Tuple[float, str]]:
+        """Mesmo contrato de FuzzySearchIndex.close_matches: [(ratio, chave)] do difflib."""
+        if not n > 0:
+            raise ValueError("n must be > 0: %r" % (n,))
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError("cutoff must be in [0.0, 1.0]: %r" % (cutoff,))
+
+        s = SequenceMatcher()
+        if word_first:
+            s.set_seq1(word)
+            set_key = s.set_seq2
+        else:
+            s.set_seq2(word)
+            set_key = s.set_seq1
+        score_cutoff = max(cutoff * 100 - _SCORE_EPSILON, 0)
+        top: List[Tuple[float, str]] = []
+        scanned = 0
+        limit = max(self.FIRST_BATCH, n * 4)
+        while True:
+            # Ordem do extract é determinística (score desc, depois posição): a 2ª chamada repete a 1ª leva
+            bounded = rf_process.extract(
+                word, self.keys, scorer=rf_fuzz.ratio, processor=None, limit=limit, score_cutoff=score_cutoff
+            )
+            for key, upper, _ in bounded[scanned:]:
+                if settled is not None and top:
+                    best = max(top)
+                    if upper < best[0] * 100 - _SCORE_EPSILON:
+                        if settled(*best):
+                            return [best]
+                        settled = None
+                if len(top) == n and upper < top[0][0] * 100 - _SCORE_EPSILON:
+                    return nlargest(n, top)
+                set_key(key)
+                score = s.ratio()
+                if score < cutoff:
+                    continue
+                if len(top) < n:
+                    heappush(top, (score, key))
+                elif (score, key) > top[0]:
+                    heapreplace(top, (score, key))
+            if limit is None or len(bounded) < limit:
+                return nlargest(n, top)
+            scanned = len(bounded)
+            limit = None
+
+
+SCORERS = {
+    "difflib": FuzzySearchIndex,
+    "rapidfuzz": RapidFuzzIndex,
+}
+
+
+def available_scorers() -> List[str]:
+    return [name for name in SCORERS if name != "rapidfuzz" or RAPIDFUZZ_AVAILABLE]
+
+
+def resolve_scorer(name: Optional[str] = None) -> str:
+    """Nome do backend efetivo; pedido indisponível/desconhecido cai para difflib."""
+    name = (name or FUZZY_SCORER).strip().lower()
+    if name == "auto":
+        return "rapidfuzz" if RAPIDFUZZ_AVAILABLE else "difflib"
+    if name not in available_scorers():
+        print(f"⚠️ FUZZY_SCORER '{name}' indisponível; usando difflib")
+        return "difflib"
+    return name
+
+
+def build_fuzzy_engine(keys: List[str], scorer: Optional[str] = None):
+    return SCORERS[resolve_scorer(scorer)](keys)
@@ -6,6 +6,8 @@ class LearningService:
     def __init__(self, file_path="learned_mappings.json"):
         self.file_path = file_path
         self.mappings = self._load_mappings()
+        # V128: Muda a cada learn() (invalida o cache de resultados de matching)
+        self.version = 0
 
     def _load_mappings(self) -> Dict[str, str]:
         if not os.path.exists(self.file_path):
@@ -31,6 +33,7 @@ class LearningService:
         """
         key = original_term.strip().lower()
         self.mappings[key] = correct_exam_name
+        self.version += 1
         self.save_mappings()
         print(f"🧠 Aprendido: '{original_term}' -> '{correct_exam_name}'")
 
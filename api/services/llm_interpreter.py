@@ -1,8 +1,9 @@
 import json
 import os
-import requests
 from typing import List, Dict, Any, Optional
 
+from core.http_transport import http_transport
+
 try:
     from library.dotenv import load_dotenv
     load_dotenv()
@@ -16,7 +17,8 @@ class LLMInterpreter:
     
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
-        self.url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent?key={self.api_key}"
+        # Chave vai no header x-goog-api-key (fora da URL, que aparece nas mensagens de erro)
+        self.url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-1.5-flash:generateContent"
         
         if not self.api_key:
             print("⚠️ GEMINI_API_KEY não configurada - LLMInterpreter desativado")
@@ -52,7 +54,7 @@ class LLMInterpreter:
         }
         
         try:
-            response = requests.post(self.url, json=payload, timeout=30)
+            response = http_transport.post("gemini", self.url, headers={"x-goog-api-key": self.api_key}, json=payload)
             response.raise_for_status()
             data = response.json()
             content = data['candidates'][0]['content']['parts'][0]['text']
@@ -0,0 +1,173 @@
+import json
+import os
+import re
+from typing import List, Dict, Tuple, Optional, Set
+
+# V135: Matching OCR sensível a confusões de caractere (0/O, 1/I/L, 5/S, RN/M, 4/T...).
+#   - custos de substituição e regras de correção vêm de api/data/ocr_confusions.json (dado, não código)
+#   - distância de edição ponderada: trocar "0" por "O" custa quase nada, trocar "A" por "O" custa 1
+#   - candidatos via deleções simétricas (SymSpell) sobre as chaves "dobradas" (confusões baratas
+#     unificadas): consulta = O(deleções do termo) lookups em dict, sem varrer o dicionário
+OCR_CONFUSIONS_PATH = os.getenv(
+    "OCR_CONFUSIONS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "ocr_confusions.json")
+)
+
+
+class OCRConfusionTable:
+    def __init__(self, data: Dict):
+        self.version = data.get("version", 0)
+        self.insert_cost = float(data.get("insert_cost", 1.0))
+        self.space_cost = float(data.get("space_cost", self.insert_cost))
+        self.substitution_cost = float(data.get("substitution_cost", 1.0))
+        self.max_edits = int(data.get("max_edits", 2))
+        fold_max_cost = float(data.get("fold_max_cost", 0.0))
+
+        # (a, b) -> custo, nos dois sentidos; sequências (RN/M) indexadas pelo último caractere de cada lado
+        self.substitutions: Dict[Tuple[str, str], float] = {}
+        self.sequences: Dict[Tuple[str, str], List[Tuple[str, str, float]]] = {}
+        self.span = 1
+        parent: Dict[str, str] = {}
+        folds: List[Tuple[str, str]] = []
+
+        def find(ch: str) -> str:
+            while parent.get(ch, ch) != ch:
+                ch = parent[ch]
+            return ch
+
+        for entry in data.get("confusions", []):
+            a, b, cost = entry["a"], entry["b"], float(entry["cost"])
+            if len(a) == 1 and len(b) == 1:
+                self.substitutions[(a, b)] = cost
+                self.substitutions[(b, a)] = cost
+                if cost <= fold_max_cost:
+                    ra, rb = find(a), find(b)
+                    if ra != rb:
+                        parent[max(ra, rb)] = min(ra, rb)
+                continue
+            for x, y in ((a, b), (b, a)):
+                self.sequences.setdefault((x[-1], y[-1]), []).append((x, y, cost))
+            self.span = max(self.span, len(a), len(b))
+            if cost <= fold_max_cost:
+                folds.append((a, b) if len(a) >= len(b) else (b, a))
+
+        # Chave do índice: sequência longa -> curta (RN -> M), depois cada caractere -> representante da classe
+        self._fold_sequences = sorted(folds, key=lambda pair: -len(pair[0]))
+        self._fold_chars = str.maketrans({ch: find(ch) for ch in parent})
+
+        self.rules = [(re.compile(rule["pattern"]), rule["replacement"]) for rule in data.get("rules", [])]
+
+    @classmethod
+    def load(cls, path: str = OCR_CONFUSIONS_PATH) -> "OCRConfusionTable":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        except Exception as e:
+            print(f"⚠️ Tabela de confusões OCR indisponível ({path}): {e}")
+            return cls({})
+
+    def fold(self, text: str) -> str:
+        for long_seq, short_seq in self._fold_sequences:
+            text = text.replace(long_seq, short_seq)
+        return text.translate(self._fold_chars)
+
+    def apply_rules(self, text: str) -> Optional[str]:
+        """Termo corrigido pela 1ª regra que casa com a linha inteira (ou None)."""
+        for pattern, replacement in self.rules:
+            if pattern.fullmatch(text):
+                return replacement
+        return None
+
+    def _indel(self, ch: str) -> float:
+        return self.space_cost if ch == " " else self.insert_cost
+
+    def distance(self, a: str, b: str, max_cost: float = float("inf")) -> float:
+        """Levenshtein ponderado pela tabela; devolve inf se passar de max_cost."""
+        indel = self._indel
+        substitutions, sequences, default_sub = self.substitutions, self.sequences, self.substitution_cost
+
+        first = [0.0]
+        for ch in b:
+            first.append(first[-1] + indel(ch))
+        rows = [first]
+        for i in range(1, len(a) + 1):
+            ca = a[i - 1]
+            prev = rows[i - 1]
+            row = [prev[0] + indel(ca)]
+            for j in range(1, len(b) + 1):
+                cb = b[j - 1]
+                best = prev[j] + indel(ca)
+                cost = row[j - 1] + indel(cb)
+                if cost < best:
+                    best = cost
+                cost = prev[j - 1] + (0.0 if ca == cb else substitutions.get((ca, cb), default_sub))
+                if cost < best:
+                    best = cost
+                for sa, sb, seq_cost in sequences.get((ca, cb), ()):
+                    la, lb = len(sa), len(sb)
+                    if i >= la and j >= lb and a[i - la:i] == sa and b[j - lb:j] == sb:
+                        cost = rows[i - la][j - lb] + seq_cost
+                        if cost < best:
+                            best = cost
+                row.append(best)
+            rows.append(row)
+            # Sequências pulam até span-1 linhas: só desiste quando as últimas `span` passaram do limite
+            if i >= self.span and all(min(r) > max_cost for r in rows[-self.span:]):
+                return float("inf")
+        result = rows[-1][-1]
+        return result if result <= max_cost else float("inf")
+
+
+def _deletions(word: str, max_edits: int) -> Set[str]:
+    found = {word}
+    frontier = {word}
+    for _ in range(max_edits):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+class OCRConfusionIndex:
+    """
+    Busca aproximada: só enxerga candidatos a <= max_edits edições no espaço dobrado. O limiar de
+    score admite mais que isso em termos longos (ex.: min_score 85 em 20 caracteres aceita custo 3.0,
+    ou seja, 6 espaços a 0.5), e esses casos não são encontrados aqui. Derivar max_edits do limiar
+    explodiria o índice (deleções crescem ~ C(len, k)); o OCRProcessor cobre esses termos no fallback
+    por ratio (best_ratio_term), que varre o dicionário inteiro.
+    """
+
+    def __init__(self, terms: List[str], table: OCRConfusionTable):
+        self.table = table
+        self.terms = list(dict.fromkeys(terms))
+        self._deletes: Dict[str, List[int]] = {}
+        for term_id, term in enumerate(self.terms):
+            for variant in _deletions(table.fold(term), table.max_edits):
+                self._deletes.setdefault(variant, []).append(term_id)
+
+    def candidates(self, text: str) -> Set[int]:
+        """Termos a <= max_edits edições de `text` no espaço dobrado (deleções dos dois lados)."""
+        found: Set[int] = set()
+        deletes = self._deletes
+        for variant in _deletions(self.table.fold(text), self.table.max_edits):
+            ids = deletes.get(variant)
+            if ids:
+                found.update(ids)
+        return found
+
+    def best_match(self, text: str, min_score: float = 0.0) -> Optional[Tuple[str, float]]:
+        """
+        (termo, score 0-100) do candidato de menor custo ponderado, com
+        score = 100 * (1 - custo / maior comprimento). Empate: ordem original dos termos.
+        """
+        best_id, best_score = None, min_score
+        for term_id in sorted(self.candidates(text)):
+            term = self.terms[term_id]
+            longest = max(len(text), len(term)) or 1
+            # Custo máximo que ainda supera o melhor score atual
+            cost = self.table.distance(text, term, max_cost=(1 - best_score / 100.0) * longest)
+            score = 100.0 * (1 - cost / longest)
+            if score > best_score or (best_id is None and score >= best_score):
+                best_id, best_score = term_id, score
+        if best_id is None:
+            return None
+        return self.terms[best_id], best_score
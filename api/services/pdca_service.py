@@ -33,9 +33,10 @@ class PdcaService:
         except Exception as e:
             print(f"❌ PDCA Error saving logs: {e}")
 
-    def log_fca(self, term: str, unit: str, status: str, strategy: str = "none", matches: List[Any] = None):
+    def log_fca(self, term: str, unit: str, status: str, strategy: str = "none", matches: List[Any] = None, *, matcher: Any):
         """
         Classifies a validation event into Fato, Causa, and Ação.
+        `matcher` is the FuzzyMatcher of the unit's catalog (CatalogIndex.fuzzy_matcher).
         """
         if status == "confirmed":
             return # Don't log success unless requested
@@ -46,8 +47,7 @@ class PdcaService:
         confidence = 0.0
 
         # Heuristic classification of cause
-        from services.fuzzy_matcher import fuzzy_matcher
-        best_match = fuzzy_matcher.find_best_match(term, min_score=60)
+        best_match = matcher.find_best_match(term, min_score=60)
         
         if not matches or len(matches) == 0:
             if best_match:
@@ -0,0 +1,119 @@
+from bisect import bisect_left
+from collections import Counter
+from heapq import nsmallest
+from itertools import chain
+from typing import List, Dict, Any, Optional
+
+from core.catalog_snapshot import catalog_key
+
+
+class ExamSearchIndex:
+    """
+    Índice local de busca (autocomplete) sobre o catálogo de uma unidade.
+    Substitui o `LIKE %termo%` no BigQuery a cada tecla digitada.
+
+    Ranking (top-k):
+      1. prefixo exato do nome normalizado
+      2. prefixo de tokens (cada token digitado é prefixo de algum token do nome)
+      3. similaridade de trigramas (tolerante a erros de digitação)
+
+    Os prefixos usam arrays ordenados + bisect (mesma busca de uma trie, com uma fração
+    da memória); a similaridade usa postings de trigramas de caracteres.
+    """
+
+    MIN_TRIGRAM_SIMILARITY = 0.3
+
+    def __init__(self, items: List[Dict[str, Any]], keys: Optional[List[str]] = None):
+        self.items = items
+        self.names = keys if keys is not None else [catalog_key(item.get("search_name")) for item in items]
+
+        # Prefixo do nome inteiro: (nome, id) ordenado
+        self._sorted_names = sorted((name, i) for i, name in enumerate(self.names) if name)
+
+        # Prefixo de token: (token, id) ordenado
+        token_pairs = set()
+        self._tokens = []
+        for i, name in enumerate(self.names):
+            tokens = name.split()
+            self._tokens.append(tokens)
+            for token in tokens:
+                token_pairs.add((token, i))
+        self._sorted_tokens = sorted(token_pairs)
+
+        # Trigramas
+        self._trigram_counts = []
+        self._postings: Dict[str, List[int]] = {}
+        for i, name in enumerate(self.names):
+            grams = self._trigrams(name)
+            self._trigram_counts.append(len(grams))
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(i)
+
+    @staticmethod
+    def _trigrams(text: str) -> set:
+        padded = f"  {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)} if text else set()
+
+    @staticmethod
+    def _prefix_range(sorted_pairs: list, prefix: str):
+        start = bisect_left(sorted_pairs, (prefix,))
+        for idx in range(start, len(sorted_pairs)):
+            value, item_id = sorted_pairs[idx]
+            if not value.startswith(prefix):
+                break
+            yield item_id
+
+    def search(self, term: str, limit: int = 10) -> List[Dict[str, Any]]:
+        query = catalog_key(term)
+        if not query:
+            return []
+
+        ranked: List[int] = []
+        seen = set()
+
+        def take(ids):
+            for i in ids:
+                if i not in seen:
+                    seen.add(i)
+                    ranked.append(i)
+
+        # 1. Prefixo exato (nomes mais curtos primeiro)
+        rank_key = lambda i: (len(self.names[i]), self.names[i])
+        take(nsmallest(limit, self._prefix_range(self._sorted_names, query), key=rank_key))
+
+        # 2. Prefixo de tokens: candidatos pelo token mais longo, depois verifica os demais
+        if len(ranked) < limit:
+            q_tokens = query.split()
+            anchor = max(q_tokens, key=len)
+            candidates = set(self._prefix_range(self._sorted_tokens, anchor)) - seen
+            token_hits = [
+                i for i in candidates
+                if all(any(t.startswith(q) for t in self._tokens[i]) for q in q_tokens)
+            ]
+            take(nsmallest(limit, token_hits, key=rank_key))
+
+        # 3. Similaridade de trigramas (Dice)
+        if len(ranked) < limit:
+            q_grams = self._trigrams(query)
+            shared = Counter(chain.from_iterable(self._postings.get(gram, ()) for gram in q_grams))
+            scored = []
+            q_len = len(q_grams)
+            for i, common in shared.items():
+                if i in seen:
+                    continue
+                score = 2.0 * common / (q_len + self._trigram_counts[i])
+                if score >= self.MIN_TRIGRAM_SIMILARITY:
+                    scored.append((-score, len(self.names[i]), self.names[i], i))
+            take(i for _, _, _, i in nsmallest(limit, scored))
+
+        return [self._public(self.items[i]) for i in ranked[:limit]]
+
+    @staticmethod
+    def _public(item: Dict[str, Any]) -> Dict[str, Any]:
+        # Mesmo formato do SELECT de BigQueryClient.search_exams
+        return {
+            "item_id": item.get("item_id"),
+            "item_name": item.get("item_name"),
+            "group_name": item.get("group_name"),
+            "price": item.get("price")
+        }
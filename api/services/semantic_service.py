@@ -1,4 +1,3 @@
-import google.generativeai as genai
 import os
 import json
 import re
@@ -8,22 +7,34 @@ try:
 except ImportError:
     pass
 
+from core.http_transport import http_transport
+
+GEMINI_MODEL = "gemini-1.5-flash"
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+
 class SemanticService:
     def __init__(self):
         self.api_key = os.getenv("GEMINI_API_KEY")
+        # V119: Gemini via REST no transporte compartilhado (pool keep-alive, timeout, retry budget).
+        # Evita importar o SDK google.generativeai no cold start.
         if self.api_key:
-            try:
-                import google.generativeai as genai
-                genai.configure(api_key=self.api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
-                print("🧠 SemanticService: Model Initialized (Gemini 1.5 Flash)")
-            except Exception as e:
-                print(f"❌ SemanticService Init Error: {e}")
-                self.model = None
+            self.model = GEMINI_MODEL
+            self.url = GEMINI_URL.format(model=GEMINI_MODEL)
+            print("🧠 SemanticService: Model Initialized (Gemini 1.5 Flash)")
         else:
             print("❌ SemanticService: GEMINI_API_KEY not found in environment.")
             self.model = None
 
+    def _generate(self, prompt: str) -> str:
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+        # Chave no header: no query string ela aparecia na URL das mensagens de HTTPError (logs)
+        response = http_transport.post(
+            "gemini", self.url, headers={"x-goog-api-key": self.api_key}, json=payload
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data["candidates"][0]["content"]["parts"][0]["text"]
+
     def normalize_batch(self, terms):
         """
         Uses Gemini to normalize a list of medical terms to their standard technical names.
@@ -56,8 +67,7 @@ class SemanticService:
         """
 
         try:
-            response = self.model.generate_content(prompt)
-            text = response.text
+            text = self._generate(prompt)
             # Clean possible markdown code blocks
             text = re.sub(r"```json|```", "", text).strip()
             
@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Tuple, Optional
+
+from core.catalog_snapshot import catalog_key
+from core.text_normalizer import normalize_tuss
+
+# V125: Sinônimos curados fora do código (api/data/synonyms.json), compilados no load:
+#   - chaves e alvos normalizados 1x (mesma regra das chaves do catálogo)
+#   - fecho transitivo pré-calculado ("vit d" -> "vitamina d" -> "25 hidroxivitamina d")
+#   - recarga automática quando o mtime do arquivo muda (sem redeploy)
+SYNONYMS_PATH = os.getenv(
+    "SYNONYMS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "synonyms.json")
+)
+SYNONYMS_RELOAD_SECONDS = float(os.getenv("SYNONYMS_RELOAD_SECONDS", "5"))
+
+
+class SynonymStore:
+    def __init__(self, path: str = SYNONYMS_PATH, reload_seconds: float = SYNONYMS_RELOAD_SECONDS):
+        self.path = path
+        self.reload_seconds = reload_seconds
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self.version = 0
+        self.closure: Dict[str, Tuple[str, ...]] = {}
+        self.tuss_aliases: Dict[str, str] = {}
+        self.reload()
+
+    def reload(self) -> bool:
+        """(Re)compila o arquivo. Em erro mantém o grafo anterior."""
+        with self._lock:
+            self._checked_at = time.monotonic()
+            try:
+                mtime = os.path.getmtime(self.path)
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"❌ SynonymStore: failed to load {self.path}: {e}")
+                return False
+
+            self.closure = self._compile(data.get("validation", {}))
+            self.tuss_aliases = {
+                normalize_tuss(alias): name for alias, name in data.get("tuss_aliases", {}).items()
+            }
+            self._mtime = mtime
+            self.version += 1
+            print(f"🧠 SynonymStore: {len(self.closure)} termos, {len(self.tuss_aliases)} aliases TUSS (v{self.version})")
+            return True
+
+    @staticmethod
+    def _compile(raw: Dict[str, List[str]]) -> Dict[str, Tuple[str, ...]]:
+        # Grafo normalizado; chaves que colidem após normalizar ("gama-gt"/"gama gt") têm os alvos unidos
+        graph: Dict[str, List[str]] = {}
+        for term, targets in raw.items():
+            key = catalog_key(term)
+            if not key:
+                continue
+            edges = graph.setdefault(key, [])
+            for target in targets:
+                norm = catalog_key(target)
+                if norm and norm not in edges:
+                    edges.append(norm)
+
+        # Fecho transitivo em BFS: alvos diretos primeiro (mesma ordem de antes), depois os indiretos
+        closure = {}
+        for key, edges in graph.items():
+            seen = {key}
+            ordered = []
+            queue = list(edges)
+            while queue:
+                node = queue.pop(0)
+                if node in seen:
+                    continue
+                seen.add(node)
+                ordered.append(node)
+                queue.extend(graph.get(node, ()))
+            closure[key] = tuple(ordered)
+        return closure
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_seconds:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return
+        if mtime != self._mtime:
+            self.reload()
+
+    def current_version(self) -> int:
+        """Versão do grafo após checar o arquivo (entra na chave do cache de matching)."""
+        self._maybe_reload()
+        return self.version
+
+    def lookup(self, normalized_term: str) -> Tuple[str, ...]:
+        """Sinônimos (já normalizados, fecho transitivo) de um termo já normalizado."""
+        self._maybe_reload()
+        return self.closure.get(normalized_term, ())
+
+    def tuss_alias(self, term: str) -> Optional[str]:
+        """Nome canônico curado para um alias (normalização do TussService)."""
+        self._maybe_reload()
+        return self.tuss_aliases.get(normalize_tuss(term))
+
+
+synonym_store = SynonymStore()
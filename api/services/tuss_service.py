@@ -1,7 +1,9 @@
 import json
 import re
 import os
-import unicodedata
+
+from core.text_normalizer import normalize_tuss
+from services.synonym_store import synonym_store
 
 class TussService:
     def __init__(self, json_path: str = None):
@@ -14,13 +16,12 @@ class TussService:
             
         self.procedures = {} # map code -> full data
         self.synonyms = {}  # map alias -> official name
+        self.loaded = False
         self._load_data()
 
     def _normalize(self, text: str) -> str:
         """Remove accents and lowercase for robust matching"""
-        if not text: return ""
-        text = unicodedata.normalize('NFKD', str(text)).encode('ASCII', 'ignore').decode('ASCII')
-        return text.lower().strip()
+        return normalize_tuss(text)
 
     def _load_data(self):
         try:
@@ -51,83 +52,7 @@ class TussService:
                 
                 count += 1
             
-            # --- SINÔNIMOS MANUAIS (CURADORIA) ---
-            # Alias comum -> Nome TUSS exato encontrado no arquivo (ou adaptado para BQ)
-            # Obs: adaptado para bater com a chave do BigQuery (agora limpa de dashes)
-            bq_eas_key = "urina rotina eas"
-            self.synonyms["eas"] = bq_eas_key
-            self.synonyms["urina tipo 1"] = bq_eas_key
-            self.synonyms["urina tipo i"] = bq_eas_key
-            self.synonyms["sumario de urina"] = bq_eas_key
-            
-            self.synonyms["tsh"] = "hormonio tireoestimulante (tsh) ultra sensivel" # Chute educado, mas vamos verificar depois se falhar
-            self.synonyms["hemograma"] = "hemograma completo" # Exemplo comum
-            
-            # Coprologico
-            self.synonyms["coprologico"] = "coprologico funcional"
-            self.synonyms["coprologico funcional"] = "coprologico funcional"
-            
-            # H.Pylori - Nome exato do BigQuery
-            self.synonyms["h.pylori"] = "antigeno helicobacter pylori"
-            self.synonyms["h pylori"] = "antigeno helicobacter pylori"
-            self.synonyms["pylori"] = "antigeno helicobacter pylori"
-            self.synonyms["helicobacter pylori"] = "antigeno helicobacter pylori"
-            self.synonyms["antigeno fecal"] = "antigeno helicobacter pylori"
-            self.synonyms["pesquisa antigeno fecal para h.pylori"] = "antigeno helicobacter pylori"
-            
-            # Perfil Lipídico
-            self.synonyms["perfil lipidico"] = "lipidogramas"
-            self.synonyms["lipidogramas"] = "lipidogramas"
-
-            # FSH
-            self.synonyms["fsh"] = "hormonio foliculo estimulante (fsh)"
-            self.synonyms["hormonio foliculo estimulante"] = "hormonio foliculo estimulante (fsh)"
-
-            # Hemoglobina Glicada
-            self.synonyms["hemoglobina glicada"] = "hemoglobina glicada (a1c)"
-            self.synonyms["glicada"] = "hemoglobina glicada (a1c)"
-            self.synonyms["hba1c"] = "hemoglobina glicada (a1c)"
-
-            # Vitamina B12
-            self.synonyms["vitamina b12"] = "vitamina b12"
-            self.synonyms["vit b12"] = "vitamina b12"
-            self.synonyms["b12"] = "vitamina b12"
-
-            # Vitamina D
-            self.synonyms["vitamina d"] = "25 hidroxivitamina d (25-oh)"
-            self.synonyms["vit d"] = "25 hidroxivitamina d (25-oh)"
-            self.synonyms["25-oh"] = "25 hidroxivitamina d (25-oh)"
-            self.synonyms["25 oh vitamina d"] = "25 hidroxivitamina d (25-oh)"
-            self.synonyms["vitamina d (25-oh)"] = "25 hidroxivitamina d (25-oh)"
-            self.synonyms["vitamina d 25 oh"] = "25 hidroxivitamina d (25-oh)"
-            self.synonyms["vitamina d3"] = "25 hidroxivitamina d (25-oh)"
-
-            # TGO / AST
-            self.synonyms["tgo"] = "tgo (ast) transaminase oxalacetica"
-            self.synonyms["ast"] = "tgo (ast) transaminase oxalacetica"
-            self.synonyms["aspartato aminotransferase"] = "tgo (ast) transaminase oxalacetica"
-            
-            # TGP / ALT
-            self.synonyms["tgp"] = "tgp (alt) transaminase piruvica"
-            self.synonyms["alt"] = "tgp (alt) transaminase piruvica"
-            self.synonyms["alanina aminotransferase"] = "tgp (alt) transaminase piruvica"
-
-            # VHS
-            self.synonyms["vhs"] = "vhs - velocidade de hemossedimentacao"
-            self.synonyms["vhs velocidade de hemossedimentacao"] = "vhs - velocidade de hemossedimentacao"
-            
-            # Gordura nas Fezes
-            self.synonyms["gordura nas fezes"] = "gordura fecal"
-            self.synonyms["gordura nas fezes (sudan iii)"] = "gordura fecal"
-            self.synonyms["sudan iii"] = "gordura fecal"
-            self.synonyms["gordura fecal"] = "gordura fecal"
-            
-            # Ferritina
-            self.synonyms["ferritina"] = "ferritina"
-            self.synonyms["dosagem de ferritina"] = "ferritina"
-            
-            # TODO: Idealmente, carregar chaves do BQ na inicialização para validar cruzamento
-            
+            self.loaded = True
             print(f"🧠 TUSS Service Loaded: {count} procedures. Synonyms ready.")
             
         except Exception as e:
@@ -135,6 +60,12 @@ class TussService:
 
     def search(self, term: str):
         """Returns standard name if found, else None"""
+        # 0. Aliases curados (data/synonyms.json -> tuss_aliases) têm prioridade sobre a tabela.
+        # Como antes, só valem com a tabela TUSS carregada (eram registrados após o load).
+        if self.loaded:
+            curated = synonym_store.tuss_alias(term)
+            if curated:
+                return curated
         norm_term = self._normalize(term)
         # 1. Tenta match exato
         if norm_term in self.synonyms:
@@ -1,9 +1,13 @@
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 
 export default function ValidationModal({ ocrResult, selectedUnit, onComplete, onBack }) {
     const [exams, setExams] = useState([])
     const [error, setError] = useState(null)
     const [loading, setLoading] = useState(true)
+    const [streaming, setStreaming] = useState(false)
+    // Ids únicos de um só contador (itens do stream e exames manuais), mesmo com o stream ainda chegando
+    const nextIdRef = useRef(1)
+    const takeId = () => nextIdRef.current++
 
     useEffect(() => {
         searchExams()
@@ -43,10 +47,11 @@ export default function ValidationModal({ ocrResult, selectedUnit, onComplete, o
             }
 
             // 2. Chamar endpoint de validação em lote (BATCH)
+            // V129: stream NDJSON - itens chegam conforme resolvem (os que dependem da IA por último)
             const response = await fetch(`${API_URL}/api/validate-list`, {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ terms: rawTerms, unit: selectedUnit })
+                headers: { 'Content-Type': 'application/json', 'Accept': 'application/x-ndjson' },
+                body: JSON.stringify({ terms: rawTerms, unit: selectedUnit, stream: true })
             })
 
             if (!response.ok) {
@@ -54,21 +59,61 @@ export default function ValidationModal({ ocrResult, selectedUnit, onComplete, o
                 throw new Error(`Erro na validação: ${response.status} - ${errText.slice(0, 50)}`)
             }
 
-            const data = await response.json()
-
-            // 3. Processar resposta do backend
-            const processedExams = data.items.map((item, index) => ({
-                id: index + 1,
+            // _order = posição do termo no pedido (o stream chega em ordem de conclusão)
+            const toExam = (item, index, stats) => ({
+                id: takeId(),
+                _order: index,
                 term: item.term,
                 status: item.status,
                 matches: item.matches || [],
                 selectedMatch: item.status === 'confirmed' ? 0 : null,
                 match_strategy: item.match_strategy,
                 normalized_term: item.normalized_term,
-                _meta: data.stats
-            }))
+                _meta: stats
+            })
+
+            const isStream = (response.headers.get('content-type') || '').includes('application/x-ndjson')
+            if (!isStream || !response.body) {
+                const data = await response.json()
+
+                // 3. Processar resposta do backend
+                setExams(data.items.map((item, index) => toExam(item, index, data.stats)))
+                setLoading(false)
+                return
+            }
 
-            setExams(processedExams)
+            // 3. Processar eventos à medida que chegam (ordem de conclusão, posicionados pelo índice)
+            // Atualizações funcionais: preserva seleções/remoções feitas enquanto o stream chega
+            setExams([])
+            setStreaming(true)
+            const handleEvent = (event) => {
+                if (event.type === 'item') {
+                    const exam = toExam(event.item, event.index, null)
+                    setExams(prev => [...prev, exam].sort((a, b) => examOrder(a) - examOrder(b)))
+                    setLoading(false)
+                } else if (event.type === 'stats') {
+                    setExams(prev => prev.map(exam => ({ ...exam, _meta: event.stats })))
+                } else if (event.type === 'error') {
+                    throw new Error(`Erro na validação: ${event.detail}`)
+                }
+            }
+
+            const reader = response.body.getReader()
+            const decoder = new TextDecoder()
+            let buffer = ''
+            try {
+                while (true) {
+                    const { done, value } = await reader.read()
+                    if (done) break
+                    buffer += decoder.decode(value, { stream: true })
+                    const lines = buffer.split('\n')
+                    buffer = lines.pop()
+                    lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)))
+                }
+                if (buffer.trim()) handleEvent(JSON.parse(buffer))
+            } finally {
+                setStreaming(false)
+            }
             setLoading(false)
 
         } catch (error) {
@@ -78,8 +123,11 @@ export default function ValidationModal({ ocrResult, selectedUnit, onComplete, o
         }
     }
 
+    // Manuais (sem _order) ficam depois dos itens do pedido
+    const examOrder = (exam) => exam._order ?? Number.MAX_SAFE_INTEGER
+
     const handleSelectMatch = (examId, matchIndex) => {
-        setExams(exams.map(exam =>
+        setExams(prev => prev.map(exam =>
             exam.id === examId
                 ? { ...exam, selectedMatch: matchIndex, status: 'confirmed' }
                 : exam
@@ -87,11 +135,11 @@ export default function ValidationModal({ ocrResult, selectedUnit, onComplete, o
     }
 
     const handleRemove = (examId) => {
-        setExams(exams.filter(exam => exam.id !== examId))
+        setExams(prev => prev.filter(exam => exam.id !== examId))
     }
 
     const addManualExam = () => {
-        const newId = exams.length > 0 ? Math.max(...exams.map(e => e.id)) + 1 : 1;
+        const newId = takeId();
         const newExam = {
             id: newId,
             term: 'Manual',
@@ -101,7 +149,7 @@ export default function ValidationModal({ ocrResult, selectedUnit, onComplete, o
             match_strategy: 'manual_injection',
             normalized_term: ''
         };
-        setExams([...exams, newExam]);
+        setExams(prev => [...prev, newExam]);
         setSearchingId(newId);
     }
 
@@ -207,7 +255,7 @@ export default function ValidationModal({ ocrResult, selectedUnit, onComplete, o
     }
 
     const selectManualMatch = (examId, match) => {
-        setExams(exams.map(exam => {
+        setExams(prev => prev.map(exam => {
             if (exam.id === examId) {
                 // Adiciona o match manual à lista de matches e o seleciona
                 const newMatches = [...exam.matches, match]
@@ -288,6 +336,14 @@ export default function ValidationModal({ ocrResult, selectedUnit, onComplete, o
                 </div>
             </div>
 
+            {/* Termos ainda em resolução (stream: aguardando IA) */}
+            {streaming && (
+                <div className="flex items-center gap-2 text-sm text-blue-700 bg-blue-50 border border-blue-100 rounded-lg p-3 mb-4">
+                    <div className="animate-spin w-4 h-4 border-2 border-blue-500 border-t-transparent rounded-full" />
+                    Resolvendo os termos restantes com IA...
+                </div>
+            )}
+
             {/* Lista de Exames */}
             <div className="space-y-4 mb-6">
                 {exams.length === 0 ? (
@@ -0,0 +1,72 @@
+import sys
+import os
+import time
+import asyncio
+
+# Benchmark: N buscas simultâneas no event loop, cliente síncrono (antes) vs AsyncBigQueryClient (depois).
+# O BigQuery é simulado por um stand-in local com latência fixa por query (I/O que libera o GIL).
+#
+# Uso: python tests_archive/bench_async_search.py [buscas_simultaneas] [latencia_query_s]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bigquery_client import BigQueryClient
+from core.async_bigquery_client import AsyncBigQueryClient
+
+CONCURRENCY = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+QUERY_LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.2
+UNIT = "Goiânia Centro"
+TERMS = ["hemograma", "glicose", "tsh", "colesterol", "ureia", "creatinina", "ferritina", "vitamina"]
+
+
+def make_client():
+    client = BigQueryClient()
+    client._authenticate = lambda: object()
+
+    def fake_query(query, parameters=None):
+        time.sleep(QUERY_LATENCY)
+        term = parameters[0]["parameterValue"]["value"].strip("%") if parameters else ""
+        return [{"item_id": 1, "item_name": term.upper(), "group_name": "LABORATORIO", "price": 10.0}]
+
+    client._run_query = fake_query
+    # Sem catálogo em memória -> toda busca cai no fallback do BigQuery (pior caso do event loop)
+    client._warm_catalog = lambda unit: None
+    return client
+
+
+async def sync_handler(client, term):
+    # Como era: chamada síncrona dentro do `async def`
+    return client.search_exams(term, UNIT)
+
+
+async def async_handler(client, term):
+    return await client.search_exams(term, UNIT)
+
+
+async def run_round(handler, client):
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        handler(client, TERMS[i % len(TERMS)]) for i in range(CONCURRENCY)
+    ])
+    elapsed = time.perf_counter() - start
+    assert all(r and r[0]["item_name"] for r in results)
+    return elapsed
+
+
+def run():
+    print(f"--- {CONCURRENCY} buscas simultâneas | latência BigQuery simulada {QUERY_LATENCY}s ---")
+    sync_client = make_client()
+    t_sync = asyncio.run(run_round(sync_handler, sync_client))
+    print(f"Síncrono (antes) : {t_sync:6.2f}s | {CONCURRENCY / t_sync:7.1f} req/s")
+
+    async_client = AsyncBigQueryClient(make_client())
+    t_async = asyncio.run(run_round(async_handler, async_client))
+    print(f"Async (depois)   : {t_async:6.2f}s | {CONCURRENCY / t_async:7.1f} req/s")
+    print(f"Speedup          : {t_sync / max(t_async, 1e-9):.1f}x | stats={async_client.stats}")
+
+
+if __name__ == "__main__":
+    run()
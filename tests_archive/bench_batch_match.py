@@ -0,0 +1,109 @@
+import sys
+import os
+import random
+import time
+
+# Equivalência + benchmark: FuzzyMatcher.batch_match (1 consulta top-3 por termo distinto) vs o loop
+# antigo (find_best_match + find_top_matches por termo). Os baldes auto_accepted/suggestions/
+# uncertain/not_found devem sair idênticos. Os dois usam o mesmo índice (V132), então o speedup
+# esperado aqui é ~1x: batch_match só economiza a 2ª consulta e termos repetidos.
+#
+# Uso: python tests_archive/bench_batch_match.py [termos] [tamanhos separados por vírgula]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.sqlite_backend import synthetic_catalog_names
+from services.fuzzy_matcher import FuzzyMatcher
+
+N_TERMS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+SIZES = [int(x) for x in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1000, 10000]
+# (auto_accept_threshold, suggest_threshold)
+THRESHOLDS = [(85, 70), (90, 60), (80, 40)]
+
+
+def legacy_batch_match(matcher, terms, auto_accept_threshold=85, suggest_threshold=70):
+    result = {"auto_accepted": [], "suggestions": [], "uncertain": [], "not_found": []}
+    for term in terms:
+        match = matcher.find_best_match(term)
+        if not match:
+            result["not_found"].append({"term": term})
+            continue
+        if match["score"] >= auto_accept_threshold:
+            result["auto_accepted"].append(match)
+        elif match["score"] >= suggest_threshold:
+            alternatives = matcher.find_top_matches(term, limit=3, min_score=suggest_threshold)
+            match["alternatives"] = alternatives[1:] if len(alternatives) > 1 else []
+            result["suggestions"].append(match)
+        else:
+            match["alternatives"] = matcher.find_top_matches(term, limit=3)
+            result["uncertain"].append(match)
+    return result
+
+
+def typo(text, rng):
+    chars = list(text)
+    for _ in range(rng.randint(1, 4)):
+        op = rng.random()
+        pos = rng.randrange(len(chars) + 1)
+        if op < 0.4 and chars:
+            chars.pop(min(pos, len(chars) - 1))
+        elif op < 0.7:
+            chars.insert(pos, rng.choice("abcdefghijklmnopqrstuvwxyz "))
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def make_terms(names, rng):
+    terms = ["", "Hemograma", "VITAMINA D", "tsh", "xyzw qqq"]
+    while len(terms) < N_TERMS:
+        roll = rng.random()
+        name = rng.choice(names)
+        if roll < 0.2:
+            terms.append(name.title())
+        elif roll < 0.7:
+            terms.append(typo(name.lower(), rng))
+        elif roll < 0.85:
+            words = name.split()
+            terms.append(" ".join(words[:rng.randint(1, len(words))]))
+        else:
+            # Pedidos repetem exames (mesmo termo várias vezes)
+            terms.append(rng.choice(terms))
+    return terms
+
+
+def run():
+    rng = random.Random(23)
+    for size in SIZES:
+        names = synthetic_catalog_names(size)
+        matcher = FuzzyMatcher(names)
+        matcher.engine
+        terms = make_terms(names, rng)
+
+        t_legacy = t_batch = 0.0
+        for auto_accept, suggest in THRESHOLDS:
+            start = time.perf_counter()
+            expected = legacy_batch_match(matcher, terms, auto_accept, suggest)
+            t_legacy += time.perf_counter() - start
+
+            start = time.perf_counter()
+            got = matcher.batch_match(terms, auto_accept, suggest)
+            t_batch += time.perf_counter() - start
+
+            for bucket in expected:
+                if got[bucket] != expected[bucket]:
+                    print(f"❌ ({auto_accept}, {suggest}) balde '{bucket}' divergente")
+            assert got == expected
+            print(f"  ({auto_accept}, {suggest}): " + " | ".join(f"{b} {len(got[b])}" for b in got))
+
+        print(f"--- {len(matcher.known_exams)} exames | {len(terms)} termos x {len(THRESHOLDS)} limiares ---")
+        print(f"loop antigo : {t_legacy * 1000:9.1f} ms")
+        print(f"batch_match : {t_batch * 1000:9.1f} ms  ({t_legacy / t_batch:.1f}x)")
+    print("✅ Baldes idênticos ao loop find_best_match/find_top_matches")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,96 @@
+import sys
+import os
+import time
+import shutil
+import tempfile
+
+# Benchmark: tempo até a primeira validação em cold start, com e sem snapshot em disco.
+# O BigQuery é simulado (latência de auth + query configuráveis) para o teste ser reprodutível.
+#
+# Uso: python tests_archive/bench_catalog_snapshot.py [itens] [latencia_query_s] [latencia_auth_s]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bigquery_client import BigQueryClient, BigQueryQueryError
+from core.catalog_snapshot import CatalogSnapshotStore, catalog_key
+
+N_ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+QUERY_LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 1.5
+AUTH_LATENCY = float(sys.argv[3]) if len(sys.argv) > 3 else 0.4
+UNIT = "Goiânia Centro"
+
+RAW_ROWS = [
+    {
+        "item_id": str(100000 + i),
+        "item_name": f"DOSAGEM DE ANALITO {i} - EXAMES LABORATORIAIS",
+        "group_name": "LABORATORIO",
+        "price": 10.0 + (i % 90)
+    }
+    for i in range(N_ITEMS)
+]
+
+
+def make_client(snapshot_dir):
+    client = BigQueryClient()
+    client.snapshot_store = CatalogSnapshotStore(snapshot_dir)
+
+    def fake_auth():
+        time.sleep(AUTH_LATENCY)
+        client.auth_info = "OK (SIMULATED)"
+        return object()
+
+    def fake_iter_query(query, parameters=None, as_dict=True):
+        # Mesmo contrato do _iter_query: dicts ou tuplas na ordem do SELECT
+        if not client.session:
+            raise BigQueryQueryError(f"no session ({client.auth_info})")
+        time.sleep(QUERY_LATENCY)
+        for r in RAW_ROWS:
+            yield dict(r) if as_dict else (r["item_id"], r["item_name"], r["group_name"], r["price"])
+
+    client._authenticate = fake_auth
+    client._iter_query = fake_iter_query
+    return client
+
+
+def first_validation(client):
+    """Parte da validação que depende do catálogo: carregar + montar o mapa de chaves."""
+    start = time.perf_counter()
+    exams = client.get_all_exams(UNIT)
+    keys = client.get_catalog_keys(UNIT) or [catalog_key(e["search_name"]) for e in exams]
+    exam_map = {}
+    for key, exam in zip(keys, exams):
+        exam_map.setdefault(key, []).append(exam)
+    return time.perf_counter() - start, len(exam_map)
+
+
+def run():
+    print(f"--- COLD START: {N_ITEMS} itens | query {QUERY_LATENCY}s | auth {AUTH_LATENCY}s ---")
+    snapshot_dir = tempfile.mkdtemp(prefix="vitta_snap_bench_")
+    try:
+        # 1. Sem snapshot (processo novo, diretório vazio)
+        cold = make_client(snapshot_dir)
+        t_cold, n_keys = first_validation(cold)
+        print(f"Sem snapshot : {t_cold * 1000:8.1f} ms ({n_keys} chaves)")
+
+        path = cold.snapshot_store.path_for(UNIT)
+        print(f"Snapshot     : {os.path.getsize(path) / 1024:.0f} KiB em {path}")
+
+        # 2. Com snapshot (novo processo simulado -> novo client, mesmo diretório)
+        warm = make_client(snapshot_dir)
+        t_snap, n_keys = first_validation(warm)
+        print(f"Com snapshot : {t_snap * 1000:8.1f} ms ({n_keys} chaves)")
+        print(f"Speedup      : {t_cold / max(t_snap, 1e-9):.1f}x")
+
+        # Reconciliação em background com o BigQuery (não bloqueia a primeira validação)
+        time.sleep(QUERY_LATENCY + AUTH_LATENCY + 0.5)
+        stats = warm.get_catalog_cache_stats()
+        print(f"Após reconciliação: refreshes={stats['refreshes']} seeded={stats['seeded_from_snapshot']}")
+    finally:
+        shutil.rmtree(snapshot_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,91 @@
+import sys
+import os
+import random
+import time
+from difflib import get_close_matches
+
+# Equivalência + benchmark: FuzzySearchIndex (poda exata de candidatos) vs difflib.get_close_matches
+# sobre as chaves normalizadas do catálogo, em 1k/10k/100k chaves.
+#
+# Uso: python tests_archive/bench_fuzzy_index.py [consultas] [tamanhos separados por vírgula]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.sqlite_backend import synthetic_catalog_names
+from core.text_normalizer import normalize_fuzzy
+from services.fuzzy_index import FuzzySearchIndex
+
+N_QUERIES = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+SIZES = [int(x) for x in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1000, 10000, 100000]
+# (n, cutoff) usados pelo FuzzyMatcher/PDCA/validation
+SETTINGS = [(1, 0.5), (1, 0.6), (1, 0.7), (5, 0.5), (1, 0.8), (3, 0.7)]
+
+
+def typo(text, rng):
+    chars = list(text)
+    for _ in range(rng.randint(1, 3)):
+        op = rng.random()
+        pos = rng.randrange(len(chars) + 1)
+        if op < 0.4 and chars:
+            chars.pop(min(pos, len(chars) - 1))
+        elif op < 0.7:
+            chars.insert(pos, rng.choice("abcdefghijklmnopqrstuvwxyz "))
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def queries(keys, rng):
+    qs = ["", "a", "hemograma", "vitamina d", "tsh", "glicose jejum", "colesterol hdl ldl", "xyzw qqq"]
+    while len(qs) < N_QUERIES:
+        roll = rng.random()
+        key = rng.choice(keys)
+        if roll < 0.5:
+            qs.append(typo(key, rng))
+        elif roll < 0.8:
+            words = key.split()
+            qs.append(" ".join(words[:rng.randint(1, len(words))]))
+        else:
+            qs.append(" ".join(rng.choice(rng.choice(keys).split()) for _ in range(rng.randint(1, 4))))
+    return qs
+
+
+def run():
+    rng = random.Random(11)
+    for size in SIZES:
+        keys = list(dict.fromkeys(normalize_fuzzy(n) for n in synthetic_catalog_names(size)))
+        start = time.perf_counter()
+        index = FuzzySearchIndex(keys)
+        build_ms = (time.perf_counter() - start) * 1000
+        qs = queries(keys, rng)
+
+        t_difflib = t_index = 0.0
+        mismatches = 0
+        for word in qs:
+            for n, cutoff in SETTINGS:
+                start = time.perf_counter()
+                expected = get_close_matches(word, keys, n=n, cutoff=cutoff)
+                t_difflib += time.perf_counter() - start
+
+                start = time.perf_counter()
+                got = [key for _, key in index.close_matches(word, n=n, cutoff=cutoff)]
+                t_index += time.perf_counter() - start
+
+                if got != expected:
+                    mismatches += 1
+                    if mismatches <= 5:
+                        print(f"❌ '{word}' n={n} cutoff={cutoff}: {expected} != {got}")
+
+        calls = len(qs) * len(SETTINGS)
+        print(f"--- {len(keys)} chaves | {calls} consultas | build {build_ms:.0f} ms ---")
+        print(f"difflib : {t_difflib * 1000 / calls:9.3f} ms/consulta")
+        print(f"índice  : {t_index * 1000 / calls:9.3f} ms/consulta  ({t_difflib / t_index:.1f}x)")
+        assert mismatches == 0, f"{mismatches} divergências"
+    print("✅ Resultados idênticos ao difflib.get_close_matches")
+
+
+if __name__ == "__main__":
+    run()
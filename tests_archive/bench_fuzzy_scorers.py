@@ -0,0 +1,127 @@
+import sys
+import os
+import random
+import time
+from difflib import SequenceMatcher, get_close_matches
+from heapq import nlargest
+
+# Throughput por backend do FuzzyMatcher (services.fuzzy_scorers) + equivalência com
+# difflib.get_close_matches. Também mede quantos termos mudariam de faixa (50/70/85) se o score
+# nativo do rapidfuzz (fuzz.ratio) fosse usado direto, sem recalibrar pelo difflib.
+#
+# Uso: python tests_archive/bench_fuzzy_scorers.py [consultas] [tamanhos separados por vírgula]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.sqlite_backend import synthetic_catalog_names
+from core.text_normalizer import normalize_fuzzy
+from services.fuzzy_scorers import SCORERS, available_scorers, RAPIDFUZZ_AVAILABLE, rf_fuzz, rf_process
+
+N_QUERIES = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+SIZES = [int(x) for x in sys.argv[2].split(",")] if len(sys.argv) > 2 else [1000, 10000, 100000]
+# (n, cutoff): find_best_match, sugestões e incertos do batch_match
+SETTINGS = [(1, 0.5), (3, 0.7), (3, 0.5)]
+# word_first=True (ordem termo -> chave, usada pelo OCR): mesmo contrato em todos os backends
+WORD_FIRST_SETTINGS = [(1, 0.0), (3, 0.5)]
+# Conferência contra o difflib puro só até esse tamanho (get_close_matches é ~0,3 s/consulta em 10k)
+VERIFY_MAX_KEYS = 2000
+
+
+def typo(text, rng):
+    chars = list(text)
+    for _ in range(rng.randint(1, 3)):
+        op = rng.random()
+        pos = rng.randrange(len(chars) + 1)
+        if op < 0.4 and chars:
+            chars.pop(min(pos, len(chars) - 1))
+        elif op < 0.7:
+            chars.insert(pos, rng.choice("abcdefghijklmnopqrstuvwxyz "))
+        elif chars:
+            chars[min(pos, len(chars) - 1)] = rng.choice("abcdefghijklmnopqrstuvwxyz")
+    return "".join(chars)
+
+
+def make_queries(keys, rng):
+    qs = []
+    while len(qs) < N_QUERIES:
+        key = rng.choice(keys)
+        if rng.random() < 0.7:
+            qs.append(typo(key, rng))
+        else:
+            words = key.split()
+            qs.append(" ".join(words[:rng.randint(1, len(words))]))
+    return qs
+
+
+def word_first_matches(word, keys, n, cutoff):
+    # Referência por força bruta: get_close_matches com SequenceMatcher(None, word, chave)
+    scored = []
+    for key in keys:
+        ratio = SequenceMatcher(None, word, key).ratio()
+        if ratio >= cutoff:
+            scored.append((ratio, key))
+    return [key for _, key in nlargest(n, scored)]
+
+
+def band(score):
+    return 3 if score >= 85 else 2 if score >= 70 else 1 if score >= 50 else 0
+
+
+def run():
+    print(f"Backends disponíveis: {', '.join(available_scorers())}")
+    if not RAPIDFUZZ_AVAILABLE:
+        print("⚠️ rapidfuzz não instalado: só o backend difflib será medido (pip install rapidfuzz)")
+
+    rng = random.Random(24)
+    for size in SIZES:
+        keys = list(dict.fromkeys(normalize_fuzzy(n) for n in synthetic_catalog_names(size)))
+        qs = make_queries(keys, rng)
+        verify = len(keys) <= VERIFY_MAX_KEYS
+        print(f"--- {len(keys)} chaves | {len(qs) * len(SETTINGS)} consultas ---")
+
+        reference = None
+        for name in available_scorers():
+            start = time.perf_counter()
+            engine = SCORERS[name](keys)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            results = []
+            start = time.perf_counter()
+            for word in qs:
+                for n, cutoff in SETTINGS:
+                    results.append([key for _, key in engine.close_matches(word, n=n, cutoff=cutoff)])
+            elapsed = time.perf_counter() - start
+            print(f"{name:10s}: {len(results) / elapsed:9.1f} consultas/s  (build {build_ms:.0f} ms)")
+
+            word_first = [
+                [key for _, key in engine.close_matches(word, n=n, cutoff=cutoff, word_first=True)]
+                for word in qs for n, cutoff in WORD_FIRST_SETTINGS
+            ]
+
+            if reference is None:
+                reference = results
+                reference_word_first = word_first
+            assert results == reference, f"{name} diverge do difflib"
+            assert word_first == reference_word_first, f"{name} diverge com word_first=True"
+
+        if verify:
+            expected = [get_close_matches(word, keys, n=n, cutoff=cutoff) for word in qs for n, cutoff in SETTINGS]
+            assert reference == expected, "backends divergem de difflib.get_close_matches"
+            expected = [word_first_matches(word, keys, n, cutoff) for word in qs for n, cutoff in WORD_FIRST_SETTINGS]
+            assert reference_word_first == expected, "word_first diverge da referência"
+
+        if RAPIDFUZZ_AVAILABLE:
+            moved = 0
+            for word in qs:
+                key, native, _ = rf_process.extractOne(word, keys, scorer=rf_fuzz.ratio, processor=None)
+                calibrated = int(SequenceMatcher(None, word, key).ratio() * 100)
+                moved += band(int(native)) != band(calibrated)
+            print(f"score nativo do rapidfuzz mudaria a faixa 50/70/85 de {moved}/{len(qs)} termos")
+    print("✅ Todos os backends devolvem o mesmo resultado do difflib")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,145 @@
+import sys
+import os
+import random
+import time
+from difflib import SequenceMatcher
+
+# OCRProcessor._match_term com índice de confusões OCR (api/data/ocr_confusions.json) vs a varredura
+# linear antiga (SequenceMatcher contra todo o dicionário), sobre termos do exams_dictionary.json
+# corrompidos com confusões típicas (0/O, 1/I, 5/S, RN/M...) e erros comuns de digitação.
+#
+# Uso: python tests_archive/bench_ocr_confusion.py [termos]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.ocr_processor import OCRProcessor
+from services.ocr_confusion_index import OCRConfusionIndex
+
+N_TERMS = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+OCR_SWAPS = [("O", "0"), ("I", "1"), ("L", "1"), ("S", "5"), ("B", "8"), ("G", "6"), ("M", "RN"), ("T", "7"), ("V", "U")]
+
+
+def legacy_match_term(processor, text):
+    # Varredura antiga (antes do V135), mantida aqui só como referência
+    text_norm = processor._normalizar_texto(text)
+    if not text_norm: return None
+    for norm_term, official_name in processor.exams_flat_list:
+        if text_norm == norm_term:
+            return official_name, 100.0, "exact_match"
+    best_ratio, best_official, best_norm_term = 0.0, None, ""
+    for norm_term, official_name in processor.exams_flat_list:
+        ratio = SequenceMatcher(None, text_norm, norm_term).ratio() * 100.0
+        if ratio > best_ratio:
+            best_ratio, best_official, best_norm_term = ratio, official_name, norm_term
+    if not best_official:
+        return None
+    if len(text_norm) <= 4:
+        return (best_official, best_ratio, "short_token_high_precision") if best_ratio >= 95 else None
+    if best_ratio >= 92:
+        return best_official, best_ratio, "phase_a_high_precision"
+    if best_ratio >= 85:
+        return best_official, best_ratio, "phase_b_high_coverage"
+    if len(best_norm_term) > 4 and best_norm_term in text_norm:
+        return best_official, 80.0, "contains_fallback"
+    return None
+
+
+def legacy_best_ratio_term(processor, text_norm):
+    # Melhor ratio da varredura antiga: 1º máximo na ordem do dicionário
+    best_ratio, best_norm_term = 0.0, None
+    for norm_term, _ in processor.exams_flat_list:
+        ratio = SequenceMatcher(None, text_norm, norm_term).ratio() * 100.0
+        if ratio > best_ratio:
+            best_ratio, best_norm_term = ratio, norm_term
+    return (best_norm_term, best_ratio) if best_norm_term else None
+
+
+def corrupt(text, rng):
+    chars = text
+    swaps = [(a, b) for a, b in OCR_SWAPS if a in chars]
+    for a, b in rng.sample(swaps, min(len(swaps), rng.randint(1, 2))):
+        pos = [i for i in range(len(chars)) if chars.startswith(a, i)]
+        i = rng.choice(pos)
+        chars = chars[:i] + b + chars[i + len(a):]
+    if rng.random() < 0.3 and len(chars) > 6:
+        i = rng.randrange(len(chars))
+        chars = chars[:i] + chars[i + 1:]
+    return chars
+
+
+def make_processor():
+    # Sem credenciais GCP: só o que o matching usa
+    processor = OCRProcessor.__new__(OCRProcessor)
+    processor.exams_dict = processor._load_exams_dictionary()
+    processor.exams_flat_list = processor._flatten_dictionary()
+    return processor
+
+
+def run():
+    processor = make_processor()
+    start = time.perf_counter()
+    matching = processor.matching
+    build_ms = (time.perf_counter() - start) * 1000
+    start = time.perf_counter()
+    assert make_processor().matching is matching, "índices devem ser compartilhados entre instâncias"
+    reuse_ms = (time.perf_counter() - start) * 1000
+    print(f"Dicionário: {len(matching.exact_map)} termos | {len(matching.confusion_index._deletes)} chaves de deleção")
+    print(f"Índices: build {build_ms:.1f} ms (1x por processo) | nova instância {reuse_ms:.2f} ms")
+
+    # Regras que viviam como regex no backend, agora em ocr_confusions.json
+    for raw, expected in [("4 754", "TSH"), ("T4 Liore", "T4 Livre"), ("Hemogroma", "Hemograma Completo"), ("Urreia", "Ureia")]:
+        got = processor._match_term(raw)
+        assert got and got[0] == expected, (raw, got)
+
+    # Limite documentado do índice: só candidatos a <= max_edits edições dobradas. Custo ponderado
+    # dentro do limiar mas com mais edições (3 espaços em 20 caracteres) fica para o fallback por ratio.
+    table = matching.confusions
+    term = "ABCDEFGHIJKLMNOPQRST"
+    boundary = OCRConfusionIndex([term], table)
+    within = "ABCDE FGHIJ KLMNOPQRST"
+    beyond = "ABCDE FGHIJ KLMNO PQRST"
+    assert table.max_edits == 2
+    assert boundary.best_match(within, min_score=85)[0] == term
+    cost = table.distance(beyond, term)
+    assert 100 * (1 - cost / len(beyond)) >= 85, "custo ponderado aceitaria o termo"
+    assert boundary.best_match(beyond, min_score=85) is None, "índice aproximado: além de max_edits não encontra"
+    long_norm, long_official = next(
+        (norm, official) for norm, official in processor.exams_flat_list if len(norm) >= 20 and " " not in norm[:15]
+    )
+    spaced = f"{long_norm[:5]} {long_norm[5:10]} {long_norm[10:15]} {long_norm[15:]}"
+    assert matching.confusion_index.best_match(spaced, min_score=85) is None
+    got = processor._match_term(spaced)
+    assert got and got[0] == long_official, (spaced, got)
+    print(f"Limite do índice: {table.max_edits} edições dobradas (custo {cost:.1f} em {len(beyond)} caracteres -> fallback)")
+
+    rng = random.Random(25)
+    pairs = [(norm, official) for norm, official in processor.exams_flat_list if len(norm) >= 4]
+    samples = []
+    while len(samples) < N_TERMS:
+        norm, official = rng.choice(pairs)
+        samples.append((corrupt(norm, rng), official))
+
+    # Fallback por ratio: mesmo termo (e desempate pela ordem do dicionário) da varredura linear
+    # (trechos curtos/invertidos geram muitos empates, ex.: "ORMO"; ratio não é simétrico)
+    texts = [text for text, _ in samples] + ["HEMOGRAMA COMPLETO COM PLAQUETAS E RETICULOCITOS", "A", "XYZ", "T3 T4", "ORMO"]
+    for norm, _ in pairs[:200]:
+        texts.extend([norm[:3], norm[1:5], norm[::-1]])
+    for text in texts:
+        text_norm = processor._normalizar_texto(text)
+        assert matching.best_ratio_term(text_norm) == legacy_best_ratio_term(processor, text_norm), text
+
+    for name, match in (("varredura antiga", lambda t: legacy_match_term(processor, t)), ("índice V135", processor._match_term)):
+        start = time.perf_counter()
+        results = [match(text) for text, _ in samples]
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        correct = sum(1 for r, (_, official) in zip(results, samples) if r and r[0] == official)
+        wrong = sum(1 for r, (_, official) in zip(results, samples) if r and r[0] != official)
+        print(f"{name:17s}: {elapsed_ms / len(samples):7.3f} ms/termo | corretos {correct}/{len(samples)} | errados {wrong}")
+    print("✅ Regras em dado e matching por confusões OCR")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,77 @@
+import sys
+import os
+import time
+
+# Microbenchmark: decodificação de rows do BigQuery REST.
+# Loop antigo (dict por row, cast por nome de campo) vs decoder compilado por schema.
+#
+# Uso: python tests_archive/bench_row_decoder.py [linhas]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bq_row_decoder import get_row_decoder
+
+N_ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+
+SCHEMA = [
+    {"name": "item_id", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "item_name", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "group_name", "type": "STRING", "mode": "NULLABLE"},
+    {"name": "price", "type": "FLOAT", "mode": "NULLABLE"},
+]
+ROWS = [
+    {"f": [{"v": str(100000 + i)}, {"v": f"DOSAGEM DE ANALITO {i}"}, {"v": "LABORATORIO"}, {"v": f"{10 + i % 90}.5"}]}
+    for i in range(N_ROWS)
+]
+
+
+def legacy_decode(schema, rows):
+    """Loop original de BigQueryClient._run_query (até V114)."""
+    results = []
+    for row in rows:
+        item = {}
+        values = row.get("f", [])
+        for i, field in enumerate(schema):
+            field_name = field.get("name")
+            val = values[i].get("v")
+            if field_name == "price" and val is not None:
+                try:
+                    val = float(val)
+                except:
+                    val = 0.0
+            item[field_name] = val
+        results.append(item)
+    return results
+
+
+def compiled_records(schema, rows):
+    return get_row_decoder(schema).decode_page(rows)
+
+
+def compiled_dicts(schema, rows):
+    return get_row_decoder(schema).decode_page_dicts(rows)
+
+
+def best_of(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(SCHEMA, ROWS)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    # Sanidade: mesma saída nas duas implementações
+    assert compiled_dicts(SCHEMA, ROWS[:100]) == legacy_decode(SCHEMA, ROWS[:100])
+
+    print(f"--- DECODE DE {N_ROWS} ROWS (melhor de 5) ---")
+    t_legacy = best_of(legacy_decode)
+    t_records = best_of(compiled_records)
+    t_dicts = best_of(compiled_dicts)
+    print(f"Loop antigo (dicts)        : {t_legacy * 1000:8.1f} ms")
+    print(f"Compilado (tuplas)         : {t_records * 1000:8.1f} ms  ({t_legacy / t_records:.1f}x)")
+    print(f"Compilado (dicts)          : {t_dicts * 1000:8.1f} ms  ({t_legacy / t_dicts:.1f}x)")
@@ -0,0 +1,132 @@
+import sys
+import os
+import re
+import random
+import time
+import unicodedata
+
+# Equivalência + microbenchmark: normalizador compartilhado (core/text_normalizer) vs as 4 rotinas antigas.
+#
+# Uso: python tests_archive/bench_text_normalizer.py [chamadas]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core import text_normalizer
+from core.sqlite_backend import synthetic_catalog_names
+
+N_CALLS = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+
+# --- Rotinas antigas (cópias fiéis) ---
+
+def old_validation(text):
+    import unicodedata
+    import re
+    if not text: return ""
+    nfkd_form = unicodedata.normalize('NFKD', str(text))
+    text = "".join([c for c in nfkd_form if not unicodedata.combining(c)]).lower()
+    text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    text = text.replace(' exames laboratoriais', '').replace(' exames', '')
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def old_fuzzy(text):
+    import unicodedata
+    import re
+    if not text: return ""
+    nfkd_form = unicodedata.normalize('NFKD', str(text))
+    text = "".join([c for c in nfkd_form if not unicodedata.combining(c)]).lower()
+    text = re.sub(r'[^a-z0-9\s]', ' ', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def old_ocr(texto):
+    if not texto: return ""
+    texto = texto.upper()
+    noise = ["EXAMES LABORATORIAIS", "EXAME LABORATORIAL", "SOLICITACAO DE EXAMES", " E EXAMES", "LABORATORIAIS", "LABORATORIAL"]
+    for n in noise:
+        texto = texto.replace(n, "")
+    texto = unicodedata.normalize('NFKD', texto)
+    texto = "".join([c for c in texto if not unicodedata.combining(c)])
+    texto = texto.replace("2,5", "25").replace("2.5", "25")
+    texto = re.sub(r'[^A-Z0-9\s]', ' ', texto)
+    texto = re.sub(r'\s+', ' ', texto).strip()
+    return texto
+
+
+def old_tuss(text):
+    if not text: return ""
+    text = unicodedata.normalize('NFKD', str(text)).encode('ASCII', 'ignore').decode('ASCII')
+    return text.lower().strip()
+
+
+PAIRS = [
+    ("validation", old_validation, text_normalizer.normalize_validation),
+    ("fuzzy", old_fuzzy, text_normalizer.normalize_fuzzy),
+    ("ocr", old_ocr, text_normalizer.normalize_ocr),
+    ("tuss", old_tuss, text_normalizer.normalize_tuss),
+]
+
+
+def corpus(rng):
+    texts = [
+        "Hemograma Completo - EXAMES LABORATORIAIS", "Vitamina D 2,5 OH", "Glicose (jejum)", "  TSH  ",
+        "Ácido Úrico", "Beta-HCG Quantitativo", "h.pylori", "25-OH vitamina D", "Colesterol\tTotal\nHDL",
+        "Ureia exames exameslaboratoriais", "Straße ΟΔΟΣ İstanbul ﬁbrinogênio ª º ½", " T4 Livre​",
+        "x exa examesmes", "Tipagem Sanguínea - Fator Rh", "Proteína C-Reativa (PCR) ultrassensível",
+        "2﹐5 hidroxi", "", "e exames laboratoriais", "SOLICITAÇÃO DE EXAMES: hemograma",
+    ]
+    texts += synthetic_catalog_names(500)
+    # Texto aleatório com caracteres de todo o BMP (acentos, compatibilidade, espaços exóticos)
+    for _ in range(3000):
+        texts.append("".join(chr(rng.randint(0x20, 0xFFFD)) if rng.random() < 0.3 else rng.choice("abcçãéíõúAEIOU 2,.5-")
+                             for _ in range(rng.randint(1, 30))))
+    return [t for t in texts if not (0xD800 <= max(map(ord, t), default=0) <= 0xDFFF)]
+
+
+def run():
+    rng = random.Random(3)
+    texts = corpus(rng)
+    mismatches = 0
+    for name, old, new in PAIRS:
+        for text in texts:
+            if old(text) != new(text):
+                mismatches += 1
+                if mismatches <= 5:
+                    print(f"❌ [{name}] {text!r}: {old(text)!r} != {new(text)!r}")
+    assert mismatches == 0, f"{mismatches} divergências"
+    print(f"✅ {len(PAIRS)} perfis idênticos às rotinas antigas em {len(texts)} textos")
+
+    # Termos realistas de pedido (com repetição, como na prática)
+    terms = synthetic_catalog_names(2000)
+    workload = [rng.choice(terms) for _ in range(N_CALLS)]
+    print(f"--- {N_CALLS} chamadas por perfil (µs/chamada) ---")
+    for name, old, new in PAIRS:
+        start = time.perf_counter()
+        for text in workload:
+            old(text)
+        t_old = time.perf_counter() - start
+
+        # Sem memo: mede só tabelas/padrões pré-compilados
+        inner = getattr(text_normalizer, f"_{name}").__wrapped__
+        start = time.perf_counter()
+        for text in workload:
+            inner(text)
+        t_cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for text in workload:
+            new(text)
+        t_memo = time.perf_counter() - start
+
+        us = 1e6 / N_CALLS
+        print(f"{name:10s}: antigo {t_old * us:6.2f} | sem memo {t_cold * us:6.2f} | com LRU {t_memo * us:6.2f}")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,52 @@
+import sys
+import os
+
+# Lote com termos repetidos: o Resolute (e o matching) deve rodar 1x por termo normalizado,
+# com as repetições devolvidas na ordem original como "duplicate".
+#
+# Uso: python tests_archive/test_batch_dedup.py
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.validation_logic import ValidationService
+from services.resolute_orchestrator import ResoluteOrchestrator
+
+
+class MockBQ:
+    def get_all_exams(self, unit):
+        return [
+            {"item_id": 1, "item_name": "HEMOGRAMA COMPLETO", "search_name": "hemograma completo", "group_name": "LAB", "price": 10.0},
+            {"item_id": 6, "item_name": "TSH", "search_name": "tsh", "group_name": "LAB", "price": 15.0},
+            {"item_id": 7, "item_name": "T4 LIVRE", "search_name": "t4 livre", "group_name": "LAB", "price": 15.0},
+        ]
+
+    def get_cached_table_stats(self):
+        return {}
+
+
+resolved = []
+_resolve = ResoluteOrchestrator.resolve_single_term
+
+
+def counting_resolve(term):
+    resolved.append(term)
+    return _resolve(term)
+
+
+ResoluteOrchestrator.resolve_single_term = staticmethod(counting_resolve)
+
+inputs = ["TSH", "Hemograma Completo", "tsh ", "- TSH", "T4 Livre", "hemograma completo", "T4 LIVRE - Exames"]
+result = ValidationService.validate_batch(inputs, "Mock Unit", MockBQ())
+
+print(f"Termos: {len(inputs)} | Resolvidos: {len(resolved)} -> {resolved}")
+for item in result["items"]:
+    print(f"  '{item['term']}' -> {item['status']}")
+
+assert resolved == ["TSH", "Hemograma Completo", "T4 Livre"], resolved
+assert [item["term"] for item in result["items"]] == ["TSH", "Hemograma Completo", "tsh", "TSH", "T4 Livre", "hemograma completo", "T4 LIVRE  Exames"]
+assert [item["status"] for item in result["items"]] == ["confirmed", "confirmed", "duplicate", "duplicate", "confirmed", "duplicate", "duplicate"]
+assert result["stats"]["unique_terms"] == 3 and result["stats"]["confirmed"] == 3
+print("✅ 1 resolução por termo único, ordem e duplicatas preservadas")
@@ -0,0 +1,108 @@
+import asyncio
+import sys
+import os
+import threading
+import time
+
+# Bulk mode com carga vencida: leitores sem wait_for_fresh recebem a carga atual na hora,
+# enquanto tables.get + scan rodam em background (stale-while-revalidate). A fachada async
+# responde inline sem travar o event loop.
+#
+# Uso: python tests_archive/test_bulk_refresh_nonblocking.py
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bigquery_client import BigQueryClient
+from core.async_bigquery_client import AsyncBigQueryClient
+
+RELEASE = threading.Event()
+SLOW_CALLS = {"metadata": 0, "scan": 0}
+
+
+def make_bulk(last_modified):
+    now = time.time()
+    return {
+        "partitions": {"mock unit": {"items": [], "keys": [], "snapshot_pending": False}},
+        "units": ["Mock Unit"],
+        "last_modified": last_modified,
+        "loaded_at": now,
+        "checked_at": now
+    }
+
+
+client = BigQueryClient()
+client.bulk_mode = True
+client.catalog_cache.ttl_seconds = 60
+client._bulk = make_bulk(1)
+client._bulk["checked_at"] -= 3600  # vencida
+
+
+def slow_last_modified():
+    SLOW_CALLS["metadata"] += 1
+    RELEASE.wait(5)
+    return 2
+
+
+def slow_load(last_modified):
+    SLOW_CALLS["scan"] += 1
+    RELEASE.wait(5)
+    return make_bulk(last_modified)
+
+
+client._get_table_last_modified = slow_last_modified
+client._load_bulk = slow_load
+
+stale = client._bulk
+timings = []
+for _ in range(20):
+    started = time.perf_counter()
+    assert client._get_bulk() is stale
+    snapshot = client.get_units_snapshot()
+    timings.append(time.perf_counter() - started)
+    assert snapshot["units"] == ["Mock Unit"]
+
+worst_ms = max(timings) * 1000
+print(f"20 leituras com refresh em andamento: pior {worst_ms:.2f} ms")
+assert worst_ms < 50, "leitor esperou o refresh do bulk"
+assert SLOW_CALLS["metadata"] == 1, "apenas um refresh em background"
+
+
+async def loop_lag_during_units():
+    # Ticker no mesmo loop: se get_units_snapshot travar o loop, o tick atrasa
+    async_client = AsyncBigQueryClient(client)
+    ticks = []
+
+    async def ticker():
+        for _ in range(20):
+            started = time.perf_counter()
+            await asyncio.sleep(0.005)
+            ticks.append(time.perf_counter() - started - 0.005)
+
+    task = asyncio.create_task(ticker())
+    for _ in range(20):
+        snapshot = await async_client.get_units_snapshot()
+        assert snapshot["units"] == ["Mock Unit"]
+        await asyncio.sleep(0.002)
+    await task
+    return async_client.stats, max(ticks) * 1000
+
+
+assert client.has_cached_units()
+async_stats, lag_ms = asyncio.run(loop_lag_during_units())
+print(f"Async get_units_snapshot durante o refresh: {async_stats} | atraso máx do loop {lag_ms:.2f} ms")
+assert async_stats["inline"] == 20 and async_stats["offloaded"] == 0
+assert lag_ms < 50, "event loop travou no refresh do bulk"
+
+RELEASE.set()
+for _ in range(200):
+    if client._bulk is not stale and not client._bulk_refreshing:
+        break
+    time.sleep(0.01)
+assert client._bulk is not stale and client._bulk["last_modified"] == 2
+assert not client._bulk_refreshing
+print(f"Refresh concluído: metadata={SLOW_CALLS['metadata']} scan={SLOW_CALLS['scan']}")
+
+print("✅ Bulk vencido servido sem esperar tables.get/scan; um único refresh em background")
@@ -0,0 +1,67 @@
+import sys
+import os
+import time
+
+# Refresh em background que falha: a entrada vencida continua sendo servida, mas o status
+# (cache e auth_info do cliente) vira "STALE (refresh failed: ...)" e a idade aparece nas stats.
+#
+# Uso: python tests_archive/test_catalog_refresh_status.py
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bigquery_client import BigQueryClient, BigQueryQueryError
+
+CATALOG = [
+    {"item_id": 1, "item_name": "HEMOGRAMA COMPLETO", "search_name": "hemograma completo", "group_name": "LAB", "price": 10.0},
+]
+
+
+def wait_refresh(client):
+    for _ in range(200):
+        if not client.catalog_cache._refreshing:
+            return
+        time.sleep(0.01)
+    raise AssertionError("refresh em background não terminou")
+
+
+client = BigQueryClient()
+client.auth_info = "OK"
+client.catalog_cache.ttl_seconds = 0
+client.catalog_cache.put("Mock Unit", list(CATALOG))
+
+
+def failing_loader(unit):
+    raise BigQueryQueryError("BQ_ERR_503: backend unavailable")
+
+
+def blind_loader(unit):
+    # Mesmo contrato de _fetch_all_exams no blind fetch: itens de outra unidade, não cacheáveis
+    client.auth_info = "OK (BLIND MODE)"
+    return list(CATALOG), False, None
+
+
+for name, loader in (("exceção", failing_loader), ("blind fetch", blind_loader)):
+    items = client.catalog_cache.get("Mock Unit", loader)
+    assert items == CATALOG, "entrada vencida continua sendo servida"
+    wait_refresh(client)
+    unit_stats = client.get_catalog_cache_stats()["units"]["Mock Unit"]
+    print(f"{name}: auth_info={client.auth_info!r} | status={unit_stats['status']!r}")
+    assert client.auth_info.startswith("STALE (refresh failed: "), client.auth_info
+    assert unit_stats["status"].startswith("STALE (refresh failed: ")
+    assert unit_stats["refresh_failed_seconds_ago"] is not None
+
+stats = client.get_catalog_cache_stats()
+assert stats["refresh_errors"] == 2
+assert stats["max_age_seconds"] == stats["units"]["Mock Unit"]["age_seconds"] >= 0
+
+client.catalog_cache.get("Mock Unit", lambda unit: (list(CATALOG), True, None))
+wait_refresh(client)
+unit_stats = client.get_catalog_cache_stats()["units"]["Mock Unit"]
+print(f"refresh ok: auth_info={client.auth_info!r} | status={unit_stats['status']!r}")
+assert client.auth_info == "OK"
+assert unit_stats["status"] == "OK" and unit_stats["refresh_failed_seconds_ago"] is None
+
+print("✅ Refresh com falha marca o catálogo como STALE e expõe a idade; refresh ok volta a OK")
@@ -0,0 +1,68 @@
+import sys
+import os
+import threading
+
+# FuzzyMatcher por unidade: requests concorrentes de unidades diferentes não podem enxergar
+# o catálogo uma da outra (antes: singleton global mutado a cada validate_batch).
+#
+# Uso: python tests_archive/test_fuzzy_per_unit.py
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bigquery_client import CatalogCache
+from core.catalog_index import CatalogIndexCache
+
+CATALOGS = {
+    "Unidade A": ["HEMOGRAMA COMPLETO", "GLICEMIA DE JEJUM", "TSH"],
+    "Unidade B": ["UREIA", "CREATININA", "POTASSIO"],
+}
+
+
+class MockBQ:
+    def __init__(self):
+        self.catalog_cache = CatalogCache()
+        for unit, names in CATALOGS.items():
+            self.catalog_cache.put(unit, [
+                {"item_id": i, "item_name": n, "search_name": n.lower(), "group_name": "LAB", "price": 1.0}
+                for i, n in enumerate(names)
+            ])
+
+
+bq = MockBQ()
+indexes = CatalogIndexCache()
+errors = []
+
+
+def worker(unit, term, expected):
+    for _ in range(200):
+        items = bq.catalog_cache.get_entry(unit)["items"]
+        matcher = indexes.get(unit, items, bq).fuzzy_matcher
+        match = matcher.find_best_match(term, min_score=60)
+        if not match or match["match"] != expected:
+            errors.append((unit, term, match))
+            return
+
+
+threads = [
+    threading.Thread(target=worker, args=("Unidade A", "hemograma complet", "hemograma completo")),
+    threading.Thread(target=worker, args=("Unidade B", "creatinina serica", "creatinina")),
+    threading.Thread(target=worker, args=("Unidade A", "glicemia jejum", "glicemia de jejum")),
+    threading.Thread(target=worker, args=("Unidade B", "ureia", "ureia")),
+]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+
+matcher_a = indexes.get("Unidade A", bq.catalog_cache.get_entry("Unidade A")["items"], bq).fuzzy_matcher
+matcher_b = indexes.get("Unidade B", bq.catalog_cache.get_entry("Unidade B")["items"], bq).fuzzy_matcher
+print(f"Unidade A: {sorted(matcher_a.normalized_exams)}")
+print(f"Unidade B: {sorted(matcher_b.normalized_exams)}")
+assert not errors, errors[:3]
+assert matcher_a.find_best_match("creatinina", min_score=60) is None
+assert set(matcher_a.normalized_exams).isdisjoint(matcher_b.normalized_exams)
+print(f"Builds: {indexes.builds} | hits: {indexes.hits}")
+print("✅ Matchers isolados por unidade sob concorrência")
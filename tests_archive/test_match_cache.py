@@ -0,0 +1,70 @@
+import sys
+import os
+import tempfile
+
+# Cache de resultados de matching entre requests: hit na 2ª chamada, invalidação por learn()
+# e por refresh do catálogo, not_found nunca cacheado.
+#
+# Uso: python tests_archive/test_match_cache.py
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bigquery_client import CatalogCache
+from core.match_cache import match_cache
+from core.validation_logic import ValidationService
+from services.learning_service import learning_service
+
+CATALOG = [
+    {"item_id": 1, "item_name": "HEMOGRAMA COMPLETO", "search_name": "hemograma completo", "group_name": "LAB", "price": 10.0},
+    {"item_id": 6, "item_name": "TSH", "search_name": "tsh", "group_name": "LAB", "price": 15.0},
+    {"item_id": 7, "item_name": "T4 LIVRE", "search_name": "t4 livre", "group_name": "LAB", "price": 15.0},
+]
+
+
+class MockBQ:
+    """Catálogo servido por um CatalogCache real (versão muda a cada put)."""
+
+    def __init__(self):
+        self.catalog_cache = CatalogCache()
+        self.catalog_cache.put("Mock Unit", list(CATALOG))
+
+    def get_all_exams(self, unit):
+        return self.catalog_cache.get_entry(unit)["items"]
+
+    def get_cached_table_stats(self):
+        return {}
+
+
+learning_service.file_path = os.path.join(tempfile.mkdtemp(), "learned_mappings.json")
+bq = MockBQ()
+terms = ["Hemograma Completo", "TSH", "exame inexistente xyz"]
+
+
+def run():
+    return ValidationService.validate_batch(terms, "Mock Unit", bq)
+
+
+first = run()
+second = run()
+print(f"1ª: cache_hits={first['stats']['cache_hits']} | 2ª: cache_hits={second['stats']['cache_hits']}")
+assert first["stats"]["cache_hits"] == 0
+assert second["stats"]["cache_hits"] == 2, "not_found não pode ser cacheado"
+assert [i["status"] for i in first["items"]] == [i["status"] for i in second["items"]]
+assert [i["matches"] for i in first["items"]] == [i["matches"] for i in second["items"]]
+
+learning_service.learn("TSH", "T4 LIVRE")
+learned = run()
+print(f"Após learn(): cache_hits={learned['stats']['cache_hits']} | TSH -> {learned['items'][1]['matches'][0]['item_name']}")
+assert learned["stats"]["cache_hits"] == 0
+assert learned["items"][1]["matches"][0]["item_name"] == "T4 LIVRE"
+
+bq.catalog_cache.put("Mock Unit", list(CATALOG))
+refreshed = run()
+print(f"Após refresh do catálogo: cache_hits={refreshed['stats']['cache_hits']}")
+assert refreshed["stats"]["cache_hits"] == 0
+
+print(match_cache.get_stats())
+print("✅ Cache de matching: hits, invalidação por learn()/catálogo e not_found fora do cache")
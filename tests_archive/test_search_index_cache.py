@@ -0,0 +1,72 @@
+import sys
+import os
+import threading
+import time
+
+# Índice de busca guardado na entrada do CatalogCache: reaproveitado enquanto o catálogo é o
+# mesmo, descartado junto quando o catálogo muda ou é invalidado; warm-up único sob concorrência.
+#
+# Uso: python tests_archive/test_search_index_cache.py
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.bigquery_client import BigQueryClient
+
+CATALOG = [
+    {"item_id": 1, "item_name": "HEMOGRAMA COMPLETO", "search_name": "hemograma completo", "group_name": "LAB", "price": 10.0},
+    {"item_id": 6, "item_name": "TSH", "search_name": "tsh", "group_name": "LAB", "price": 15.0},
+]
+
+client = BigQueryClient()
+client.catalog_cache.put("Mock Unit", list(CATALOG))
+
+first = client._get_search_index("Mock Unit")
+assert first is not None and client._get_search_index("mock unit ") is first
+assert client.has_cached_search_index("Mock Unit")
+
+# Mesmo catálogo revalidado mantém o índice; catálogo novo leva o antigo embora
+client.catalog_cache.put("Mock Unit", client.catalog_cache.get_entry("Mock Unit")["items"])
+assert client._get_search_index("Mock Unit") is first
+client.catalog_cache.put("Mock Unit", list(CATALOG))
+assert not client.has_cached_search_index("Mock Unit")
+second = client._get_search_index("Mock Unit")
+assert second is not first
+client.catalog_cache.invalidate("Mock Unit")
+assert not client.has_cached_search_index("Mock Unit")
+print("✅ Índice reaproveitado por versão e descartado com o catálogo")
+
+# Warm-up: 16 requests simultâneas para uma unidade fria disparam um único carregamento
+RELEASE = threading.Event()
+warmups = []
+
+
+def slow_warm(unit):
+    warmups.append(unit)
+    RELEASE.wait(5)
+    with client._warming_lock:
+        client._warming_units.discard(unit.strip().lower())
+
+
+client._warm_catalog = slow_warm
+barrier = threading.Barrier(16)
+
+
+def search():
+    barrier.wait()
+    assert client._get_search_index("Cold Unit") is None
+
+
+threads = [threading.Thread(target=search) for _ in range(16)]
+for t in threads:
+    t.start()
+for t in threads:
+    t.join()
+time.sleep(0.05)
+RELEASE.set()
+print(f"Warm-ups disparados para 16 requests concorrentes: {len(warmups)}")
+assert len(warmups) == 1
+
+print("✅ Índice de busca preso ao CatalogCache e warm-up único por unidade")
@@ -0,0 +1,108 @@
+import sys
+import os
+import random
+import time
+
+# Equivalência do STAGE 3 (substring): Aho-Corasick + trigramas do CatalogIndex vs loop original por chave.
+#
+# Uso: python tests_archive/test_substring_index.py [itens_catalogo] [variantes]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.catalog_index import CatalogIndex
+from core.sqlite_backend import synthetic_catalog_names
+
+N_ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+N_VARIANTS = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+
+
+def legacy_stage3(v_text, exam_keys):
+    """Cópia fiel do STAGE 3 antes do índice (para uma variante)."""
+    hits = []
+    if len(v_text) < 4: return hits
+    for key_id, key in enumerate(exam_keys):
+        if v_text == key or (len(v_text) > 5 and (v_text in key or key in v_text)):
+            hits.append(key_id)
+    return hits
+
+
+def build_catalog(with_empty_key=False):
+    names = synthetic_catalog_names(N_ITEMS) + [
+        "TSH", "T4", "K", "FE", "UREIA", "GLICOSE", "HEMOGRAMA", "ACIDO", "ACIDO URICO",
+        "VITAMINA D", "D", "AA", "AAA", "AAAA", "AAAAAA", "ABAB", "ABABAB",
+    ]
+    if with_empty_key:
+        names.append("!!!")  # normaliza para chave vazia
+    return [
+        {"item_id": i, "item_name": n, "search_name": n, "group_name": "LAB", "price": 1.0}
+        for i, n in enumerate(names)
+    ]
+
+
+def random_variants(index, rng):
+    keys = index.exam_keys
+    variants = ["", "tsh", "ureia", "acido", "aaaaaaaaa", "abababab", "glicose jejum", "vitamina d 25"]
+    for _ in range(N_VARIANTS):
+        key = rng.choice(keys)
+        roll = rng.random()
+        if roll < 0.3 and len(key) > 6:
+            # Fatia de uma chave (termo contido na chave)
+            start = rng.randint(0, len(key) - 5)
+            text = key[start:start + rng.randint(4, len(key) - start)]
+        elif roll < 0.6:
+            # Chave(s) dentro de um texto maior (chave contida no termo)
+            text = f"{rng.choice(['dosagem de ', 'pesquisa ', ''])}{key} {rng.choice(keys)[:rng.randint(0, 8)]}"
+        elif roll < 0.8:
+            text = key
+        else:
+            text = "".join(rng.choice("abcdeiou ") for _ in range(rng.randint(3, 14)))
+        variants.append(" ".join(text.split()))
+    return variants
+
+
+def check(index, variants):
+    mismatches = 0
+    t_legacy = t_index = 0.0
+    for text in variants:
+        start = time.perf_counter()
+        expected = legacy_stage3(text, index.exam_keys)
+        t_legacy += time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = index.substring_matches(text)
+        t_index += time.perf_counter() - start
+
+        if got != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"❌ '{text}': esperado {expected[:10]} / obtido {got[:10]}")
+    return mismatches, t_legacy, t_index
+
+
+def run():
+    rng = random.Random(11)
+    index = CatalogIndex(build_catalog())
+    start = time.perf_counter()
+    index.substring
+    t_build = time.perf_counter() - start
+    variants = random_variants(index, rng)
+    print(f"--- STAGE 3: {len(index.exam_keys)} chaves | {len(variants)} variantes | build {t_build * 1000:.0f} ms ---")
+
+    mismatches, t_legacy, t_index = check(index, variants)
+    print(f"Loop original : {t_legacy * 1000 / len(variants):8.3f} ms/variante")
+    print(f"Índice        : {t_index * 1000 / len(variants):8.3f} ms/variante")
+
+    # Chave vazia (search_name só com pontuação) casa com qualquer termo > 5 chars
+    empty_index = CatalogIndex(build_catalog(with_empty_key=True))
+    assert "" in empty_index.key_ids
+    mismatches += check(empty_index, variants[:300])[0]
+
+    assert mismatches == 0, f"{mismatches} divergências"
+    print("✅ STAGE 3 idêntico ao loop original")
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,106 @@
+import sys
+import os
+import random
+import time
+
+# Equivalência do STAGE 4 (token overlap): índice invertido do CatalogIndex vs loop original por chave.
+#
+# Uso: python tests_archive/test_token_index.py [itens_catalogo] [variantes]
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.catalog_index import CatalogIndex
+from core.sqlite_backend import synthetic_catalog_names
+from core.validation_logic import ValidationService
+
+N_ITEMS = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+N_VARIANTS = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+
+
+def legacy_stage4(text, exam_keys):
+    """Cópia fiel do STAGE 4 antes do índice (V109)."""
+    hits = []
+    v_tokens = set(text.split())
+    if not v_tokens: return hits
+    essential_v = {t for t in v_tokens if len(t) > 2 or t in ["d", "k", "p", "ca", "fe", "zn", "c3", "c4"]}
+    if not essential_v: return hits
+    for key_id, key in enumerate(exam_keys):
+        k_norm = ValidationService.normalize_text(key)
+        k_tokens = set(k_norm.split())
+        essential_k = {t for t in k_tokens if len(t) > 2}
+        is_match = False
+        if essential_v and essential_k:
+            if essential_v.issubset(k_tokens):
+                is_match = True
+            elif essential_k.issubset(v_tokens):
+                is_match = True
+        if is_match:
+            hits.append(key_id)
+    return hits
+
+
+def build_catalog():
+    names = synthetic_catalog_names(N_ITEMS) + [
+        "VITAMINA D", "VIT D", "D DIMERO", "CA 125", "FE", "ZN SERICO", "C3", "C4 COMPLEMENTO",
+        "K", "P", "AB", "HIV", "T4 LIVRE", "T4", "EXAMES", "25 OH VITAMINA D", "DOSAGEM DE CA",
+    ]
+    return [
+        {"item_id": i, "item_name": n, "search_name": n, "group_name": "LAB", "price": 1.0}
+        for i, n in enumerate(names)
+    ]
+
+
+def random_variants(index, rng):
+    vocab = list(index.token_postings) + ["d", "k", "p", "ca", "fe", "zn", "c3", "c4", "xx", "de", "inexistente"]
+    variants = ["", "d", "ca", "de", "a b", "vitamina d", "t4 livre", "hiv 1 e 2", "dosagem de ca"]
+    for _ in range(N_VARIANTS):
+        roll = rng.random()
+        if roll < 0.4:
+            # Chave existente, com tokens removidos/trocados/acrescentados
+            tokens = rng.choice(index.exam_keys).split()
+            rng.shuffle(tokens)
+            tokens = tokens[:rng.randint(1, len(tokens))]
+            if rng.random() < 0.5:
+                tokens.append(rng.choice(vocab))
+        else:
+            tokens = [rng.choice(vocab) for _ in range(rng.randint(1, 5))]
+        variants.append(" ".join(tokens))
+    return variants
+
+
+def run():
+    rng = random.Random(7)
+    index = CatalogIndex(build_catalog())
+    variants = random_variants(index, rng)
+    print(f"--- STAGE 4: {len(index.exam_keys)} chaves | {len(variants)} variantes ---")
+
+    mismatches = 0
+    t_legacy = t_index = 0.0
+    matched = 0
+    for text in variants:
+        start = time.perf_counter()
+        expected = legacy_stage4(text, index.exam_keys)
+        t_legacy += time.perf_counter() - start
+
+        start = time.perf_counter()
+        got = index.token_overlap(text)
+        t_index += time.perf_counter() - start
+
+        matched += bool(expected)
+        if got != expected:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"❌ '{text}': esperado {expected[:10]} / obtido {got[:10]}")
+
+    print(f"Variantes com match: {matched}")
+    print(f"Loop original : {t_legacy * 1000 / len(variants):8.3f} ms/variante")
+    print(f"Índice        : {t_index * 1000 / len(variants):8.3f} ms/variante")
+    assert mismatches == 0, f"{mismatches} divergências"
+    print("✅ STAGE 4 idêntico ao loop original")
+
+
+if __name__ == "__main__":
+    run()
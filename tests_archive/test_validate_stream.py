@@ -0,0 +1,49 @@
+import sys
+import os
+
+# Modo streaming do validate-list: eventos por item (ordem de conclusão, com índice) + stats no fim.
+# Remontados pelo índice, devem reproduzir exatamente a resposta do validate_batch.
+#
+# Uso: python tests_archive/test_validate_stream.py
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API_DIR = os.path.join(PROJECT_ROOT, "api")
+if API_DIR not in sys.path:
+    sys.path.append(API_DIR)
+
+from core.validation_logic import ValidationService
+
+
+class MockBQ:
+    def get_all_exams(self, unit):
+        return [
+            {"item_id": 1, "item_name": "HEMOGRAMA COMPLETO", "search_name": "hemograma completo", "group_name": "LAB", "price": 10.0},
+            {"item_id": 6, "item_name": "TSH", "search_name": "tsh", "group_name": "LAB", "price": 15.0},
+            {"item_id": 7, "item_name": "T4 LIVRE", "search_name": "t4 livre", "group_name": "LAB", "price": 15.0},
+        ]
+
+    def get_cached_table_stats(self):
+        return {}
+
+
+bq = MockBQ()
+terms = ["exame inexistente xyz", "Hemograma Completo", "TSH", "tsh", "T4 Livre"]
+
+events = list(ValidationService.iter_validate_batch(terms, "Mock Unit", bq))
+for event in events:
+    if event["type"] == "item":
+        print(f"  [{event['index']}] '{event['item']['term']}' -> {event['item']['status']}")
+    else:
+        print(f"  stats: {event['stats']['confirmed']} confirmados / {event['stats']['not_found']} não encontrados")
+
+item_events = [e for e in events if e["type"] == "item"]
+assert events[-1]["type"] == "stats" and len(item_events) == len(terms)
+assert sorted(e["index"] for e in item_events) == list(range(len(terms)))
+# Resolvidos localmente saem antes do item que depende do lote semântico
+assert item_events[-1]["index"] == 0 and item_events[-1]["item"]["status"] == "not_found"
+
+full = ValidationService.validate_batch(terms, "Mock Unit", bq)
+by_index = {e["index"]: e["item"] for e in item_events}
+assert [by_index[i]["status"] for i in range(len(terms))] == [item["status"] for item in full["items"]]
+assert events[-1]["stats"].keys() == full["stats"].keys()
+print("✅ Stream de itens equivalente à resposta completa")